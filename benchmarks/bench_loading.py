@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mesure du chargement des dépenses depuis le fichier CSV
+
+Compare la lecture sans schéma (types inférés, dates converties sans
+format) à la lecture typée de CSVStorage (format de date fixe, montants en
+float64, catégories codées par dictionnaire): durée de lecture, mémoire
+occupée par le DataFrame et durée d'un regroupement par catégorie. Le
+fichier est généré (benchmarks/synthetic.py) dans un répertoire temporaire.
+
+Utilisation:
+    python benchmarks/bench_loading.py --rows 200000 --output loading.json
+"""
+
+import os
+import sys
+import json
+import argparse
+import platform
+import statistics
+import tempfile
+import time
+import pandas as pd
+
+# Racine du projet (répertoire parent de benchmarks/)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from expense_storage import CSVStorage, PYARROW_AVAILABLE, sum_by_category
+from synthetic import write_ledger
+
+def load_untyped(path):
+    """
+    Lecture sans schéma (comportement d'origine).
+    """
+    expenses = pd.read_csv(path)
+    expenses['Date'] = pd.to_datetime(expenses['Date'])
+    return expenses
+
+def measure(function, repeat):
+    """
+    Exécute une fonction plusieurs fois et mesure sa durée.
+    
+    Returns:
+        tuple: (durée médiane en secondes, dernier résultat)
+    """
+    runs = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = function()
+        runs.append(time.perf_counter() - start)
+    return statistics.median(runs), result
+
+def run_benchmarks(rows, repeat):
+    """
+    Mesure les deux lectures sur un même fichier.
+    
+    Args:
+        rows (int): Nombre de dépenses du fichier
+        repeat (int): Nombre d'exécutions par mesure
+    
+    Returns:
+        dict: Résultats par lecture (durées en secondes, mémoire en octets)
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as data_dir:
+        storage = CSVStorage(data_dir)
+        write_ledger(storage.path, rows)
+        
+        for name, loader in (('untyped', lambda: load_untyped(storage.path)), ('typed', storage.load)):
+            parse_s, expenses = measure(loader, repeat)
+            groupby_s, _ = measure(lambda: sum_by_category(expenses['Montant'], expenses['Catégorie']), repeat)
+            results[name] = {
+                'parse_s': parse_s,
+                'memory_bytes': int(expenses.memory_usage(deep=True).sum()),
+                'groupby_s': groupby_s,
+            }
+    
+    return results
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure du chargement des dépenses depuis le CSV")
+    parser.add_argument('--rows', type=int, default=200000, help="Nombre de dépenses du fichier")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre d'exécutions par mesure")
+    parser.add_argument('--output', help="Fichier JSON où écrire les résultats")
+    args = parser.parse_args()
+    
+    results = run_benchmarks(args.rows, args.repeat)
+    report = {
+        'benchmark': 'loading',
+        'rows': args.rows,
+        'pyarrow': PYARROW_AVAILABLE,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'results': results,
+    }
+    
+    for name, result in results.items():
+        print(f"{name:8s} lecture {result['parse_s']:.3f} s  "
+              f"mémoire {result['memory_bytes'] / 1024 / 1024:.1f} Mo  "
+              f"regroupement {result['groupby_s'] * 1000:.1f} ms")
+    
+    untyped, typed = results['untyped'], results['typed']
+    print(f"\nLecture {untyped['parse_s'] / typed['parse_s']:.1f}x plus rapide, "
+          f"mémoire divisée par {untyped['memory_bytes'] / typed['memory_bytes']:.1f}")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
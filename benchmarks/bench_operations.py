@@ -0,0 +1,249 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mesure des opérations principales sur des historiques synthétiques
+
+Pour chaque taille d'historique, un répertoire de données est généré
+(benchmarks/synthetic.py) puis chaque opération est exécutée plusieurs fois:
+ajout d'une dépense, lecture de toutes les dépenses, regroupements par
+catégorie et par date, statistiques, graphiques et rapport PDF. Les
+lectures partent d'un cache vide. La durée est mesurée sans traçage, puis
+le pic de mémoire Python (tracemalloc, allocations numpy et pandas
+comprises) sur une exécution supplémentaire. Les résultats sont écrits en
+JSON et peuvent être comparés à une référence pour détecter une régression.
+
+Utilisation:
+    python benchmarks/bench_operations.py --rows 1000,100000 --output operations.json
+    python benchmarks/bench_operations.py --rows 1000,100000 --baseline operations.json
+    python benchmarks/bench_operations.py --rows 10000000 --operations get_all_expenses,get_statistics
+"""
+
+import os
+import sys
+import json
+import argparse
+import platform
+import statistics
+import tempfile
+import time
+import tracemalloc
+import pandas as pd
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# Racine du projet (répertoire parent de benchmarks/)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from expense_manager import ExpenseManager
+from expense_analyzer import ExpenseAnalyzer
+from expense_reporter import ExpenseReporter
+from synthetic import create_data_dir
+
+class Context:
+    """
+    Objets de l'application partagés par les opérations mesurées.
+    """
+    
+    def __init__(self, data_dir, work_dir):
+        """
+        Args:
+            data_dir (str): Répertoire de données
+            work_dir (str): Répertoire des fichiers générés (graphiques, rapports)
+        """
+        self.manager = ExpenseManager(data_dir)
+        self.analyzer = ExpenseAnalyzer(self.manager)
+        self.reporter = ExpenseReporter(self.analyzer)
+        self.work_dir = work_dir
+        self.runs = 0
+    
+    def output_dir(self):
+        """
+        Retourne un nouveau répertoire de sortie (aucun graphique en cache).
+        """
+        self.runs += 1
+        return os.path.join(self.work_dir, f'sortie_{self.runs}')
+    
+    def cold(self):
+        """
+        Vide le cache des dépenses avant une lecture.
+        """
+        self.manager.clear_cache()
+    
+    def warm(self):
+        """
+        Met les agrégats à jour avant un ajout (cas habituel).
+        """
+        self.manager.get_aggregates()
+
+# Opérations mesurées: nom -> (préparation non mesurée, opération).
+# add_expense est mesurée en dernier: les dépenses ajoutées ne modifient
+# pas les historiques des autres mesures.
+OPERATIONS = {
+    'get_all_expenses': (Context.cold, lambda c: c.manager.get_all_expenses()),
+    'get_expenses_by_category': (Context.cold, lambda c: c.manager.get_expenses_by_category()),
+    'get_expenses_by_date': (Context.cold, lambda c: c.manager.get_expenses_by_date()),
+    'get_statistics': (Context.cold, lambda c: c.analyzer.get_statistics()),
+    'generate_graphs': (Context.cold, lambda c: c.analyzer.generate_graphs(c.output_dir(), parallel=False, use_cache=False)),
+    'generate_pdf_report': (Context.cold, lambda c: c.reporter.generate_pdf_report(c.output_dir())),
+    'add_expense': (Context.warm, lambda c: c.manager.add_expense(12.5, 'Transport', 'Bus')),
+}
+
+def measure(context, setup, operation, repeat):
+    """
+    Mesure la durée et le pic de mémoire d'une opération.
+    
+    Args:
+        context (Context): Objets de l'application
+        setup (callable): Préparation non mesurée, exécutée avant chaque exécution
+        operation (callable): Opération mesurée
+        repeat (int): Nombre d'exécutions mesurées
+    
+    Returns:
+        dict: Durées (médiane, minimum, mesures en secondes) et pic de
+            mémoire (en octets) de l'opération
+    """
+    runs = []
+    for _ in range(repeat):
+        setup(context)
+        start = time.perf_counter()
+        operation(context)
+        runs.append(time.perf_counter() - start)
+    
+    # Exécution supplémentaire sous tracemalloc (plus lente, non chronométrée)
+    setup(context)
+    tracemalloc.start()
+    try:
+        operation(context)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    
+    return {
+        'median_s': statistics.median(runs),
+        'min_s': min(runs),
+        'runs_s': runs,
+        'peak_memory_bytes': peak,
+    }
+
+def run_benchmarks(sizes, operations, repeat, seed, backend):
+    """
+    Mesure les opérations sur des historiques de chaque taille.
+    
+    Args:
+        sizes (list): Nombres de dépenses des historiques
+        operations (list): Noms des opérations à mesurer
+        repeat (int): Nombre d'exécutions par opération
+        seed (int): Graine du générateur de dépenses
+        backend (str): Moteur de stockage
+    
+    Returns:
+        dict: Résultats par taille puis par opération
+    """
+    results = {}
+    for rows in sizes:
+        with tempfile.TemporaryDirectory() as work_dir:
+            data_dir = os.path.join(work_dir, 'data')
+            start = time.perf_counter()
+            create_data_dir(data_dir, rows, seed, backend=backend)
+            print(f"{rows} dépenses générées en {time.perf_counter() - start:.1f} s")
+            
+            context = Context(data_dir, work_dir)
+            results[str(rows)] = {}
+            for name in operations:
+                setup, operation = OPERATIONS[name]
+                result = measure(context, setup, operation, repeat)
+                results[str(rows)][name] = result
+                print(f"  {name:25s} médiane {result['median_s'] * 1000:9.1f} ms  "
+                      f"pic mémoire {result['peak_memory_bytes'] / 1024 / 1024:8.1f} Mo")
+            context.manager.storage.close()
+    
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    Compare les résultats à une référence (durée et pic de mémoire).
+    
+    Args:
+        results (dict): Résultats de la mesure actuelle
+        baseline (dict): Résultats de référence
+        tolerance (float): Dégradation relative tolérée (0.2 pour 20 %)
+    
+    Returns:
+        list: Descriptions des régressions détectées
+    """
+    regressions = []
+    for rows, operations in results.items():
+        for name, result in operations.items():
+            reference = baseline.get(rows, {}).get(name)
+            if reference is None:
+                continue
+            if result['median_s'] > reference['median_s'] * (1 + tolerance):
+                regressions.append(
+                    f"{name} ({rows} dépenses): {result['median_s'] * 1000:.1f} ms "
+                    f"au lieu de {reference['median_s'] * 1000:.1f} ms"
+                )
+            if result['peak_memory_bytes'] > reference['peak_memory_bytes'] * (1 + tolerance):
+                regressions.append(
+                    f"{name} ({rows} dépenses): pic mémoire {result['peak_memory_bytes'] / 1024 / 1024:.1f} Mo "
+                    f"au lieu de {reference['peak_memory_bytes'] / 1024 / 1024:.1f} Mo"
+                )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure des opérations principales sur des historiques synthétiques")
+    parser.add_argument('--rows', default='1000,100000',
+                        help="Nombres de dépenses des historiques, séparés par des virgules (1000 à 10000000)")
+    parser.add_argument('--operations', default=','.join(OPERATIONS),
+                        help="Opérations à mesurer, séparées par des virgules")
+    parser.add_argument('--repeat', type=int, default=3, help="Nombre d'exécutions par opération")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du générateur de dépenses")
+    parser.add_argument('--backend', default='csv', choices=['csv', 'sqlite', 'columnar'], help="Moteur de stockage")
+    parser.add_argument('--output', help="Fichier JSON où écrire les résultats")
+    parser.add_argument('--baseline', help="Fichier JSON de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Dégradation relative tolérée")
+    args = parser.parse_args()
+    
+    sizes = [int(rows) for rows in args.rows.split(',') if rows.strip()]
+    operations = [name.strip() for name in args.operations.split(',') if name.strip()]
+    unknown = [name for name in operations if name not in OPERATIONS]
+    if unknown:
+        parser.error(f"Opérations inconnues: {', '.join(unknown)}")
+    # Garder l'ordre de OPERATIONS (add_expense en dernier)
+    operations = [name for name in OPERATIONS if name in operations]
+    
+    results = run_benchmarks(sizes, operations, args.repeat, args.seed, args.backend)
+    report = {
+        'benchmark': 'operations',
+        'backend': args.backend,
+        'seed': args.seed,
+        'repeat': args.repeat,
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        # Pic de mémoire résidente du processus (Ko sous Linux, octets sous macOS)
+        'max_rss': resource.getrusage(resource.RUSAGE_SELF).ru_maxrss if resource is not None else None,
+        'results': results,
+    }
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRégressions détectées:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\nAucune régression.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,150 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Mesure du temps de démarrage des points d'entrée
+
+Chaque point d'entrée est lancé plusieurs fois dans un nouveau processus
+Python, sur une copie de l'application placée dans un répertoire temporaire
+(les données réelles ne sont jamais touchées). Les résultats sont écrits en
+JSON et peuvent être comparés à une référence pour détecter une régression.
+
+Utilisation:
+    python benchmarks/bench_startup.py --output startup.json
+    python benchmarks/bench_startup.py --baseline startup.json
+"""
+
+import os
+import sys
+import json
+import glob
+import shutil
+import argparse
+import platform
+import statistics
+import subprocess
+import tempfile
+import time
+
+# Racine du projet (répertoire parent de benchmarks/)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Points d'entrée mesurés: nom -> (arguments, entrée standard)
+ENTRY_POINTS = {
+    'import_main': (['-c', 'import main'], ''),
+    'console_menu': (['main.py', '--console'], '0\n'),
+    'console_add': (['main.py', '--console'], '1\n12.5\nTransport\nBus\n0\n'),
+    'console_list': (['main.py', '--console'], '2\n0\n'),
+    'import_gui': (['-c', 'import gui'], ''),
+}
+
+def run_entry_point(app_dir, args, stdin):
+    """
+    Lance un point d'entrée et mesure sa durée.
+    
+    Args:
+        app_dir (str): Répertoire de la copie de l'application
+        args (list): Arguments de l'interpréteur Python
+        stdin (str): Entrée standard transmise au processus
+    
+    Returns:
+        float: Durée d'exécution (en secondes)
+    """
+    start = time.perf_counter()
+    subprocess.run(
+        [sys.executable] + args,
+        cwd=app_dir,
+        input=stdin,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        text=True,
+        check=False
+    )
+    return time.perf_counter() - start
+
+def run_benchmarks(repeat):
+    """
+    Mesure tous les points d'entrée.
+    
+    Args:
+        repeat (int): Nombre d'exécutions par point d'entrée
+    
+    Returns:
+        dict: Résultats par point d'entrée (médiane, minimum, mesures)
+    """
+    results = {}
+    with tempfile.TemporaryDirectory() as app_dir:
+        for path in glob.glob(os.path.join(PROJECT_DIR, '*.py')):
+            shutil.copy(path, app_dir)
+        
+        for name, (args, stdin) in ENTRY_POINTS.items():
+            # Première exécution non mesurée (cache disque, bytecode)
+            run_entry_point(app_dir, args, stdin)
+            runs = [run_entry_point(app_dir, args, stdin) for _ in range(repeat)]
+            results[name] = {
+                'median_s': statistics.median(runs),
+                'min_s': min(runs),
+                'runs_s': runs,
+            }
+    
+    return results
+
+def compare(results, baseline, tolerance):
+    """
+    Compare les résultats à une référence.
+    
+    Args:
+        results (dict): Résultats de la mesure actuelle
+        baseline (dict): Résultats de référence
+        tolerance (float): Ralentissement relatif toléré (0.2 pour 20 %)
+    
+    Returns:
+        list: Descriptions des régressions détectées
+    """
+    regressions = []
+    for name, result in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            continue
+        if result['median_s'] > reference['median_s'] * (1 + tolerance):
+            regressions.append(
+                f"{name}: {result['median_s']:.3f} s au lieu de {reference['median_s']:.3f} s"
+            )
+    return regressions
+
+def main():
+    parser = argparse.ArgumentParser(description="Mesure du temps de démarrage des points d'entrée")
+    parser.add_argument('--repeat', type=int, default=5, help="Nombre d'exécutions par point d'entrée")
+    parser.add_argument('--output', help="Fichier JSON où écrire les résultats")
+    parser.add_argument('--baseline', help="Fichier JSON de référence à comparer")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="Ralentissement relatif toléré")
+    args = parser.parse_args()
+    
+    results = run_benchmarks(args.repeat)
+    report = {
+        'benchmark': 'startup',
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results,
+    }
+    
+    for name, result in results.items():
+        print(f"{name:15s} médiane {result['median_s']:.3f} s  min {result['min_s']:.3f} s")
+    
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    
+    if args.baseline:
+        with open(args.baseline, encoding='utf-8') as f:
+            baseline = json.load(f)['results']
+        regressions = compare(results, baseline, args.tolerance)
+        if regressions:
+            print("\nRégressions détectées:")
+            for regression in regressions:
+                print(f"  - {regression}")
+            sys.exit(1)
+        print("\nAucune régression.")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
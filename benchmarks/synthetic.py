@@ -0,0 +1,168 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Générateur de dépenses synthétiques pour les mesures de performance
+
+Les dépenses sont générées de façon déterministe (même graine, même fichier)
+avec une répartition réaliste: quelques catégories concentrent la plupart
+des dépenses, les montants dépendent de la catégorie, et les dates couvrent
+plusieurs années avec plus de dépenses le week-end et en décembre. Le
+fichier est écrit par blocs, dans l'ordre chronologique comme un historique
+réel, sans jamais tenir plus d'un bloc en mémoire (jusqu'à plusieurs
+millions de dépenses).
+
+Utilisation:
+    python benchmarks/synthetic.py --rows 1000000 --data-dir /tmp/depenses
+"""
+
+import os
+import sys
+import argparse
+import numpy as np
+import pandas as pd
+
+# Racine du projet (répertoire parent de benchmarks/)
+PROJECT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_DIR)
+
+from expense_storage import CSVStorage, COLUMNS, migrate_storage
+
+# Catégories: (part des dépenses, montant médian, dispersion log-normale)
+CATEGORIES = {
+    'Alimentation': (0.38, 18.0, 0.7),
+    'Transport': (0.20, 12.0, 0.8),
+    'Loisirs': (0.14, 30.0, 0.9),
+    'Autre': (0.10, 25.0, 1.0),
+    'Santé': (0.08, 35.0, 0.8),
+    'Logement': (0.06, 450.0, 0.6),
+    'Éducation': (0.04, 60.0, 0.9),
+}
+
+# Mots des descriptions, par catégorie
+DESCRIPTIONS = {
+    'Alimentation': ['Courses', 'Boulangerie', 'Marché', 'Restaurant', 'Supérette'],
+    'Transport': ['Bus', 'Métro', 'Essence', 'Train', 'Taxi'],
+    'Loisirs': ['Cinéma', 'Concert', 'Livre', 'Sport', 'Jeu'],
+    'Autre': ['Cadeau', 'Vêtements', 'Bricolage', 'Divers'],
+    'Santé': ['Pharmacie', 'Médecin', 'Dentiste', 'Mutuelle'],
+    'Logement': ['Loyer', 'Électricité', 'Eau', 'Internet', 'Assurance'],
+    'Éducation': ['Cours', 'Fournitures', 'Formation'],
+}
+
+# Premier jour des historiques générés (fixe, pour des fichiers identiques)
+START_DAY = np.datetime64('2015-01-01')
+
+# Nombre de dépenses générées par bloc
+CHUNK_ROWS = 500000
+
+def day_weights(days):
+    """
+    Calcule le poids relatif de chaque jour dans le tirage des dates.
+    
+    Args:
+        days (numpy.ndarray): Jours (datetime64[D])
+    
+    Returns:
+        numpy.ndarray: Poids de chaque jour (somme 1)
+    """
+    weekday = (days.astype(np.int64) + 3) % 7  # 0 = lundi
+    month = days.astype('datetime64[M]').astype(np.int64) % 12 + 1
+    weights = np.ones(len(days))
+    weights[weekday >= 5] *= 1.4
+    weights[month == 12] *= 1.5
+    weights[month == 8] *= 0.8
+    return weights / weights.sum()
+
+def generate_expenses(rows, seed=0, years=5, chunk_rows=CHUNK_ROWS):
+    """
+    Génère des dépenses synthétiques par blocs, dans l'ordre chronologique.
+    
+    Args:
+        rows (int): Nombre total de dépenses
+        seed (int, optional): Graine du générateur aléatoire
+        years (int, optional): Nombre d'années couvertes par les dates
+        chunk_rows (int, optional): Nombre de dépenses par bloc
+    
+    Yields:
+        pandas.DataFrame: Bloc de dépenses (colonnes de COLUMNS, dates en texte)
+    """
+    rng = np.random.default_rng(seed)
+    names = list(CATEGORIES)
+    shares = np.array([CATEGORIES[name][0] for name in names])
+    medians = np.array([CATEGORIES[name][1] for name in names])
+    sigmas = np.array([CATEGORIES[name][2] for name in names])
+    
+    # Mots des descriptions mis bout à bout: début et nombre par catégorie
+    words = np.array([word for name in names for word in DESCRIPTIONS[name]])
+    lengths = np.array([len(DESCRIPTIONS[name]) for name in names])
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    
+    all_days = START_DAY + np.arange(365 * years)
+    chunks = max(1, -(-rows // chunk_rows))
+    for index in range(chunks):
+        count = min(chunk_rows, rows - index * chunk_rows)
+        
+        # Chaque bloc couvre sa part de la période: l'historique est chronologique
+        days = all_days[index * len(all_days) // chunks:(index + 1) * len(all_days) // chunks]
+        dates = np.sort(rng.choice(days, size=count, p=day_weights(days)))
+        
+        codes = rng.choice(len(names), size=count, p=shares / shares.sum())
+        amounts = np.round(medians[codes] * rng.lognormal(0.0, sigmas[codes]), 2)
+        amounts = np.maximum(amounts, 0.5)
+        
+        picked = words[starts[codes] + rng.integers(0, 1 << 30, count) % lengths[codes]]
+        descriptions = np.char.add(np.char.add(picked, ' '), rng.integers(1, 1000, count).astype(str))
+        
+        yield pd.DataFrame({
+            'Date': np.datetime_as_string(dates, unit='D'),
+            'Montant': amounts,
+            'Catégorie': np.array(names)[codes],
+            'Description': descriptions,
+        }, columns=COLUMNS)
+
+def write_ledger(path, rows, seed=0, years=5):
+    """
+    Écrit un fichier CSV de dépenses synthétiques.
+    
+    Args:
+        path (str): Chemin du fichier CSV (remplacé s'il existe)
+        rows (int): Nombre de dépenses
+        seed (int, optional): Graine du générateur aléatoire
+        years (int, optional): Nombre d'années couvertes par les dates
+    """
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        for index, chunk in enumerate(generate_expenses(rows, seed, years)):
+            chunk.to_csv(f, index=False, header=index == 0, lineterminator='\n')
+
+def create_data_dir(data_dir, rows, seed=0, years=5, backend='csv'):
+    """
+    Crée un répertoire de données rempli de dépenses synthétiques.
+    
+    Args:
+        data_dir (str): Répertoire de données (créé s'il n'existe pas)
+        rows (int): Nombre de dépenses
+        seed (int, optional): Graine du générateur aléatoire
+        years (int, optional): Nombre d'années couvertes par les dates
+        backend (str, optional): Moteur de stockage ('csv', 'sqlite' ou 'columnar')
+    """
+    os.makedirs(data_dir, exist_ok=True)
+    storage = CSVStorage(data_dir)
+    write_ledger(storage.path, rows, seed, years)
+    if backend != 'csv':
+        migrate_storage(data_dir, backend)
+
+def main():
+    parser = argparse.ArgumentParser(description="Génération de dépenses synthétiques")
+    parser.add_argument('--rows', type=int, default=100000, help="Nombre de dépenses")
+    parser.add_argument('--seed', type=int, default=0, help="Graine du générateur aléatoire")
+    parser.add_argument('--years', type=int, default=5, help="Nombre d'années couvertes")
+    parser.add_argument('--backend', default='csv', choices=['csv', 'sqlite', 'columnar'], help="Moteur de stockage")
+    parser.add_argument('--data-dir', required=True, help="Répertoire de données à créer")
+    args = parser.parse_args()
+    
+    create_data_dir(args.data_dir, args.rows, args.seed, args.years, args.backend)
+    print(f"{args.rows} dépenses générées dans {args.data_dir}")
+
+if __name__ == "__main__":
+    main()
\ No newline at end of file
@@ -0,0 +1,271 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module des agrégats des dépenses
+
+Ce module maintient des agrégats (totaux, nombres, minimum, maximum, par
+catégorie et par jour, esquisse des montants pour la médiane) mis à jour à
+chaque ajout et enregistrés à côté des données, afin d'obtenir les
+statistiques sans relire toutes les dépenses.
+"""
+
+import os
+import json
+import math
+import threading
+
+from expense_streaming import QuantileSketch
+
+# Erreur relative maximale de la médiane tirée des agrégats
+MEDIAN_ACCURACY = 0.01
+
+def median_label(stats):
+    """
+    Retourne le libellé de la médiane, en précisant si elle est estimée.
+    
+    Args:
+        stats (dict): Statistiques des dépenses
+    
+    Returns:
+        str: Libellé à afficher devant la médiane
+    """
+    accuracy = stats.get('median_accuracy', stats.get('relative_accuracy'))
+    if accuracy is None:
+        return "Médiane des dépenses"
+    return f"Médiane des dépenses (estimée à {accuracy * 100:g} % près)"
+
+class RunningAggregates:
+    """
+    Classe pour maintenir les agrégats des dépenses au fil des ajouts.
+    
+    La signature du stockage au moment de la dernière mise à jour est
+    enregistrée avec les agrégats: si les données ont été modifiées en dehors
+    du gestionnaire, les agrégats sont considérés comme périmés.
+    """
+    
+    def __init__(self, path):
+        """
+        Initialise les agrégats et les charge depuis le fichier s'il existe.
+        
+        Args:
+            path (str): Chemin du fichier des agrégats (None pour des agrégats
+                uniquement en mémoire)
+        """
+        self.path = path
+        self.reset()
+        self.load()
+    
+    def reset(self):
+        """
+        Remet les agrégats à zéro.
+        """
+        self.signature = None
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.by_category = {}
+        self.by_date = {}
+        self.sketch = QuantileSketch(MEDIAN_ACCURACY)
+    
+    def load(self):
+        """
+        Charge les agrégats depuis le fichier.
+        
+        Un fichier absent ou illisible laisse des agrégats vides et périmés.
+        """
+        if self.path is None or not os.path.exists(self.path):
+            return
+        
+        try:
+            with open(self.path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            self.reset()
+            return
+        
+        signature = data.get('signature')
+        self.signature = tuple(signature) if signature is not None else None
+        self.count = data.get('count', 0)
+        self.total = data.get('total', 0.0)
+        self.min = data.get('min')
+        self.max = data.get('max')
+        self.by_category = data.get('by_category', {})
+        self.by_date = data.get('by_date', {})
+        
+        sketch = data.get('sketch')
+        if sketch is None or 'values' not in sketch:
+            # Agrégats enregistrés sans esquisse des montants (ou sans ses
+            # valeurs exactes): à recalculer
+            self.signature = None
+        else:
+            self.sketch = QuantileSketch.from_dict(sketch)
+    
+    def save(self):
+        """
+        Enregistre les agrégats de façon atomique.
+        """
+        data = {
+            'signature': list(self.signature) if self.signature is not None else None,
+            'count': self.count,
+            'total': self.total,
+            'min': self.min,
+            'max': self.max,
+            'by_category': self.by_category,
+            'by_date': self.by_date,
+            'sketch': self.sketch.to_dict(),
+        }
+        # Fichier temporaire propre au processus: plusieurs processus peuvent
+        # enregistrer les agrégats en même temps
+        tmp_file = f"{self.path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_file, self.path)
+    
+    def is_current(self, signature):
+        """
+        Indique si les agrégats correspondent à l'état actuel du stockage.
+        
+        Args:
+            signature (tuple): Signature actuelle du stockage
+        
+        Returns:
+            bool: True si les agrégats sont à jour
+        """
+        return self.signature is not None and self.signature == tuple(signature or ())
+    
+    def apply(self, records):
+        """
+        Met à jour les agrégats avec de nouvelles dépenses.
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        """
+        amounts = []
+        for date, amount, category, _ in records:
+            amount = float(amount)
+            amounts.append(amount)
+            self.count += 1
+            self.total += amount
+            self.min = amount if self.min is None else min(self.min, amount)
+            self.max = amount if self.max is None else max(self.max, amount)
+            
+            entry = self.by_category.setdefault(category, {'total': 0.0, 'count': 0})
+            entry['total'] += amount
+            entry['count'] += 1
+            
+            self.by_date[date] = self.by_date.get(date, 0.0) + amount
+        
+        self.sketch.add(amounts)
+    
+    def rebuild(self, expenses, signature=None):
+        """
+        Recalcule tous les agrégats à partir des dépenses.
+        
+        Args:
+            expenses (pandas.DataFrame): DataFrame contenant toutes les dépenses
+            signature (tuple, optional): Signature du stockage correspondant
+                aux dépenses (None pour des agrégats uniquement en mémoire)
+        """
+        self.reset()
+        self.signature = tuple(signature) if signature is not None else None
+        if expenses.empty:
+            return
+        
+        amounts = expenses['Montant'].astype(float)
+        self.count = int(len(amounts))
+        self.total = float(amounts.sum())
+        self.min = float(amounts.min())
+        self.max = float(amounts.max())
+        self.sketch.add(amounts.to_numpy())
+        
+        by_category = amounts.groupby(expenses['Catégorie'], observed=True).agg(['sum', 'count'])
+        self.by_category = {
+            str(category): {'total': float(total), 'count': int(count)}
+            for category, total, count in zip(by_category.index, by_category['sum'], by_category['count'])
+        }
+        
+        days = expenses['Date'].dt.strftime("%Y-%m-%d")
+        self.by_date = {day: float(total) for day, total in amounts.groupby(days).sum().items()}
+    
+    def statistics(self):
+        """
+        Construit les statistiques à partir des agrégats.
+        
+        La médiane est tirée de l'esquisse des montants: exacte pour les
+        petits historiques, estimée au-delà à moins de MEDIAN_ACCURACY près
+        en relatif ('median_accuracy', absent si la médiane est exacte). Son
+        calcul ne dépend pas du nombre de dépenses.
+        
+        Returns:
+            dict: Statistiques des dépenses (None si aucune dépense)
+        """
+        if self.count == 0:
+            return None
+        
+        stats = {
+            'total': self.total,
+            'mean': self.total / self.count,
+            'median': self.sketch.quantile(0.5),
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+            'by_category': {
+                category: self.by_category[category]['total']
+                for category in sorted(self.by_category)
+            }
+        }
+        if not self.sketch.exact:
+            stats['median_accuracy'] = self.sketch.relative_accuracy
+        return stats
+    
+    def compare(self, other):
+        """
+        Compare ces agrégats à d'autres (aux erreurs d'arrondi près).
+        
+        Args:
+            other (RunningAggregates): Agrégats de référence
+        
+        Returns:
+            list: Descriptions des écarts trouvés (vide si identiques)
+        """
+        def close(a, b):
+            if a is None or b is None:
+                return a is b
+            return math.isclose(a, b, rel_tol=1e-9, abs_tol=1e-6)
+        
+        differences = []
+        for name in ('count', 'total', 'min', 'max'):
+            if not close(getattr(self, name), getattr(other, name)):
+                differences.append(f"{name}: {getattr(self, name)} au lieu de {getattr(other, name)}")
+        
+        if self.sketch.to_dict() != other.sketch.to_dict():
+            differences.append("esquisse des montants (médiane) différente")
+        
+        for category in sorted(set(self.by_category) | set(other.by_category)):
+            mine = self.by_category.get(category, {'total': 0.0, 'count': 0})
+            theirs = other.by_category.get(category, {'total': 0.0, 'count': 0})
+            if mine['count'] != theirs['count'] or not close(mine['total'], theirs['total']):
+                differences.append(f"catégorie {category}: {mine} au lieu de {theirs}")
+        
+        for day in sorted(set(self.by_date) | set(other.by_date)):
+            if not close(self.by_date.get(day, 0.0), other.by_date.get(day, 0.0)):
+                differences.append(f"jour {day}: {self.by_date.get(day, 0.0)} au lieu de {other.by_date.get(day, 0.0)}")
+        
+        return differences
+
+class LiveStatistics(RunningAggregates):
+    """
+    Agrégats en mémoire, pour des statistiques tenues à jour ajout par ajout.
+    
+    Ils permettent d'afficher les statistiques sans relire les dépenses: un
+    ajout coûte un temps constant, la médiane étant tirée de l'esquisse
+    des montants plutôt que lue dans un tableau trié à tenir à jour.
+    """
+    
+    def __init__(self):
+        """
+        Initialise des statistiques vides.
+        """
+        super().__init__(None)
\ No newline at end of file
@@ -9,10 +9,13 @@ Ce module permet d'analyser les dépenses et de générer des statistiques et de
 
 import os
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from datetime import datetime
 
+from expense_profiling import profiled, stage
+from expense_rollup import RollupCube
+from expense_manager import filter_expenses, parse_period
+from expense_streaming import ChunkSizer, StreamingStatistics
+
 class ExpenseAnalyzer:
     """
     Classe pour analyser les dépenses personnelles.
@@ -26,105 +29,224 @@ class ExpenseAnalyzer:
             expense_manager (ExpenseManager): Instance du gestionnaire de dépenses
         """
         self.expense_manager = expense_manager
+        
+        # Cube des cumuls par période et catégorie, construit à la première
+        # demande puis mis à jour à chaque ajout
+        self._rollup = None
+        expense_manager.subscribe(self._on_expenses_changed)
+    
+    def _on_expenses_changed(self, event, records):
+        """
+        Met à jour le cube des cumuls après une modification des dépenses.
+        
+        Args:
+            event (str): Type d'événement ('added' ou 'reset')
+            records (list): Lignes [date, montant, catégorie, description] ajoutées
+        """
+        if self._rollup is None:
+            return
+        
+        if event != 'added':
+            self._rollup = None
+            return
+        
+        self._rollup.apply(records)
+        self._rollup.signature = self.expense_manager.storage.signature()
+        
+        # Données modifiées en dehors du gestionnaire depuis la construction
+        # du cube: il sera reconstruit à la prochaine demande
+        if self._rollup.count != self.expense_manager.get_aggregates().count:
+            self._rollup = None
+    
+    def get_rollup(self):
+        """
+        Retourne le cube des cumuls par période et catégorie, à jour.
+        
+        Le cube n'est reconstruit à partir des dépenses que si les données ont
+        été modifiées en dehors du gestionnaire.
+        
+        Returns:
+            RollupCube: Cube des cumuls
+        """
+        signature = self.expense_manager.storage.signature()
+        if self._rollup is None or self._rollup.signature != signature:
+            rollup = RollupCube()
+            expenses = self.expense_manager.get_all_expenses()
+            with stage('analyzer.rollup'):
+                rollup.build(expenses, signature)
+            self._rollup = rollup
+        return self._rollup
+    
+    def get_trend(self, granularity='month', categories=None):
+        """
+        Calcule l'évolution des dépenses par période, à partir du cube.
+        
+        Args:
+            granularity (str): 'day', 'week', 'month' ou 'year'
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Returns:
+            pandas.Series: Montant total par période
+        """
+        return self.get_rollup().trend(granularity, categories)
+    
+    def get_rolling_average(self, window=7, granularity='day', categories=None):
+        """
+        Calcule la moyenne glissante des dépenses, à partir du cube.
+        
+        Args:
+            window (int): Nombre de périodes de la fenêtre
+            granularity (str): 'day', 'week', 'month' ou 'year'
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Returns:
+            pandas.Series: Moyenne des totaux sur les window dernières périodes
+        """
+        return self.get_rollup().rolling_average(window, granularity, categories)
     
-    def get_statistics(self):
+    def compare_periods(self, granularity='month', period=None, offset=1):
+        """
+        Compare une période à une période antérieure, à partir du cube.
+        
+        Args:
+            granularity (str): 'day', 'week', 'month' ou 'year'
+            period (date ou str, optional): Jour de la période à comparer
+                (dernière période par défaut)
+            offset (int, optional): Nombre de périodes en arrière (12 en mois
+                pour comparer à la même période de l'année précédente)
+        
+        Returns:
+            pandas.DataFrame: Montants actuels et de référence, écart et
+                évolution par catégorie, avec une ligne 'Total'
+        """
+        return self.get_rollup().compare(granularity, period, offset)
+    
+    @profiled('analyzer.statistics')
+    def get_statistics(self, snapshot=None):
         """
         Calcule les statistiques des dépenses.
         
+        Sans instantané, les statistiques proviennent des agrégats maintenus
+        par le gestionnaire, sans relire les dépenses: la médiane est alors
+        estimée par leur esquisse des montants (voir RunningAggregates).
+        
+        Args:
+            snapshot (ExpenseSnapshot, optional): Instantané à analyser
+        
         Returns:
             dict: Dictionnaire contenant les statistiques des dépenses
         """
-        expenses = self.expense_manager.get_all_expenses()
+        if snapshot is not None:
+            return snapshot.statistics
         
-        if expenses.empty:
-            return None
+        return self.expense_manager.get_statistics()
+    
+    @profiled('analyzer.streaming_statistics')
+    def get_streaming_statistics(self, memory_limit_mb=64, relative_accuracy=0.01,
+                                 percentiles=(0.25, 0.5, 0.75, 0.9, 0.99), start=None, end=None, categories=None):
+        """
+        Calcule les statistiques en parcourant les dépenses par blocs.
+        
+        Destiné aux historiques trop volumineux pour tenir en mémoire: seuls
+        un bloc et les agrégats sont conservés. La taille des blocs est
+        ajustée à leur mémoire mesurée (voir ChunkSizer). Les sommes, extrêmes
+        et regroupements sont exacts; la médiane et les centiles sont estimés
+        avec une erreur relative d'au plus relative_accuracy.
         
-        # Statistiques générales
-        stats = {
-            'total': expenses['Montant'].sum(),
-            'mean': expenses['Montant'].mean(),
-            'median': expenses['Montant'].median(),
-            'min': expenses['Montant'].min(),
-            'max': expenses['Montant'].max(),
-            'count': len(expenses)
-        }
+        Args:
+            memory_limit_mb (float): Mémoire maximale d'un bloc (Mo)
+            relative_accuracy (float): Erreur relative maximale des quantiles
+            percentiles (tuple): Quantiles à estimer (entre 0 et 1)
+            start (date ou str, optional): Premier jour inclus
+            end (date ou str, optional): Dernier jour inclus
+            categories (list, optional): Catégories retenues (toutes par défaut)
         
-        # Statistiques par catégorie
-        by_category = self.expense_manager.get_expenses_by_category()
-        stats['by_category'] = by_category.to_dict()
+        Returns:
+            dict: Statistiques des dépenses (avec 'by_date', 'percentiles' et
+                'peak_chunk_bytes', mémoire du plus gros bloc lu), ou None si
+                aucune dépense
         
+        Raises:
+            ValueError: Si la limite de mémoire ou la période est invalide
+        """
+        start, end = parse_period(start, end)
+        scoped = start is not None or end is not None or categories is not None
+        
+        sizer = ChunkSizer(memory_limit_mb)
+        accumulator = StreamingStatistics(relative_accuracy)
+        for chunk in self.expense_manager.iter_expenses(sizer):
+            # Mesurer le bloc lu, avant filtrage: c'est lui qui occupe la mémoire
+            sizer.observe(chunk)
+            if scoped:
+                chunk = filter_expenses(chunk, start, end, categories)
+            accumulator.update(chunk)
+        
+        stats = accumulator.result(percentiles)
+        if stats is not None:
+            stats['peak_chunk_bytes'] = sizer.peak_bytes
         return stats
     
-    def generate_graphs(self, output_dir):
+    @profiled('analyzer.graphs')
+    def generate_graphs(self, output_dir, snapshot=None, parallel=True, max_workers=None, use_cache=True):
         """
         Génère des graphiques des dépenses.
         
+        Les graphiques sont dessinés en parallèle dans des processus séparés;
+        seules les séries agrégées leur sont transmises. Un graphique dont
+        les séries n'ont pas changé depuis le dernier rendu est repris du
+        cache (sous-répertoire .chart_cache) au lieu d'être redessiné.
+        
         Args:
             output_dir (str): Répertoire de sortie pour les graphiques
+            snapshot (ExpenseSnapshot, optional): Instantané à représenter. Par
+                défaut, un nouvel instantané est chargé.
+            parallel (bool, optional): Dessiner les graphiques en parallèle
+            max_workers (int, optional): Nombre maximal de processus
+            use_cache (bool, optional): Réutiliser les graphiques en cache
         
         Returns:
             list: Liste des chemins des fichiers graphiques générés
         """
-        expenses = self.expense_manager.get_all_expenses()
+        if snapshot is None:
+            snapshot = self.expense_manager.snapshot()
         
-        if expenses.empty:
+        if snapshot.empty:
             return []
         
+        # Import à la demande: matplotlib et seaborn ne sont chargés que
+        # lorsque des graphiques sont effectivement générés
+        from expense_charts import ChartCache, build_chart_specs, render_charts
+        
         # Créer le répertoire de sortie s'il n'existe pas
         os.makedirs(output_dir, exist_ok=True)
         
-        # Liste pour stocker les chemins des fichiers graphiques
-        graph_files = []
-        
-        # Configurer le style des graphiques
-        sns.set(style="whitegrid")
-        plt.rcParams.update({'font.size': 10})
-        
-        # 1. Graphique en camembert des dépenses par catégorie
-        plt.figure(figsize=(10, 6))
-        by_category = self.expense_manager.get_expenses_by_category()
-        plt.pie(by_category, labels=by_category.index, autopct='%1.1f%%', startangle=90)
-        plt.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-        plt.title('Répartition des Dépenses par Catégorie')
-        
-        # Enregistrer le graphique
-        pie_chart_path = os.path.join(output_dir, 'depenses_par_categorie_pie.png')
-        plt.savefig(pie_chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        graph_files.append(pie_chart_path)
-        
-        # 2. Graphique à barres des dépenses par catégorie
-        plt.figure(figsize=(10, 6))
-        ax = sns.barplot(x=by_category.index, y=by_category.values)
-        plt.title('Dépenses par Catégorie')
-        plt.xlabel('Catégorie')
-        plt.ylabel('Montant (€)')
-        plt.xticks(rotation=45, ha='right')
-        
-        # Ajouter les valeurs sur les barres
-        for i, v in enumerate(by_category.values):
-            ax.text(i, v + 0.1, f"{v:.2f} €", ha='center')
-        
-        # Enregistrer le graphique
-        bar_chart_path = os.path.join(output_dir, 'depenses_par_categorie_bar.png')
-        plt.savefig(bar_chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        graph_files.append(bar_chart_path)
-        
-        # 3. Graphique d'évolution des dépenses dans le temps
-        plt.figure(figsize=(12, 6))
-        by_date = self.expense_manager.get_expenses_by_date()
-        plt.plot(by_date.index, by_date.values, marker='o', linestyle='-')
-        plt.title('Évolution des Dépenses dans le Temps')
-        plt.xlabel('Date')
-        plt.ylabel('Montant (€)')
-        plt.grid(True)
-        plt.xticks(rotation=45)
-        
-        # Enregistrer le graphique
-        time_chart_path = os.path.join(output_dir, 'evolution_depenses.png')
-        plt.savefig(time_chart_path, dpi=300, bbox_inches='tight')
-        plt.close()
-        graph_files.append(time_chart_path)
-        
-        return graph_files
\ No newline at end of file
+        # Camembert et barres par catégorie, évolution dans le temps
+        with stage('analyzer.aggregate'):
+            specs = build_chart_specs(snapshot.by_category, snapshot.by_date, output_dir)
+        cache = ChartCache(os.path.join(output_dir, '.chart_cache')) if use_cache else None
+        with stage('analyzer.render'):
+            return render_charts(specs, parallel=parallel, max_workers=max_workers, cache=cache)
+    
+    @profiled('analyzer.trend_graph')
+    def generate_trend_graph(self, output_dir, granularity='month', window=3):
+        """
+        Génère le graphique de tendance des dépenses, à partir du cube.
+        
+        Args:
+            output_dir (str): Répertoire de sortie du graphique
+            granularity (str): 'day', 'week', 'month' ou 'year'
+            window (int): Nombre de périodes de la moyenne glissante
+        
+        Returns:
+            str: Chemin du fichier généré, ou None si aucune dépense
+        """
+        rollup = self.get_rollup()
+        if rollup.empty:
+            return None
+        
+        from expense_charts import build_trend_spec, render_chart
+        
+        os.makedirs(output_dir, exist_ok=True)
+        trend = rollup.trend(granularity)
+        rolling = rollup.rolling_average(window, granularity)
+        return render_chart(build_trend_spec(trend, rolling, output_dir, granularity, window))
\ No newline at end of file
@@ -0,0 +1,398 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module de rendu des graphiques des dépenses
+
+Ce module dessine les graphiques avec l'API objet de matplotlib (Figure et
+moteur Agg) plutôt qu'avec l'état global de pyplot. Chaque graphique est
+décrit par une spécification ne contenant que des séries déjà agrégées, ce
+qui permet de les rendre en parallèle dans des processus séparés.
+"""
+
+import os
+import json
+import shutil
+import hashlib
+import matplotlib
+import matplotlib.text
+import matplotlib.font_manager
+import seaborn as sns
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from matplotlib.figure import Figure
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+
+# Paramètres de rendu communs à tous les graphiques
+RENDER_PARAMS = {
+    'dpi': 300,
+    'style': 'whitegrid',
+    'font_size': 10,
+}
+
+def build_chart_specs(by_category, by_date, output_dir, render_params=None):
+    """
+    Construit les spécifications des graphiques à partir des séries agrégées.
+    
+    Args:
+        by_category (pandas.Series): Montants totaux par catégorie
+        by_date (pandas.Series): Montants totaux par date
+        output_dir (str): Répertoire de sortie des graphiques
+        render_params (dict, optional): Paramètres de rendu (RENDER_PARAMS par défaut)
+    
+    Returns:
+        list: Spécifications des graphiques (dictionnaires sérialisables)
+    """
+    params = dict(RENDER_PARAMS, **(render_params or {}))
+    categories = [str(category) for category in by_category.index]
+    amounts = [float(amount) for amount in by_category.values]
+    
+    return [
+        {
+            'kind': 'pie',
+            'path': os.path.join(output_dir, 'depenses_par_categorie_pie.png'),
+            'figsize': (10, 6),
+            'labels': categories,
+            'values': amounts,
+            'params': params,
+        },
+        {
+            'kind': 'bar',
+            'path': os.path.join(output_dir, 'depenses_par_categorie_bar.png'),
+            'figsize': (10, 6),
+            'labels': categories,
+            'values': amounts,
+            'params': params,
+        },
+        {
+            'kind': 'time',
+            'path': os.path.join(output_dir, 'evolution_depenses.png'),
+            'figsize': (12, 6),
+            'labels': list(by_date.index),
+            'values': [float(amount) for amount in by_date.values],
+            'params': params,
+        },
+    ]
+
+# Libellés des granularités des graphiques de tendance
+GRANULARITY_LABELS = {
+    'day': 'jour',
+    'week': 'semaine',
+    'month': 'mois',
+    'year': 'année',
+}
+
+def build_trend_spec(trend, rolling, output_dir, granularity, window, render_params=None):
+    """
+    Construit la spécification du graphique de tendance.
+    
+    Args:
+        trend (pandas.Series): Montant total par période
+        rolling (pandas.Series): Moyenne glissante par période
+        output_dir (str): Répertoire de sortie du graphique
+        granularity (str): 'day', 'week', 'month' ou 'year'
+        window (int): Nombre de périodes de la moyenne glissante
+        render_params (dict, optional): Paramètres de rendu (RENDER_PARAMS par défaut)
+    
+    Returns:
+        dict: Spécification du graphique
+    """
+    return {
+        'kind': 'trend',
+        'path': os.path.join(output_dir, f'tendance_depenses_{granularity}.png'),
+        'figsize': (12, 6),
+        'labels': [period.strftime("%Y-%m-%d") for period in trend.index],
+        'values': [float(amount) for amount in trend.values],
+        'rolling': [float(amount) for amount in rolling.values],
+        'granularity': granularity,
+        'window': window,
+        'params': dict(RENDER_PARAMS, **(render_params or {})),
+    }
+
+def _draw_pie(ax, spec):
+    """
+    Dessine le graphique en camembert des dépenses par catégorie.
+    """
+    ax.pie(spec['values'], labels=spec['labels'], autopct='%1.1f%%', startangle=90)
+    ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+    ax.set_title('Répartition des Dépenses par Catégorie')
+
+def _draw_bar(ax, spec):
+    """
+    Dessine le graphique à barres des dépenses par catégorie.
+    """
+    sns.barplot(x=spec['labels'], y=spec['values'], ax=ax)
+    ax.set_title('Dépenses par Catégorie')
+    ax.set_xlabel('Catégorie')
+    ax.set_ylabel('Montant (€)')
+    for label in ax.get_xticklabels():
+        label.set_rotation(45)
+        label.set_horizontalalignment('right')
+    
+    # Ajouter les valeurs sur les barres
+    for i, v in enumerate(spec['values']):
+        ax.text(i, v + 0.1, f"{v:.2f} €", ha='center')
+
+def _draw_time(ax, spec):
+    """
+    Dessine le graphique d'évolution des dépenses dans le temps.
+    """
+    ax.plot(spec['labels'], spec['values'], marker='o', linestyle='-')
+    ax.set_title('Évolution des Dépenses dans le Temps')
+    ax.set_xlabel('Date')
+    ax.set_ylabel('Montant (€)')
+    ax.grid(True)
+    ax.tick_params(axis='x', rotation=45)
+
+def _draw_trend(ax, spec):
+    """
+    Dessine le graphique de tendance (totaux par période et moyenne glissante).
+    """
+    label = GRANULARITY_LABELS[spec['granularity']]
+    positions = range(len(spec['labels']))
+    ax.bar(positions, spec['values'], color='#9ecae1', label=f"Total par {label}")
+    ax.plot(positions, spec['rolling'], color='#d62728', marker='o',
+            label=f"Moyenne glissante ({spec['window']} périodes)")
+    ax.set_title(f"Tendance des Dépenses par {label.capitalize()}")
+    ax.set_xlabel('Période')
+    ax.set_ylabel('Montant (€)')
+    
+    # Au plus une vingtaine de libellés, pour rester lisible
+    step = max(1, len(spec['labels']) // 20)
+    ax.set_xticks(list(positions)[::step])
+    ax.set_xticklabels(spec['labels'][::step], rotation=45, ha='right')
+    ax.legend()
+
+# Version du rendu: à incrémenter quand le dessin des graphiques change,
+# afin d'invalider les images en cache
+RENDER_VERSION = 2
+
+class ChartCache:
+    """
+    Cache des images de graphiques, adressé par leur contenu.
+    
+    Chaque image est identifiée par une empreinte de ses séries et de ses
+    paramètres de rendu: un graphique dont les données n'ont pas changé
+    n'est pas redessiné. Les images les moins récemment utilisées sont
+    supprimées quand le cache dépasse sa taille maximale.
+    """
+    
+    def __init__(self, cache_dir, max_bytes=50 * 1024 * 1024):
+        """
+        Initialise le cache.
+        
+        Args:
+            cache_dir (str): Répertoire du cache
+            max_bytes (int, optional): Taille maximale du cache (en octets)
+        """
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+    
+    @staticmethod
+    def key(spec):
+        """
+        Calcule l'empreinte d'un graphique.
+        
+        Args:
+            spec (dict): Spécification du graphique
+        
+        Returns:
+            str: Empreinte SHA-256 des séries et des paramètres de rendu
+        """
+        content = {
+            'version': RENDER_VERSION,
+            'kind': spec['kind'],
+            'figsize': list(spec['figsize']),
+            'labels': [str(label) for label in spec['labels']],
+            'values': spec['values'],
+            'params': spec['params'],
+        }
+        encoded = json.dumps(content, sort_keys=True, ensure_ascii=False).encode('utf-8')
+        return hashlib.sha256(encoded).hexdigest()
+    
+    def _entry_path(self, key):
+        """
+        Retourne le chemin de l'image en cache pour une empreinte.
+        """
+        return os.path.join(self.cache_dir, key + '.png')
+    
+    def fetch(self, spec):
+        """
+        Copie l'image en cache vers le chemin du graphique si elle existe.
+        
+        Args:
+            spec (dict): Spécification du graphique
+        
+        Returns:
+            bool: True si l'image était en cache
+        """
+        entry = self._entry_path(self.key(spec))
+        try:
+            shutil.copyfile(entry, spec['path'])
+            # Marquer l'entrée comme récemment utilisée
+            os.utime(entry)
+        except FileNotFoundError:
+            self.misses += 1
+            return False
+        
+        self.hits += 1
+        return True
+    
+    def store(self, spec):
+        """
+        Ajoute l'image d'un graphique qui vient d'être dessiné au cache.
+        
+        Args:
+            spec (dict): Spécification du graphique
+        """
+        entry = self._entry_path(self.key(spec))
+        tmp_file = entry + '.tmp'
+        shutil.copyfile(spec['path'], tmp_file)
+        os.replace(tmp_file, entry)
+        self.evict()
+    
+    def evict(self):
+        """
+        Supprime les images les moins récemment utilisées au-delà de la taille maximale.
+        """
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith('.png'):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+        
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            total -= size
+
+# Fonctions de dessin, par type de graphique
+DRAWERS = {
+    'pie': _draw_pie,
+    'bar': _draw_bar,
+    'time': _draw_time,
+    'trend': _draw_trend,
+}
+
+def _style_axes(fig, ax, style):
+    """
+    Applique un style seaborn à une figure et à ses axes, avant le dessin.
+    
+    Args:
+        fig (matplotlib.figure.Figure): Figure à styler
+        ax (matplotlib.axes.Axes): Axes à styler
+        style (dict): Paramètres du style (sns.axes_style)
+    """
+    fig.set_facecolor(style['figure.facecolor'])
+    ax.set_facecolor(style['axes.facecolor'])
+    ax.set_axisbelow(style['axes.axisbelow'])
+    for side, spine in ax.spines.items():
+        spine.set_edgecolor(style['axes.edgecolor'])
+        spine.set_visible(style[f'axes.spines.{side}'])
+    
+    ax.grid(style['axes.grid'], color=style['grid.color'], linestyle=style['grid.linestyle'])
+    ax.tick_params(axis='x', colors=style['xtick.color'], direction=style['xtick.direction'],
+                   bottom=style['xtick.bottom'], top=style['xtick.top'])
+    ax.tick_params(axis='y', colors=style['ytick.color'], direction=style['ytick.direction'],
+                   left=style['ytick.left'], right=style['ytick.right'])
+
+def _style_artists(fig, ax, style, font_size):
+    """
+    Applique un style seaborn et la taille de police aux éléments dessinés.
+    
+    Args:
+        fig (matplotlib.figure.Figure): Figure dessinée
+        ax (matplotlib.axes.Axes): Axes dessinés
+        style (dict): Paramètres du style (sns.axes_style)
+        font_size (float): Taille de police de base
+    """
+    if style['patch.force_edgecolor']:
+        for patch in ax.patches:
+            patch.set_edgecolor(style['patch.edgecolor'])
+    
+    for text in fig.findobj(matplotlib.text.Text):
+        text.set_fontsize(font_size)
+        text.set_color(style['text.color'])
+    
+    # Les graduations créées au moment du rendu reprennent ces paramètres
+    ax.tick_params(labelsize=font_size, labelcolor=style['text.color'])
+    
+    # Le titre est un peu plus grand, comme avec la taille 'large' de matplotlib
+    ax.title.set_fontsize(font_size * matplotlib.font_manager.font_scalings['large'])
+    ax.xaxis.label.set_color(style['axes.labelcolor'])
+    ax.yaxis.label.set_color(style['axes.labelcolor'])
+
+def render_chart(spec):
+    """
+    Dessine un graphique et l'enregistre au format PNG.
+    
+    Le style est appliqué directement à la figure et à ses axes, sans
+    modifier la configuration globale de matplotlib: le rendu peut donc
+    avoir lieu dans un thread sans perturber les autres graphiques.
+    
+    Args:
+        spec (dict): Spécification du graphique
+    
+    Returns:
+        str: Chemin du fichier généré
+    """
+    params = spec['params']
+    # Sans bloc with, axes_style se contente de retourner les paramètres du style
+    style = sns.axes_style(params['style'])
+    
+    fig = Figure(figsize=spec['figsize'])
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+    _style_axes(fig, ax, style)
+    DRAWERS[spec['kind']](ax, spec)
+    _style_artists(fig, ax, style, params['font_size'])
+    fig.savefig(spec['path'], dpi=params['dpi'], bbox_inches='tight')
+    
+    return spec['path']
+
+def render_charts(specs, parallel=True, max_workers=None, cache=None):
+    """
+    Dessine plusieurs graphiques, en parallèle dans un groupe de processus.
+    
+    Les graphiques présents dans le cache sont copiés au lieu d'être
+    redessinés. Si les processus ne peuvent pas être lancés, les graphiques
+    sont dessinés les uns après les autres.
+    
+    Args:
+        specs (list): Spécifications des graphiques
+        parallel (bool, optional): Dessiner les graphiques en parallèle
+        max_workers (int, optional): Nombre maximal de processus
+        cache (ChartCache, optional): Cache des images déjà dessinées
+    
+    Returns:
+        list: Chemins des fichiers générés, dans l'ordre des spécifications
+    """
+    pending = [spec for spec in specs if cache is None or not cache.fetch(spec)]
+    
+    rendered = None
+    if parallel and len(pending) > 1:
+        workers = min(len(pending), max_workers or os.cpu_count() or 1)
+        if workers > 1:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    rendered = list(executor.map(render_chart, pending))
+            except (OSError, BrokenProcessPool) as e:
+                print(f"Rendu parallèle impossible, rendu séquentiel: {e}")
+    
+    if rendered is None:
+        for spec in pending:
+            render_chart(spec)
+    
+    if cache is not None:
+        for spec in pending:
+            cache.store(spec)
+    
+    return [spec['path'] for spec in specs]
\ No newline at end of file
@@ -0,0 +1,459 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module des commandes non interactives
+
+Ce module permet de piloter l'application sans interface ni saisie, par
+exemple depuis cron: ajout et import de dépenses, statistiques, graphiques
+et rapports, chacun avec un répertoire de données et un répertoire de
+sortie explicites. Le mode lot génère les rapports de plusieurs
+répertoires de données en parallèle et résume le résultat de chacun dans
+un fichier JSON et dans le code de sortie.
+
+Utilisation:
+    python main.py add 12.5 Transport --description Bus --data-dir data
+    python main.py import releve.csv --data-dir data
+    python main.py stats --data-dir data --json
+    python main.py report --data-dir data --out reports --start 2024-01-01
+    python main.py batch comptes/* --out reports --workers 4
+"""
+
+import os
+import sys
+import json
+import argparse
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+
+from expense_manager import ExpenseManager
+from expense_aggregates import median_label
+
+# Sous-commandes reconnues par main.py
+COMMANDS = ('add', 'import', 'stats', 'graphs', 'report', 'batch')
+
+# Répertoires par défaut, à côté de l'application
+APP_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_DATA_DIR = os.path.join(APP_DIR, 'data')
+DEFAULT_OUTPUT_DIR = os.path.join(APP_DIR, 'reports')
+
+# Codes de sortie (argparse utilise 2 pour les erreurs d'utilisation)
+EXIT_OK = 0
+EXIT_FAILURE = 1
+
+def open_manager(data_dir, create=False):
+    """
+    Ouvre le gestionnaire d'un répertoire de données.
+    
+    Args:
+        data_dir (str): Répertoire de données
+        create (bool, optional): Créer le répertoire s'il n'existe pas
+    
+    Returns:
+        ExpenseManager: Gestionnaire de dépenses
+    
+    Raises:
+        ValueError: Si le répertoire n'existe pas et ne doit pas être créé
+    """
+    if not create and not os.path.isdir(data_dir):
+        raise ValueError(f"Répertoire de données introuvable: {data_dir}")
+    return ExpenseManager(data_dir)
+
+def statistics_to_json(stats):
+    """
+    Convertit des statistiques en valeurs sérialisables en JSON.
+    
+    Args:
+        stats (dict): Statistiques des dépenses
+    
+    Returns:
+        dict: Statistiques (nombres Python, catégories en texte)
+    """
+    result = {}
+    for key, value in stats.items():
+        if hasattr(value, 'items'):
+            result[key] = {str(name): float(amount) for name, amount in value.items()}
+        elif value is None:
+            result[key] = None
+        elif key in ('count', 'peak_chunk_bytes'):
+            result[key] = int(value)
+        else:
+            result[key] = float(value)
+    return result
+
+def generate_ledger_report(data_dir, output_dir, start=None, end=None, categories=None,
+                           vector_charts=False, parallel_charts=True, transactions=False):
+    """
+    Génère le rapport PDF d'un répertoire de données.
+    
+    Args:
+        data_dir (str): Répertoire de données (doit exister)
+        output_dir (str): Répertoire de sortie du rapport
+        start (str, optional): Premier jour inclus (AAAA-MM-JJ)
+        end (str, optional): Dernier jour inclus (AAAA-MM-JJ)
+        categories (list, optional): Catégories retenues (toutes par défaut)
+        vector_charts (bool, optional): Graphiques vectoriels (reportlab)
+        parallel_charts (bool, optional): Dessiner les graphiques en parallèle
+        transactions (bool, optional): Ajouter la liste détaillée des dépenses
+    
+    Returns:
+        str: Chemin du rapport, ou None si aucune dépense
+    
+    Raises:
+        ValueError: Si le répertoire n'existe pas ou si la période est invalide
+    """
+    # Import à la demande: reportlab n'est chargé que pour générer un rapport
+    from expense_analyzer import ExpenseAnalyzer
+    from expense_reporter import ExpenseReporter
+    
+    manager = open_manager(data_dir)
+    try:
+        reporter = ExpenseReporter(ExpenseAnalyzer(manager))
+        return reporter.generate_pdf_report(
+            output_dir, vector_charts=vector_charts, start=start, end=end,
+            categories=categories, parallel_charts=parallel_charts, transactions=transactions
+        )
+    finally:
+        manager.storage.close()
+
+def _batch_task(data_dir, output_dir, start, end, categories, vector_charts):
+    """
+    Génère le rapport d'un répertoire du lot (dans un processus du groupe).
+    
+    Returns:
+        dict: Résultat du répertoire ('status' vaut 'ok', 'empty' ou 'error')
+    """
+    started = time.perf_counter()
+    result = {'data_dir': data_dir, 'output_dir': output_dir, 'report': None, 'error': None}
+    try:
+        # Les rapports sont déjà répartis entre les processus: graphiques en série
+        result['report'] = generate_ledger_report(
+            data_dir, output_dir, start, end, categories, vector_charts, parallel_charts=False
+        )
+        result['status'] = 'ok' if result['report'] else 'empty'
+    except Exception as e:
+        result['status'] = 'error'
+        result['error'] = f"{type(e).__name__}: {e}"
+    result['duration_s'] = time.perf_counter() - started
+    return result
+
+def batch_output_dirs(data_dirs, output_dir):
+    """
+    Attribue un sous-répertoire de sortie distinct à chaque répertoire de données.
+    
+    Args:
+        data_dirs (list): Répertoires de données
+        output_dir (str): Répertoire de sortie du lot
+    
+    Returns:
+        list: Répertoires de sortie, dans l'ordre des répertoires de données
+    """
+    used = set()
+    result = []
+    for data_dir in data_dirs:
+        name = os.path.basename(os.path.normpath(os.path.abspath(data_dir))) or 'data'
+        label, index = name, 2
+        while label in used:
+            label = f"{name}-{index}"
+            index += 1
+        used.add(label)
+        result.append(os.path.join(output_dir, label))
+    return result
+
+def run_batch(data_dirs, output_dir, workers=None, start=None, end=None, categories=None, vector_charts=False):
+    """
+    Génère les rapports de plusieurs répertoires de données en parallèle.
+    
+    Chaque répertoire est traité dans un processus du groupe; l'échec de l'un
+    n'empêche pas les autres. Si les processus ne peuvent pas être lancés,
+    les rapports sont générés les uns après les autres.
+    
+    Args:
+        data_dirs (list): Répertoires de données
+        output_dir (str): Répertoire de sortie (un sous-répertoire par répertoire de données)
+        workers (int, optional): Nombre maximal de processus (nombre de
+            processeurs par défaut)
+        start (str, optional): Premier jour inclus (AAAA-MM-JJ)
+        end (str, optional): Dernier jour inclus (AAAA-MM-JJ)
+        categories (list, optional): Catégories retenues (toutes par défaut)
+        vector_charts (bool, optional): Graphiques vectoriels (reportlab)
+    
+    Returns:
+        dict: Résumé du lot, avec le résultat de chaque répertoire dans 'ledgers'
+    """
+    started_at = datetime.now()
+    started = time.perf_counter()
+    workers = max(1, min(len(data_dirs), workers or os.cpu_count() or 1))
+    tasks = [
+        (data_dir, ledger_output, start, end, categories, vector_charts)
+        for data_dir, ledger_output in zip(data_dirs, batch_output_dirs(data_dirs, output_dir))
+    ]
+    
+    results = None
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [executor.submit(_batch_task, *task) for task in tasks]
+                results = []
+                for task, future in zip(tasks, futures):
+                    try:
+                        results.append(future.result())
+                    except Exception as e:
+                        # Processus interrompu (mémoire, signal): seul ce répertoire échoue
+                        results.append({
+                            'data_dir': task[0], 'output_dir': task[1], 'report': None,
+                            'status': 'error', 'error': f"{type(e).__name__}: {e}", 'duration_s': None,
+                        })
+        except OSError as e:
+            print(f"Génération parallèle impossible, génération séquentielle: {e}", file=sys.stderr)
+            results = None
+    
+    if results is None:
+        results = [_batch_task(*task) for task in tasks]
+    
+    return {
+        'started': started_at.isoformat(timespec='seconds'),
+        'duration_s': time.perf_counter() - started,
+        'workers': workers,
+        'output_dir': output_dir,
+        'succeeded': sum(result['status'] != 'error' for result in results),
+        'failed': sum(result['status'] == 'error' for result in results),
+        'ledgers': results,
+    }
+
+def command_add(args):
+    """Ajoute une dépense"""
+    manager = open_manager(args.data_dir, create=True)
+    result = manager.add_expenses([{
+        'Montant': args.amount,
+        'Catégorie': args.category,
+        'Description': args.description,
+        'Date': args.date,
+    }])
+    if result['rejected']:
+        print(f"Dépense refusée: {result['rejected'][0][1]}", file=sys.stderr)
+        return EXIT_FAILURE
+    
+    print("Dépense ajoutée.")
+    return EXIT_OK
+
+def command_import(args):
+    """Importe les dépenses d'un fichier CSV"""
+    import pandas as pd
+    
+    expenses = pd.read_csv(args.file, sep=args.delimiter, encoding=args.encoding, dtype=str, keep_default_na=False)
+    manager = open_manager(args.data_dir, create=True)
+    result = manager.add_expenses(expenses)
+    
+    print(f"{result['added']} dépenses importées, {len(result['rejected'])} lignes rejetées.")
+    for index, reason in result['rejected']:
+        # Numéro de ligne dans le fichier (en-tête en ligne 1)
+        print(f"  ligne {index + 2}: {reason}", file=sys.stderr)
+    return EXIT_FAILURE if result['rejected'] else EXIT_OK
+
+def command_stats(args):
+    """Affiche les statistiques des dépenses"""
+    from expense_analyzer import ExpenseAnalyzer
+    
+    manager = open_manager(args.data_dir)
+    analyzer = ExpenseAnalyzer(manager)
+    if args.streaming:
+        # Lecture par blocs en mémoire bornée, pour les historiques volumineux
+        stats = analyzer.get_streaming_statistics(
+            args.memory_limit, start=args.start, end=args.end, categories=args.category
+        )
+    elif args.start or args.end or args.category:
+        stats = analyzer.get_statistics(manager.snapshot(args.start, args.end, args.category))
+    else:
+        stats = analyzer.get_statistics()
+    
+    if args.json:
+        print(json.dumps(statistics_to_json(stats) if stats else None, ensure_ascii=False, indent=2))
+        return EXIT_OK
+    
+    if not stats:
+        print("Aucune dépense.")
+        return EXIT_OK
+    
+    print(f"Total des dépenses: {stats['total']:.2f} €")
+    print(f"Nombre de dépenses: {stats['count']}")
+    print(f"Moyenne des dépenses: {stats['mean']:.2f} €")
+    print(f"{median_label(stats)}: {stats['median']:.2f} €")
+    print(f"Dépense minimale: {stats['min']:.2f} €")
+    print(f"Dépense maximale: {stats['max']:.2f} €")
+    print("Dépenses par catégorie:")
+    for category, amount in stats['by_category'].items():
+        print(f"  {category}: {amount:.2f} €")
+    if 'percentiles' in stats:
+        print("Centiles (estimés):" if stats['relative_accuracy'] else "Centiles:")
+        for q, value in stats['percentiles'].items():
+            print(f"  {q * 100:g} %: {value:.2f} €")
+        print(f"Plus gros bloc lu: {stats['peak_chunk_bytes'] / 1024 / 1024:.2f} Mo")
+    return EXIT_OK
+
+def command_graphs(args):
+    """Génère les graphiques des dépenses"""
+    from expense_analyzer import ExpenseAnalyzer
+    
+    graph_files = ExpenseAnalyzer(open_manager(args.data_dir)).generate_graphs(args.out)
+    if not graph_files:
+        print("Aucune dépense: aucun graphique généré.")
+    for graph_file in graph_files:
+        print(graph_file)
+    return EXIT_OK
+
+def command_report(args):
+    """Génère un rapport PDF des dépenses, ou un rapport par période et/ou catégorie"""
+    if args.by or args.by_category:
+        return command_partitioned_report(args)
+    
+    report_path = generate_ledger_report(
+        args.data_dir, args.out, args.start, args.end, args.category, args.vector,
+        transactions=args.transactions
+    )
+    if not report_path:
+        print("Aucune dépense: aucun rapport généré.")
+    else:
+        print(report_path)
+    return EXIT_OK
+
+def command_partitioned_report(args):
+    """Génère un rapport PDF par période et/ou par catégorie"""
+    from expense_analyzer import ExpenseAnalyzer
+    from expense_reporter import ExpenseReporter
+    
+    manager = open_manager(args.data_dir)
+    reports = ExpenseReporter(ExpenseAnalyzer(manager)).generate_partitioned_reports(
+        args.out, args.by, args.by_category, args.start, args.end, args.category,
+        vector_charts=args.vector, max_workers=args.workers, transactions=args.transactions
+    )
+    if not reports:
+        print("Aucune dépense: aucun rapport généré.")
+    for report_path in reports.values():
+        print(report_path)
+    return EXIT_OK
+
+def command_batch(args):
+    """Génère les rapports de plusieurs répertoires de données en parallèle"""
+    summary = run_batch(
+        args.data_dirs, args.out, args.workers, args.start, args.end, args.category, args.vector
+    )
+    
+    for result in summary['ledgers']:
+        if result['status'] == 'ok':
+            print(f"[ok]      {result['data_dir']}: {result['report']}")
+        elif result['status'] == 'empty':
+            print(f"[vide]    {result['data_dir']}: aucune dépense")
+        else:
+            print(f"[échec]   {result['data_dir']}: {result['error']}", file=sys.stderr)
+    
+    summary_path = args.summary or os.path.join(args.out, 'batch_summary.json')
+    os.makedirs(os.path.dirname(os.path.abspath(summary_path)), exist_ok=True)
+    with open(summary_path, 'w', encoding='utf-8') as f:
+        json.dump(summary, f, ensure_ascii=False, indent=2)
+    
+    print(f"{summary['succeeded']} rapports générés, {summary['failed']} échecs "
+          f"({summary['duration_s']:.1f} s, {summary['workers']} processus). Résumé: {summary_path}")
+    return EXIT_FAILURE if summary['failed'] else EXIT_OK
+
+def build_parser():
+    """
+    Construit l'analyseur des arguments des sous-commandes.
+    
+    Returns:
+        argparse.ArgumentParser: Analyseur des arguments
+    """
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="Commandes non interactives du suivi des dépenses"
+    )
+    subparsers = parser.add_subparsers(dest='command', required=True)
+    
+    def add_data_dir(subparser):
+        subparser.add_argument('--data-dir', default=DEFAULT_DATA_DIR,
+                               help="Répertoire de données (data/ de l'application par défaut)")
+    
+    def add_output_dir(subparser):
+        subparser.add_argument('--out', default=DEFAULT_OUTPUT_DIR,
+                               help="Répertoire de sortie (reports/ de l'application par défaut)")
+    
+    def add_period(subparser):
+        subparser.add_argument('--start', help="Premier jour inclus (AAAA-MM-JJ)")
+        subparser.add_argument('--end', help="Dernier jour inclus (AAAA-MM-JJ)")
+        subparser.add_argument('--category', action='append',
+                               help="Catégorie retenue (option répétable, toutes par défaut)")
+    
+    add = subparsers.add_parser('add', help="Ajouter une dépense")
+    add.add_argument('amount', help="Montant (€)")
+    add.add_argument('category', help="Catégorie")
+    add.add_argument('--description', default='', help="Description")
+    add.add_argument('--date', help="Date (AAAA-MM-JJ, aujourd'hui par défaut)")
+    add_data_dir(add)
+    add.set_defaults(handler=command_add)
+    
+    import_ = subparsers.add_parser('import', help="Importer les dépenses d'un fichier CSV")
+    import_.add_argument('file', help="Fichier CSV (colonnes Montant, Catégorie, Description, Date)")
+    import_.add_argument('--delimiter', default=',', help="Séparateur des colonnes")
+    import_.add_argument('--encoding', default='utf-8', help="Encodage du fichier")
+    add_data_dir(import_)
+    import_.set_defaults(handler=command_import)
+    
+    stats = subparsers.add_parser('stats', help="Afficher les statistiques")
+    stats.add_argument('--json', action='store_true', help="Sortie au format JSON")
+    stats.add_argument('--streaming', action='store_true',
+                       help="Lire les dépenses par blocs en mémoire bornée (historiques volumineux)")
+    stats.add_argument('--memory-limit', type=float, default=64,
+                       help="Mémoire maximale d'un bloc en Mo, avec --streaming (64 par défaut)")
+    add_data_dir(stats)
+    add_period(stats)
+    stats.set_defaults(handler=command_stats)
+    
+    graphs = subparsers.add_parser('graphs', help="Générer les graphiques")
+    add_data_dir(graphs)
+    add_output_dir(graphs)
+    graphs.set_defaults(handler=command_graphs)
+    
+    report = subparsers.add_parser('report', help="Générer un rapport PDF")
+    report.add_argument('--vector', action='store_true', help="Graphiques vectoriels (sans matplotlib)")
+    report.add_argument('--by', choices=['day', 'week', 'month', 'year'],
+                        help="Un rapport par période (noms de fichiers fixes, ex: rapport_depenses_2024-03.pdf)")
+    report.add_argument('--by-category', action='store_true', help="Un rapport par catégorie")
+    report.add_argument('--workers', type=int, help="Nombre maximal de processus pour les rapports répartis")
+    report.add_argument('--transactions', action='store_true', help="Ajouter la liste détaillée de toutes les dépenses")
+    add_data_dir(report)
+    add_output_dir(report)
+    add_period(report)
+    report.set_defaults(handler=command_report)
+    
+    batch = subparsers.add_parser('batch', help="Générer les rapports de plusieurs répertoires de données")
+    batch.add_argument('data_dirs', nargs='+', help="Répertoires de données")
+    batch.add_argument('--workers', type=int, help="Nombre maximal de processus (nombre de processeurs par défaut)")
+    batch.add_argument('--summary', help="Fichier JSON du résumé (batch_summary.json du répertoire de sortie par défaut)")
+    batch.add_argument('--vector', action='store_true', help="Graphiques vectoriels (sans matplotlib)")
+    add_output_dir(batch)
+    add_period(batch)
+    batch.set_defaults(handler=command_batch)
+    
+    return parser
+
+def main(argv=None):
+    """
+    Exécute une sous-commande.
+    
+    Args:
+        argv (list, optional): Arguments (ceux de la ligne de commande par défaut)
+    
+    Returns:
+        int: Code de sortie (0 si tout a réussi, 1 en cas d'échec)
+    """
+    args = build_parser().parse_args(argv)
+    if getattr(args, 'workers', None) is not None and args.workers < 1:
+        print("Le nombre de processus doit être au moins 1.", file=sys.stderr)
+        return EXIT_FAILURE
+    
+    try:
+        return args.handler(args)
+    except (ValueError, OSError) as e:
+        print(f"Erreur: {e}", file=sys.stderr)
+        return EXIT_FAILURE
\ No newline at end of file
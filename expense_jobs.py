@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module d'exécution des tâches longues en arrière-plan
+
+Ce module exécute les tâches longues de l'interface (statistiques,
+graphiques, rapports) dans des threads, pour que la fenêtre reste
+réactive. Les résultats, la progression et les erreurs sont transmis au
+thread de l'interface par une file, relevée périodiquement via une
+fonction de planification (root.after avec Tkinter).
+"""
+
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+class JobCancelled(Exception):
+    """
+    Exception levée dans une tâche annulée, à sa prochaine étape.
+    """
+
+class Job:
+    """
+    Classe représentant une tâche en arrière-plan.
+    
+    La fonction exécutée reçoit la tâche en argument: elle signale sa
+    progression avec progress(), qui lève JobCancelled si la tâche a été
+    annulée entre-temps.
+    """
+    
+    def __init__(self, name, messages, on_done, on_error=None, on_progress=None):
+        """
+        Initialise une tâche.
+        
+        Args:
+            name (str): Nom de la tâche (une seule tâche active par nom)
+            messages (queue.Queue): File des messages vers l'interface
+            on_done (callable): Fonction appelée avec le résultat
+            on_error (callable, optional): Fonction appelée avec l'exception
+            on_progress (callable, optional): Fonction appelée avec
+                (fraction, message) à chaque étape
+        """
+        self.name = name
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self._messages = messages
+        self._cancel_event = threading.Event()
+    
+    @property
+    def cancelled(self):
+        """
+        bool: True si l'annulation de la tâche a été demandée
+        """
+        return self._cancel_event.is_set()
+    
+    def cancel(self):
+        """
+        Demande l'annulation de la tâche (prise en compte à sa prochaine étape).
+        """
+        self._cancel_event.set()
+    
+    def check(self):
+        """
+        Interrompt la tâche si son annulation a été demandée.
+        
+        Raises:
+            JobCancelled: Si la tâche a été annulée
+        """
+        if self.cancelled:
+            raise JobCancelled(self.name)
+    
+    def progress(self, fraction, message=""):
+        """
+        Signale l'avancement de la tâche (appelé depuis le thread de la tâche).
+        
+        Args:
+            fraction (float): Avancement entre 0 et 1
+            message (str, optional): Étape en cours
+        
+        Raises:
+            JobCancelled: Si la tâche a été annulée
+        """
+        self.check()
+        self._messages.put((self, 'progress', (fraction, message)))
+
+class JobRunner:
+    """
+    Classe pour exécuter des tâches en arrière-plan depuis une interface.
+    
+    Toutes les méthodes doivent être appelées depuis le thread de
+    l'interface, et les fonctions de rappel y sont exécutées. Lancer une
+    tâche du même nom qu'une tâche en cours annule cette dernière: son
+    résultat, s'il arrive, est ignoré.
+    """
+    
+    def __init__(self, schedule, max_workers=2, poll_interval=50):
+        """
+        Initialise l'exécuteur.
+        
+        Args:
+            schedule (callable): Fonction schedule(délai_ms, fonction) qui
+                exécute une fonction plus tard dans le thread de l'interface
+                (root.after avec Tkinter)
+            max_workers (int, optional): Nombre de threads
+            poll_interval (int, optional): Intervalle de relève des messages (ms)
+        """
+        self.schedule = schedule
+        self.poll_interval = poll_interval
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='expense-job')
+        self.jobs = {}
+        self._messages = queue.Queue()
+        self._polling = False
+    
+    def submit(self, name, function, on_done, on_error=None, on_progress=None):
+        """
+        Lance une tâche en arrière-plan, en annulant la tâche en cours du même nom.
+        
+        Args:
+            name (str): Nom de la tâche
+            function (callable): Fonction function(job) exécutée en arrière-plan
+            on_done (callable): Fonction appelée avec le résultat
+            on_error (callable, optional): Fonction appelée avec l'exception
+            on_progress (callable, optional): Fonction appelée avec
+                (fraction, message) à chaque étape
+        
+        Returns:
+            Job: Tâche lancée
+        """
+        self.cancel(name)
+        job = Job(name, self._messages, on_done, on_error, on_progress)
+        self.jobs[name] = job
+        self.executor.submit(self._run, job, function)
+        
+        if not self._polling:
+            self._polling = True
+            self.schedule(self.poll_interval, self._poll)
+        return job
+    
+    def _run(self, job, function):
+        """
+        Exécute une tâche dans un thread et transmet son issue à l'interface.
+        """
+        try:
+            job.check()
+            result = function(job)
+        except JobCancelled:
+            self._messages.put((job, 'cancelled', None))
+        except Exception as e:
+            self._messages.put((job, 'error', e))
+        else:
+            self._messages.put((job, 'done', result))
+    
+    def is_running(self, name):
+        """
+        Indique si une tâche de ce nom est en cours.
+        
+        Args:
+            name (str): Nom de la tâche
+        
+        Returns:
+            bool: True si la tâche est en cours
+        """
+        return name in self.jobs
+    
+    def cancel(self, name=None):
+        """
+        Annule une tâche, ou toutes les tâches en cours.
+        
+        Args:
+            name (str, optional): Nom de la tâche (toutes par défaut)
+        """
+        names = list(self.jobs) if name is None else [name]
+        for job_name in names:
+            job = self.jobs.pop(job_name, None)
+            if job is not None:
+                job.cancel()
+    
+    def _poll(self):
+        """
+        Relève les messages des tâches et appelle les fonctions de rappel.
+        """
+        while True:
+            try:
+                job, kind, value = self._messages.get_nowait()
+            except queue.Empty:
+                break
+            
+            # Tâche annulée ou remplacée: son résultat est périmé
+            if self.jobs.get(job.name) is not job:
+                continue
+            
+            if kind == 'progress':
+                if job.on_progress is not None:
+                    job.on_progress(*value)
+                continue
+            
+            del self.jobs[job.name]
+            if kind == 'done':
+                job.on_done(value)
+            elif kind == 'error':
+                if job.on_error is not None:
+                    job.on_error(value)
+                else:
+                    print(f"Erreur dans la tâche {job.name}: {value}")
+        
+        if self.jobs:
+            self.schedule(self.poll_interval, self._poll)
+        else:
+            self._polling = False
+    
+    def shutdown(self):
+        """
+        Annule les tâches en cours et arrête les threads.
+        """
+        self.cancel()
+        self.executor.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
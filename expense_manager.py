@@ -8,32 +8,206 @@ Ce module permet de gérer les dépenses (ajout, stockage, récupération).
 """
 
 import os
+import threading
+import numpy as np
 import pandas as pd
 from datetime import datetime
 
+from expense_aggregates import RunningAggregates
+from expense_profiling import profiled, stage
+from expense_snapshot import ExpenseSnapshot
+from expense_storage import COLUMNS, open_storage, migrate_storage, sum_by_category
+
+# Noms de champs acceptés pour l'ajout en lot
+FIELD_ALIASES = {
+    'date': 'Date',
+    'amount': 'Montant',
+    'montant': 'Montant',
+    'category': 'Catégorie',
+    'catégorie': 'Catégorie',
+    'categorie': 'Catégorie',
+    'description': 'Description',
+}
+
+def parse_day(value):
+    """
+    Convertit une borne de période en jour.
+    
+    Args:
+        value: Date (date, datetime, Timestamp ou chaîne AAAA-MM-JJ), ou None
+    
+    Returns:
+        pandas.Timestamp: Jour à minuit, ou None si value est None ou vide
+    
+    Raises:
+        ValueError: Si la date est invalide
+    """
+    if value is None or (isinstance(value, str) and not value.strip()):
+        return None
+    
+    try:
+        day = pd.Timestamp(value.strip() if isinstance(value, str) else value)
+    except (ValueError, TypeError):
+        raise ValueError(f"Date invalide: {value}")
+    if pd.isna(day):
+        raise ValueError(f"Date invalide: {value}")
+    return day.normalize()
+
+def parse_period(start=None, end=None):
+    """
+    Convertit les bornes d'une période en jours et vérifie leur ordre.
+    
+    Args:
+        start (date ou str): Premier jour inclus, ou None
+        end (date ou str): Dernier jour inclus, ou None
+    
+    Returns:
+        tuple: (premier jour, dernier jour), chacun Timestamp ou None
+    
+    Raises:
+        ValueError: Si une date est invalide ou si la période est inversée
+    """
+    start = parse_day(start)
+    end = parse_day(end)
+    if start is not None and end is not None and start > end:
+        raise ValueError("La date de début est postérieure à la date de fin")
+    return start, end
+
+def filter_expenses(expenses, start=None, end=None, categories=None):
+    """
+    Retient les dépenses d'une période et de certaines catégories.
+    
+    Filtre un bloc de dépenses lu par iter_expenses; les dépenses sans date
+    ne sont jamais retenues, comme dans get_expenses_between.
+    
+    Args:
+        expenses (pandas.DataFrame): Dépenses (colonne 'Date' en datetime)
+        start (pandas.Timestamp, optional): Premier jour inclus
+        end (pandas.Timestamp, optional): Dernier jour inclus
+        categories (list, optional): Catégories retenues (toutes par défaut)
+    
+    Returns:
+        pandas.DataFrame: Dépenses retenues, dans l'ordre d'origine
+    """
+    days = expenses['Date'].dt.normalize()
+    mask = days.notna()
+    if start is not None:
+        mask &= days >= start
+    if end is not None:
+        mask &= days <= end
+    if categories is not None:
+        mask &= expenses['Catégorie'].isin(list(categories))
+    return expenses[mask]
+
+def shared_copy(frame):
+    """
+    Copie un DataFrame du cache pour le transmettre à un appelant.
+    
+    La copie est superficielle (temps constant): avec la copie à l'écriture
+    de pandas, toujours active à partir de pandas 3.0 (version minimale
+    requise), les colonnes partagées avec le cache sont copiées avant toute
+    modification.
+    
+    Args:
+        frame (pandas.DataFrame): DataFrame du cache
+    
+    Returns:
+        pandas.DataFrame: Copie modifiable sans effet sur le cache
+    """
+    return frame.copy(deep=False)
+
+def _day_number(day):
+    """
+    Retourne le numéro de jour (depuis le 1er janvier 1970) d'un Timestamp.
+    """
+    return np.datetime64(day.date(), 'D').astype(np.int64)
+
 class ExpenseManager:
     """
     Classe pour gérer les dépenses personnelles.
     """
     
-    def __init__(self, data_dir):
+    def __init__(self, data_dir, backend=None):
         """
         Initialise le gestionnaire de dépenses.
         
         Args:
             data_dir (str): Répertoire de stockage des données
+            backend (str, optional): Moteur de stockage ('csv', 'sqlite' ou
+                'columnar'). Par défaut, celui configuré dans le répertoire
+                de données.
         """
         self.data_dir = data_dir
-        self.data_file = os.path.join(data_dir, 'expenses.csv')
         
         # Créer le répertoire de données s'il n'existe pas
         os.makedirs(data_dir, exist_ok=True)
         
-        # Créer le fichier de données s'il n'existe pas
-        if not os.path.exists(self.data_file):
-            # Créer un DataFrame vide avec les colonnes nécessaires
-            columns = ['Date', 'Montant', 'Catégorie', 'Description']
-            pd.DataFrame(columns=columns).to_csv(self.data_file, index=False)
+        # Ouvrir le moteur de stockage (le fichier est créé s'il n'existe pas)
+        self.storage = open_storage(data_dir, backend)
+        self.data_file = self.storage.path
+        
+        # Verrou de l'état en mémoire (cache, index, agrégats): le gestionnaire
+        # est partagé entre le thread de l'interface et ses tâches de fond.
+        # Les lectures du stockage se font hors du verrou, pour qu'un ajout
+        # n'attende pas la fin d'un chargement
+        self._lock = threading.RLock()
+        
+        # Cache des dépenses lues, invalidé quand les données changent
+        self._cache = None
+        self._cache_signature = None
+        self._derived = {}
+        self.cache_hits = 0
+        self.cache_misses = 0
+        
+        # Agrégats maintenus à chaque ajout et enregistrés avec les données
+        self.aggregates = RunningAggregates(os.path.join(data_dir, 'aggregates.json'))
+        
+        # Fonctions prévenues de chaque modification des dépenses
+        self._listeners = []
+    
+    def subscribe(self, listener):
+        """
+        Abonne une fonction aux modifications des dépenses.
+        
+        La fonction est appelée avec le type d'événement et les dépenses
+        concernées:
+        - 'added', avec la liste des lignes [date, montant, catégorie,
+          description] qui viennent d'être enregistrées;
+        - 'reset', avec une liste vide, quand toutes les dépenses doivent être
+          relues (changement de moteur de stockage).
+        
+        Args:
+            listener (callable): Fonction listener(event, records)
+        """
+        if listener not in self._listeners:
+            self._listeners.append(listener)
+    
+    def unsubscribe(self, listener):
+        """
+        Désabonne une fonction des modifications des dépenses.
+        
+        Args:
+            listener (callable): Fonction précédemment abonnée
+        """
+        if listener in self._listeners:
+            self._listeners.remove(listener)
+    
+    def _notify(self, event, records):
+        """
+        Prévient les fonctions abonnées d'une modification des dépenses.
+        
+        Une erreur dans une fonction abonnée n'empêche pas de prévenir les
+        autres et n'annule pas la modification, déjà enregistrée.
+        
+        Args:
+            event (str): Type d'événement ('added' ou 'reset')
+            records (list): Lignes concernées
+        """
+        for listener in list(self._listeners):
+            try:
+                listener(event, records)
+            except Exception as e:
+                print(f"Erreur lors de la notification d'une modification: {e}")
     
     def add_expense(self, amount, category, description=""):
         """
@@ -48,52 +222,272 @@ class ExpenseManager:
             bool: True si l'ajout a réussi, False sinon
         """
         try:
-            # Créer un DataFrame pour la nouvelle dépense
             date = datetime.now().strftime("%Y-%m-%d")
-            new_expense = pd.DataFrame({
-                'Date': [date],
-                'Montant': [float(amount)],
-                'Catégorie': [category],
-                'Description': [description]
-            })
-            
-            # Lire les dépenses existantes
-            if os.path.exists(self.data_file) and os.path.getsize(self.data_file) > 0:
-                expenses = pd.read_csv(self.data_file)
-                # Ajouter la nouvelle dépense
-                expenses = pd.concat([expenses, new_expense], ignore_index=True)
-            else:
-                expenses = new_expense
-            
-            # Enregistrer les dépenses
-            expenses.to_csv(self.data_file, index=False)
+            self._append_records([[date, float(amount), category, description]])
             return True
         except Exception as e:
             print(f"Erreur lors de l'ajout de la dépense: {e}")
             return False
     
+    def add_expenses(self, expenses):
+        """
+        Ajoute un lot de dépenses en une seule écriture.
+        
+        Les valeurs sont validées colonne par colonne: les montants et les
+        dates sont convertis en bloc, et les lignes invalides sont écartées
+        sans empêcher l'ajout des autres.
+        
+        Args:
+            expenses: DataFrame, liste de dictionnaires ou itérable de tuples
+                (montant, catégorie, description, date). Les clés peuvent être
+                les noms de colonnes ('Montant', 'Catégorie', ...) ou leurs
+                équivalents anglais ('amount', 'category', ...). La date est
+                optionnelle (format AAAA-MM-JJ) et vaut aujourd'hui par défaut.
+        
+        Returns:
+            dict: Nombre de dépenses ajoutées ('added') et liste des lignes
+                rejetées ('rejected') sous forme de tuples (index, raison)
+        
+        Raises:
+            ValueError: Si les données ne contiennent pas de montant ou de catégorie
+        """
+        frame = self._to_frame(expenses)
+        if frame.empty:
+            return {'added': 0, 'rejected': []}
+        
+        # Montants: accepter la virgule décimale
+        amounts = frame['Montant']
+        if amounts.dtype == object or pd.api.types.is_string_dtype(amounts):
+            amounts = amounts.astype(str).str.strip().str.replace(',', '.', regex=False)
+        amounts = pd.to_numeric(amounts, errors='coerce')
+        
+        # Catégories et descriptions
+        categories = frame['Catégorie'].where(frame['Catégorie'].notna(), '').astype(str).str.strip()
+        descriptions = frame['Description'].where(frame['Description'].notna(), '').astype(str)
+        
+        # Dates: aujourd'hui si absente, rejet si invalide
+        today = pd.Timestamp(datetime.now().date())
+        raw_dates = frame['Date'].astype(str).str.strip()
+        missing_dates = frame['Date'].isna() | (raw_dates == '')
+        dates = pd.to_datetime(raw_dates.str.slice(0, 10), format="%Y-%m-%d", errors='coerce')
+        dates = dates.where(~missing_dates, today)
+        
+        # Motifs de rejet, du plus au moins prioritaire
+        reasons = pd.Series('', index=frame.index, dtype=object)
+        checks = [
+            (dates.isna(), "date invalide"),
+            (categories == '', "catégorie vide"),
+            (amounts <= 0, "montant négatif ou nul"),
+            (amounts.isna(), "montant invalide"),
+        ]
+        for mask, reason in checks:
+            reasons[mask] = reason
+        valid = reasons == ''
+        
+        records = list(zip(
+            dates[valid].dt.strftime("%Y-%m-%d").tolist(),
+            amounts[valid].astype(float).tolist(),
+            categories[valid].tolist(),
+            descriptions[valid].tolist()
+        ))
+        if records:
+            self._append_records(records)
+        
+        rejected = [(index, reason) for index, reason in reasons[~valid].items()]
+        return {'added': len(records), 'rejected': rejected}
+    
+    def _to_frame(self, expenses):
+        """
+        Convertit les données d'un ajout en lot en DataFrame aux colonnes normalisées.
+        
+        Args:
+            expenses: DataFrame, liste de dictionnaires ou itérable de tuples
+        
+        Returns:
+            pandas.DataFrame: DataFrame contenant les colonnes de COLUMNS
+        """
+        if isinstance(expenses, pd.DataFrame):
+            frame = expenses.copy()
+        else:
+            rows = list(expenses)
+            if rows and not isinstance(rows[0], dict):
+                fields = ['Montant', 'Catégorie', 'Description', 'Date']
+                rows = [dict(zip(fields, row)) for row in rows]
+            frame = pd.DataFrame(rows)
+        
+        frame = frame.rename(columns=lambda name: FIELD_ALIASES.get(str(name).lower(), name))
+        if frame.empty:
+            return frame
+        
+        for column in ('Montant', 'Catégorie'):
+            if column not in frame.columns:
+                raise ValueError(f"Colonne obligatoire manquante: {column}")
+        for column in ('Date', 'Description'):
+            if column not in frame.columns:
+                frame[column] = None
+        
+        return frame[COLUMNS]
+    
+    @profiled('manager.append')
+    def _append_records(self, records):
+        """
+        Ajoute des enregistrements au stockage et invalide le cache.
+        
+        L'ajout et la mise à jour des agrégats se font sous le verrou
+        d'écriture du stockage: d'autres processus (interface graphique, mode
+        console, scripts d'import) peuvent ajouter des dépenses en même temps
+        sans que leurs lignes ou leurs agrégats ne se perdent.
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        
+        Raises:
+            TimeoutError: Si le verrou d'écriture n'a pas pu être pris à temps
+        """
+        with self.storage.write_lock:
+            # Terminer un ajout interrompu avant de lire la signature: les
+            # lignes qu'il rétablit ou retire ne sont pas dans les agrégats
+            self.storage.recover()
+            
+            with self._lock:
+                # Relire les agrégats: un autre processus a pu les mettre à
+                # jour. Ils ne sont mis à jour que s'ils étaient à jour avant
+                # l'ajout; sinon ils seront recalculés à la prochaine lecture
+                self.aggregates.load()
+                aggregates_current = self.aggregates.is_current(self.storage.signature())
+                
+                self.storage.append(records)
+                
+                if aggregates_current:
+                    self.aggregates.apply(records)
+                    self.aggregates.signature = self.storage.signature()
+                    self.aggregates.save()
+                
+                self.clear_cache()
+        self._notify('added', records)
+    
     def get_all_expenses(self):
         """
         Récupère toutes les dépenses.
         
+        Le DataFrame est conservé en mémoire et n'est relu que si le fichier
+        a changé. La valeur retournée peut être modifiée sans altérer les
+        données en cache (voir shared_copy: copie superficielle, la copie à
+        l'écriture de pandas protégeant le cache).
+        
         Returns:
             pandas.DataFrame: DataFrame contenant toutes les dépenses
         """
-        try:
-            if os.path.exists(self.data_file) and os.path.getsize(self.data_file) > 0:
-                expenses = pd.read_csv(self.data_file)
-                # Convertir la colonne 'Date' en datetime
-                expenses['Date'] = pd.to_datetime(expenses['Date'])
-                return expenses
-            else:
-                # Retourner un DataFrame vide avec les colonnes nécessaires
-                columns = ['Date', 'Montant', 'Catégorie', 'Description']
-                return pd.DataFrame(columns=columns)
-        except Exception as e:
-            print(f"Erreur lors de la récupération des dépenses: {e}")
-            # Retourner un DataFrame vide avec les colonnes nécessaires
-            columns = ['Date', 'Montant', 'Catégorie', 'Description']
-            return pd.DataFrame(columns=columns)
+        return shared_copy(self._load_expenses())
+    
+    def iter_expenses(self, chunksize, start=None, end=None, categories=None):
+        """
+        Parcourt les dépenses par blocs, sans les charger entièrement en mémoire.
+        
+        Avec une période ou des catégories, chaque bloc lu est filtré (voir
+        filter_expenses): les blocs retournés peuvent être plus petits, et les
+        blocs vides sont sautés.
+        
+        Args:
+            chunksize (int ou callable): Nombre maximal de dépenses lues par
+                bloc, ou fonction donnant la taille de chaque bloc
+            start (date ou str, optional): Premier jour inclus
+            end (date ou str, optional): Dernier jour inclus
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Yields:
+            pandas.DataFrame: Bloc de dépenses
+        
+        Raises:
+            ValueError: Si une date est invalide ou si la période est inversée
+        """
+        start, end = parse_period(start, end)
+        chunks = self.storage.iter_chunks(chunksize)
+        if start is None and end is None and categories is None:
+            return chunks
+        return (
+            selection for selection in (filter_expenses(chunk, start, end, categories) for chunk in chunks)
+            if not selection.empty
+        )
+    
+    @profiled('manager.range_query')
+    def get_expenses_between(self, start=None, end=None, categories=None):
+        """
+        Récupère les dépenses d'une période, éventuellement de certaines catégories.
+        
+        Les dépenses sont retrouvées par recherche dichotomique dans un index
+        des dates triées, construit une fois par lecture des données: le coût
+        d'une requête dépend du nombre de dépenses retournées, pas de la
+        taille de l'historique. Les moteurs qui le permettent (SQLite) sont
+        interrogés directement tant que les dépenses ne sont pas en cache.
+        
+        Args:
+            start (date ou str, optional): Premier jour inclus (AAAA-MM-JJ);
+                sans limite par défaut
+            end (date ou str, optional): Dernier jour inclus (AAAA-MM-JJ);
+                sans limite par défaut
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Returns:
+            pandas.DataFrame: Dépenses de la période, dans l'ordre d'enregistrement
+        
+        Raises:
+            ValueError: Si une date est invalide ou si la période est inversée
+        """
+        start, end = parse_period(start, end)
+        
+        with self._lock:
+            self._check_cache()
+            cached = self._cache is not None
+        if not cached and self.storage.native_range_queries:
+            return self.storage.load_between(
+                start.strftime("%Y-%m-%d") if start is not None else None,
+                end.strftime("%Y-%m-%d") if end is not None else None,
+                categories
+            )
+        
+        expenses = self._load_expenses()
+        if expenses.empty:
+            return shared_copy(expenses)
+        
+        order, days = self._date_index(expenses)
+        # Les dates manquantes (NaT) sont rangées en tête et jamais retournées
+        lo = np.searchsorted(days, np.iinfo(np.int64).min, side='right')
+        if start is not None:
+            lo = max(lo, np.searchsorted(days, _day_number(start), side='left'))
+        hi = len(days)
+        if end is not None:
+            hi = np.searchsorted(days, _day_number(end), side='right')
+        
+        rows = np.sort(order[lo:hi])
+        selection = expenses.iloc[rows]
+        if categories is not None:
+            selection = selection[selection['Catégorie'].isin(list(categories))]
+        return selection.reset_index(drop=True)
+    
+    def _date_index(self, expenses):
+        """
+        Retourne l'index des dates des dépenses, mémorisé tant qu'elles sont en cache.
+        
+        Args:
+            expenses (pandas.DataFrame): Dépenses retournées par _load_expenses
+        
+        Returns:
+            tuple: (positions des dépenses triées par date, numéros de jour triés)
+        """
+        with self._lock:
+            if self._cache is expenses and 'date_index' in self._derived:
+                return self._derived['date_index']
+        
+        days = expenses['Date'].to_numpy(dtype='datetime64[D]').astype(np.int64)
+        order = np.argsort(days, kind='stable')
+        index = (order, days[order])
+        
+        with self._lock:
+            # Le cache a pu être vidé entre-temps: ne mémoriser que pour lui
+            if self._cache is expenses:
+                self._derived['date_index'] = index
+        return index
     
     def get_expenses_by_category(self):
         """
@@ -102,11 +496,7 @@ class ExpenseManager:
         Returns:
             pandas.Series: Série contenant les montants totaux par catégorie
         """
-        expenses = self.get_all_expenses()
-        if expenses.empty:
-            return pd.Series()
-        
-        return expenses.groupby('Catégorie')['Montant'].sum()
+        return self._aggregate('by_category')
     
     def get_expenses_by_date(self):
         """
@@ -115,9 +505,226 @@ class ExpenseManager:
         Returns:
             pandas.Series: Série contenant les montants totaux par date
         """
-        expenses = self.get_all_expenses()
-        if expenses.empty:
+        return self._aggregate('by_date')
+    
+    def get_aggregates(self):
+        """
+        Retourne les agrégats des dépenses, recalculés s'ils sont périmés.
+        
+        Returns:
+            RunningAggregates: Agrégats à jour
+        """
+        with self._lock:
+            if self.aggregates.is_current(self.storage.signature()):
+                return self.aggregates
+        return self.rebuild_aggregates()
+    
+    def get_statistics(self):
+        """
+        Calcule les statistiques à partir des agrégats à jour.
+        
+        Returns:
+            dict: Statistiques des dépenses (None si aucune dépense)
+        """
+        aggregates = self.get_aggregates()
+        with self._lock:
+            return aggregates.statistics()
+    
+    @profiled('manager.rebuild_aggregates')
+    def rebuild_aggregates(self):
+        """
+        Recalcule les agrégats à partir de toutes les dépenses et les enregistre.
+        
+        Returns:
+            RunningAggregates: Agrégats recalculés
+        """
+        expenses, signature = self._load_with_signature()
+        with self._lock:
+            if signature is None:
+                # Lecture impossible: ne pas enregistrer d'agrégats faux
+                self.aggregates.reset()
+                return self.aggregates
+            
+            self.aggregates.rebuild(expenses, signature)
+            self.aggregates.save()
+            return self.aggregates
+    
+    def verify_aggregates(self):
+        """
+        Vérifie les agrégats enregistrés en les recalculant depuis les dépenses.
+        
+        Returns:
+            list: Descriptions des écarts trouvés (vide si les agrégats sont justes)
+        """
+        expenses, signature = self._load_with_signature()
+        reference = RunningAggregates(None)
+        reference.rebuild(expenses, signature)
+        
+        with self._lock:
+            differences = self.aggregates.compare(reference)
+            if not self.aggregates.is_current(signature):
+                differences.insert(0, "agrégats périmés (signature du stockage différente)")
+        return differences
+    
+    def migrate(self, backend):
+        """
+        Migre les dépenses vers un autre moteur de stockage et l'utilise.
+        
+        Args:
+            backend (str): Nom du moteur cible ('csv', 'sqlite' ou 'columnar')
+        
+        Returns:
+            int: Nombre de dépenses migrées
+        """
+        self.storage.close()
+        try:
+            count = migrate_storage(self.data_dir, backend)
+        finally:
+            # Rouvrir le moteur configuré (le nouveau si la migration a réussi)
+            with self._lock:
+                self.storage = open_storage(self.data_dir)
+                self.data_file = self.storage.path
+                self.clear_cache()
+        
+        self._notify('reset', [])
+        return count
+    
+    def snapshot(self, start=None, end=None, categories=None):
+        """
+        Crée un instantané des dépenses, chargé une seule fois.
+        
+        Args:
+            start (date ou str, optional): Premier jour inclus de la période
+            end (date ou str, optional): Dernier jour inclus de la période
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Returns:
+            ExpenseSnapshot: Instantané des dépenses actuelles (de la période)
+        """
+        if start is not None or end is not None or categories is not None:
+            # Les agrégats portent sur toutes les dépenses: inutilisables ici
+            return ExpenseSnapshot(self.get_expenses_between(start, end, categories))
+        
+        expenses, signature = self._load_with_signature()
+        
+        # Les agrégats ne sont utilisés que s'ils correspondent aux données
+        # chargées; leurs statistiques sont figées maintenant, les ajouts
+        # suivants modifiant les agrégats
+        aggregates = self.get_aggregates()
+        statistics = None
+        with self._lock:
+            if aggregates.is_current(signature):
+                statistics = aggregates.statistics()
+        # Données modifiées par un autre processus pendant le chargement
+        if statistics is not None and statistics['count'] != len(expenses):
+            statistics = None
+        
+        return ExpenseSnapshot(shared_copy(expenses), statistics)
+    
+    def clear_cache(self):
+        """
+        Vide le cache des dépenses: la prochaine lecture relira le fichier.
+        """
+        with self._lock:
+            self._cache = None
+            self._cache_signature = None
+            self._derived = {}
+    
+    def _check_cache(self):
+        """
+        Vide le cache si les données ont changé depuis la dernière lecture.
+        """
+        with self._lock:
+            signature = self.storage.signature()
+            if signature != self._cache_signature:
+                self.clear_cache()
+                self._cache_signature = signature
+    
+    def _load_expenses(self):
+        """
+        Retourne le DataFrame des dépenses en cache, relu si les données ont changé.
+        
+        Returns:
+            pandas.DataFrame: DataFrame en cache (ne pas modifier)
+        """
+        return self._load_with_signature()[0]
+    
+    def _load_with_signature(self):
+        """
+        Retourne les dépenses en cache et la signature du stockage lue avant elles.
+        
+        Le stockage est lu hors du verrou; les dépenses lues ne sont mises en
+        cache que si aucun ajout n'a vidé le cache pendant la lecture. Elles
+        peuvent être plus récentes que la signature, jamais plus anciennes:
+        des agrégats à cette signature ne sont donc utilisés qu'après
+        vérification de leur nombre de dépenses.
+        
+        Returns:
+            tuple: (DataFrame des dépenses, ne pas modifier; signature, ou
+                None si la lecture a échoué)
+        """
+        with self._lock:
+            self._check_cache()
+            signature = self._cache_signature
+            if self._cache is not None:
+                self.cache_hits += 1
+                return self._cache, signature
+            self.cache_misses += 1
+        
+        try:
+            with stage('manager.load'):
+                expenses = self.storage.load()
+        except Exception as e:
+            print(f"Erreur lors de la récupération des dépenses: {e}")
+            # Retourner un DataFrame vide sans le mettre en cache
+            return pd.DataFrame(columns=COLUMNS), None
+        
+        with self._lock:
+            if self._cache is None and self._cache_signature == signature:
+                self._cache = expenses
+        return expenses, signature
+    
+    def _aggregate(self, key):
+        """
+        Calcule (ou récupère en cache) un regroupement des dépenses.
+        
+        Les moteurs qui savent regrouper eux-mêmes (SQLite) sont interrogés
+        directement, sans charger toutes les dépenses.
+        
+        Args:
+            key (str): 'by_category' ou 'by_date'
+        
+        Returns:
+            pandas.Series: Série contenant les montants totaux regroupés
+        """
+        with self._lock:
+            self._check_cache()
+            if key in self._derived:
+                self.cache_hits += 1
+                return self._derived[key].copy()
+            signature = self._cache_signature
+        
+        if self.storage.native_aggregation:
+            self.cache_misses += 1
+            with stage('manager.aggregate'):
+                if key == 'by_category':
+                    result = self.storage.sum_by_category()
+                else:
+                    result = self.storage.sum_by_date()
+        else:
+            expenses = self._load_expenses()
+            with stage('manager.aggregate'):
+                if key == 'by_category':
+                    result = sum_by_category(expenses['Montant'], expenses['Catégorie'])
+                else:
+                    # Grouper par date et sommer les montants
+                    result = expenses.groupby(expenses['Date'].dt.date)['Montant'].sum()
+        
+        if result.empty:
             return pd.Series()
         
-        # Grouper par date et sommer les montants
-        return expenses.groupby(expenses['Date'].dt.date)['Montant'].sum()
\ No newline at end of file
+        with self._lock:
+            # Ne mémoriser que si aucun ajout n'a vidé le cache entre-temps
+            if self._cache_signature == signature:
+                self._derived[key] = result
+        return result.copy()
\ No newline at end of file
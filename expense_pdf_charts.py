@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module des graphiques vectoriels des rapports PDF
+
+Ce module dessine les graphiques des rapports directement avec reportlab
+(reportlab.graphics.charts), à partir des séries agrégées. Aucune image
+n'est générée: les graphiques sont intégrés au PDF sous forme vectorielle.
+"""
+
+from datetime import date
+from reportlab.lib import colors
+from reportlab.lib.units import inch
+from reportlab.graphics.shapes import Drawing, String
+from reportlab.graphics.charts.piecharts import Pie
+from reportlab.graphics.charts.barcharts import VerticalBarChart
+from reportlab.graphics.charts.lineplots import LinePlot
+from reportlab.graphics.widgets.markers import makeMarker
+
+# Dimensions des graphiques dans le rapport
+CHART_WIDTH = 6 * inch
+CHART_HEIGHT = 3 * inch
+
+# Palette des catégories (proche de la palette par défaut de seaborn)
+PALETTE = [
+    colors.HexColor('#1f77b4'), colors.HexColor('#ff7f0e'), colors.HexColor('#2ca02c'),
+    colors.HexColor('#d62728'), colors.HexColor('#9467bd'), colors.HexColor('#8c564b'),
+    colors.HexColor('#e377c2'), colors.HexColor('#7f7f7f'), colors.HexColor('#bcbd22'),
+    colors.HexColor('#17becf'),
+]
+
+def _drawing(title):
+    """
+    Crée un dessin aux dimensions des graphiques, avec son titre.
+    """
+    drawing = Drawing(CHART_WIDTH, CHART_HEIGHT)
+    drawing.add(String(CHART_WIDTH / 2, CHART_HEIGHT - 12, title,
+                       fontName='Helvetica-Bold', fontSize=11, textAnchor='middle'))
+    return drawing
+
+def pie_chart(by_category):
+    """
+    Dessine le camembert de la répartition des dépenses par catégorie.
+    
+    Args:
+        by_category (pandas.Series): Montants totaux par catégorie
+    
+    Returns:
+        reportlab.graphics.shapes.Drawing: Graphique vectoriel
+    """
+    drawing = _drawing('Répartition des Dépenses par Catégorie')
+    values = [float(amount) for amount in by_category.values]
+    total = sum(values) or 1.0
+    
+    pie = Pie()
+    size = CHART_HEIGHT - 50
+    pie.x = (CHART_WIDTH - size) / 2
+    pie.y = 15
+    pie.width = size
+    pie.height = size
+    pie.data = values
+    pie.labels = [f"{category} ({amount / total:.1%})" for category, amount in zip(by_category.index, values)]
+    pie.startAngle = 90
+    pie.direction = 'anticlockwise'
+    pie.sideLabels = True
+    pie.slices.strokeColor = colors.white
+    pie.slices.fontName = 'Helvetica'
+    pie.slices.fontSize = 7
+    for i in range(len(values)):
+        pie.slices[i].fillColor = PALETTE[i % len(PALETTE)]
+    
+    drawing.add(pie)
+    return drawing
+
+def bar_chart(by_category):
+    """
+    Dessine le graphique à barres des dépenses par catégorie.
+    
+    Args:
+        by_category (pandas.Series): Montants totaux par catégorie
+    
+    Returns:
+        reportlab.graphics.shapes.Drawing: Graphique vectoriel
+    """
+    drawing = _drawing('Dépenses par Catégorie')
+    values = [float(amount) for amount in by_category.values]
+    
+    chart = VerticalBarChart()
+    chart.x = 50
+    chart.y = 50
+    chart.width = CHART_WIDTH - 70
+    chart.height = CHART_HEIGHT - 80
+    chart.data = [values]
+    chart.categoryAxis.categoryNames = [str(category) for category in by_category.index]
+    chart.categoryAxis.labels.angle = 45
+    chart.categoryAxis.labels.boxAnchor = 'ne'
+    chart.categoryAxis.labels.fontName = 'Helvetica'
+    chart.categoryAxis.labels.fontSize = 7
+    chart.valueAxis.valueMin = 0
+    chart.valueAxis.labels.fontName = 'Helvetica'
+    chart.valueAxis.labels.fontSize = 7
+    chart.valueAxis.labelTextFormat = '%.0f €'
+    chart.bars[0].fillColor = PALETTE[0]
+    chart.barLabelFormat = '%.2f €'
+    chart.barLabels.fontName = 'Helvetica'
+    chart.barLabels.fontSize = 6
+    chart.barLabels.nudge = 6
+    
+    drawing.add(chart)
+    return drawing
+
+def time_chart(by_date):
+    """
+    Dessine le graphique d'évolution des dépenses dans le temps.
+    
+    Args:
+        by_date (pandas.Series): Montants totaux par date
+    
+    Returns:
+        reportlab.graphics.shapes.Drawing: Graphique vectoriel
+    """
+    drawing = _drawing('Évolution des Dépenses dans le Temps')
+    points = [(day.toordinal(), float(amount)) for day, amount in zip(by_date.index, by_date.values)]
+    
+    plot = LinePlot()
+    plot.x = 50
+    plot.y = 50
+    plot.width = CHART_WIDTH - 70
+    plot.height = CHART_HEIGHT - 80
+    plot.data = [points]
+    plot.lines[0].strokeColor = PALETTE[0]
+    plot.lines[0].symbol = makeMarker('FilledCircle', size=3)
+    plot.xValueAxis.labelTextFormat = lambda ordinal: date.fromordinal(int(ordinal)).strftime("%Y-%m-%d")
+    plot.xValueAxis.labels.angle = 45
+    plot.xValueAxis.labels.boxAnchor = 'ne'
+    plot.xValueAxis.labels.fontName = 'Helvetica'
+    plot.xValueAxis.labels.fontSize = 7
+    plot.yValueAxis.valueMin = 0
+    plot.yValueAxis.labelTextFormat = '%.0f €'
+    plot.yValueAxis.labels.fontName = 'Helvetica'
+    plot.yValueAxis.labels.fontSize = 7
+    if len(points) == 1:
+        # Une seule date: élargir l'axe pour que le point soit visible
+        plot.xValueAxis.valueMin = points[0][0] - 1
+        plot.xValueAxis.valueMax = points[0][0] + 1
+    
+    drawing.add(plot)
+    return drawing
+
+def build_charts(snapshot):
+    """
+    Construit les graphiques vectoriels d'un rapport.
+    
+    Args:
+        snapshot (ExpenseSnapshot): Instantané des dépenses
+    
+    Returns:
+        list: Couples (titre, dessin) dans l'ordre du rapport
+    """
+    return [
+        ('Depenses Par Categorie Pie', pie_chart(snapshot.by_category)),
+        ('Depenses Par Categorie Bar', bar_chart(snapshot.by_category)),
+        ('Evolution Depenses', time_chart(snapshot.by_date)),
+    ]
\ No newline at end of file
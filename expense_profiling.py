@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module de mesure du temps passé dans les étapes coûteuses
+
+Les étapes coûteuses (lecture des données, agrégation, graphiques, mise en
+page du PDF) sont délimitées par stage() ou par le décorateur profiled().
+Les fonctions abonnées avec add_hook() reçoivent la durée de chaque étape.
+Sans fonction abonnée, rien n'est mesuré: le coût d'une étape se limite à
+un appel de fonction et un test de liste vide.
+"""
+
+import functools
+import threading
+import time
+
+# Fonctions abonnées: hook(chemin, durée en secondes)
+_hooks = []
+
+# Pile des étapes en cours, propre à chaque thread
+_local = threading.local()
+
+class _NullStage:
+    """
+    Étape qui ne mesure rien (aucune fonction abonnée).
+    """
+    
+    def __enter__(self):
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+_NULL_STAGE = _NullStage()
+
+class _Stage:
+    """
+    Étape mesurée: sa durée est transmise aux fonctions abonnées à sa sortie.
+    """
+    
+    __slots__ = ('name', 'path', 'start')
+    
+    def __init__(self, name):
+        self.name = name
+    
+    def __enter__(self):
+        stack = getattr(_local, 'stack', None)
+        if stack is None:
+            stack = _local.stack = []
+        stack.append(self.name)
+        self.path = tuple(stack)
+        self.start = time.perf_counter()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        duration = time.perf_counter() - self.start
+        _local.stack.pop()
+        for hook in list(_hooks):
+            try:
+                hook(self.path, duration)
+            except Exception as e:
+                print(f"Erreur dans une fonction de mesure: {e}")
+        return False
+
+def stage(name):
+    """
+    Délimite une étape mesurée (gestionnaire de contexte).
+    
+    Args:
+        name (str): Nom de l'étape (ex: 'manager.load')
+    
+    Returns:
+        Gestionnaire de contexte mesurant l'étape, ou ne faisant rien si
+        aucune fonction n'est abonnée
+    """
+    if not _hooks:
+        return _NULL_STAGE
+    return _Stage(name)
+
+def profiled(name):
+    """
+    Décorateur mesurant chaque appel d'une fonction comme une étape.
+    
+    Args:
+        name (str): Nom de l'étape
+    
+    Returns:
+        callable: Décorateur
+    """
+    def decorator(function):
+        @functools.wraps(function)
+        def wrapper(*args, **kwargs):
+            if not _hooks:
+                return function(*args, **kwargs)
+            with _Stage(name):
+                return function(*args, **kwargs)
+        return wrapper
+    return decorator
+
+def add_hook(hook):
+    """
+    Abonne une fonction à la fin de chaque étape.
+    
+    La fonction est appelée, dans le thread de l'étape, avec le chemin de
+    l'étape (tuple des noms des étapes englobantes puis de l'étape) et sa
+    durée en secondes.
+    
+    Args:
+        hook (callable): Fonction hook(chemin, durée)
+    """
+    if hook not in _hooks:
+        _hooks.append(hook)
+
+def remove_hook(hook):
+    """
+    Désabonne une fonction des étapes.
+    
+    Args:
+        hook (callable): Fonction précédemment abonnée
+    """
+    if hook in _hooks:
+        _hooks.remove(hook)
+
+class StageTimer:
+    """
+    Classe cumulant la durée et le nombre d'appels de chaque étape.
+    
+    S'utilise comme gestionnaire de contexte: les étapes exécutées dans le
+    bloc sont mesurées, puis report() en donne le détail.
+    """
+    
+    def __init__(self):
+        """
+        Initialise un relevé vide.
+        """
+        # Chemin de l'étape -> [nombre d'appels, durée totale]
+        self.stages = {}
+        self._lock = threading.Lock()
+    
+    def __call__(self, path, duration):
+        with self._lock:
+            entry = self.stages.setdefault(path, [0, 0.0])
+            entry[0] += 1
+            entry[1] += duration
+    
+    def __enter__(self):
+        add_hook(self)
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        remove_hook(self)
+        return False
+    
+    def report(self):
+        """
+        Met en forme le détail des durées par étape.
+        
+        Les étapes sont imbriquées sous l'étape qui les englobe; la colonne
+        'propre' est la durée de l'étape hors étapes imbriquées.
+        
+        Returns:
+            str: Tableau des étapes (appels, durée totale, durée propre, part
+                du temps mesuré)
+        """
+        with self._lock:
+            stages = dict(self.stages)
+        if not stages:
+            return "Aucune étape mesurée."
+        
+        children = {}
+        for path, (_, total) in stages.items():
+            children[path[:-1]] = children.get(path[:-1], 0.0) + total
+        measured = sum(total for path, (_, total) in stages.items() if len(path) == 1)
+        
+        lines = [f"{'Étape':40s} {'appels':>7s} {'total (ms)':>12s} {'propre (ms)':>12s} {'part':>7s}"]
+        for path in sorted(stages):
+            count, total = stages[path]
+            own = total - children.get(path, 0.0)
+            name = '  ' * (len(path) - 1) + path[-1]
+            share = total / measured * 100 if measured else 0.0
+            lines.append(f"{name:40s} {count:7d} {total * 1000:12.1f} {own * 1000:12.1f} {share:6.1f}%")
+        return '\n'.join(lines)
\ No newline at end of file
@@ -8,16 +8,46 @@ Ce module permet de générer des rapports PDF détaillés des dépenses.
 """
 
 import os
+import re
+import unicodedata
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from reportlab.lib.pagesizes import A4
 from reportlab.lib import colors
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, Image, LongTable, PageBreak, Flowable
 from reportlab.lib.units import inch, cm
 
+from expense_aggregates import median_label
+from expense_pdf_charts import build_charts
+from expense_profiling import profiled, stage
+from expense_rollup import GRANULARITIES, period_starts
+from expense_snapshot import ExpenseSnapshot
+
+# Format des périodes dans les noms des rapports par période
+PERIOD_LABELS = {
+    'day': '%Y-%m-%d',
+    'week': '%G-S%V',
+    'month': '%Y-%m',
+    'year': '%Y',
+}
+
+# Hauteur d'une ligne de la liste des dépenses (points)
+TRANSACTION_ROW_HEIGHT = 12
+
+# Colonnes de la liste des dépenses: (titre, part de la largeur de la page)
+TRANSACTION_COLUMNS = [
+    ("Date", 0.14),
+    ("Montant", 0.15),
+    ("Catégorie", 0.18),
+    ("Description", 0.53),
+]
+
+# Longueur maximale d'une description dans la liste des dépenses
+TRANSACTION_DESCRIPTION_LENGTH = 60
+
 class ExpenseReporter:
     """
     Classe pour générer des rapports de dépenses.
@@ -32,150 +62,500 @@ class ExpenseReporter:
         """
         self.expense_analyzer = expense_analyzer
     
-    def generate_pdf_report(self, output_dir):
+    @profiled('reporter.report')
+    def generate_pdf_report(self, output_dir, vector_charts=False, progress=None, start=None, end=None, categories=None,
+                            parallel_charts=True, transactions=False):
         """
         Génère un rapport PDF détaillé des dépenses.
         
         Args:
             output_dir (str): Répertoire de sortie pour le rapport PDF
+            vector_charts (bool, optional): Dessiner les graphiques directement
+                avec reportlab (vectoriels, sans images intermédiaires ni
+                matplotlib) au lieu d'intégrer des images PNG
+            progress (callable, optional): Fonction progress(fraction, message)
+                appelée à chaque étape; elle peut lever une exception pour
+                interrompre la génération
+            start (date ou str, optional): Premier jour inclus de la période
+            end (date ou str, optional): Dernier jour inclus de la période
+            categories (list, optional): Catégories retenues (toutes par défaut)
+            parallel_charts (bool, optional): Dessiner les graphiques en
+                parallèle dans des processus séparés (à désactiver quand les
+                rapports sont eux-mêmes générés en parallèle)
+            transactions (bool, optional): Ajouter la liste détaillée de
+                toutes les dépenses de l'instantané du rapport, mise en page
+                par tableaux successifs construits au fil des pages
         
         Returns:
             str: Chemin du fichier PDF généré, ou None en cas d'échec
         """
-        # Récupérer les dépenses
-        expenses = self.expense_analyzer.expense_manager.get_all_expenses()
+        if progress is None:
+            progress = lambda fraction, message: None
+        
+        # Charger les dépenses une seule fois pour tout le rapport
+        progress(0.0, "Chargement des dépenses")
+        with stage('reporter.snapshot'):
+            snapshot = self.expense_analyzer.expense_manager.snapshot(start, end, categories)
         
-        if expenses.empty:
+        if snapshot.empty:
             return None
         
         # Créer le répertoire de sortie s'il n'existe pas
         os.makedirs(output_dir, exist_ok=True)
         
-        # Générer les graphiques pour le rapport
-        graphs_dir = os.path.join(output_dir, 'temp_graphs')
-        os.makedirs(graphs_dir, exist_ok=True)
-        graph_files = self.expense_analyzer.generate_graphs(graphs_dir)
+        # Générer les graphiques pour le rapport (images PNG, sauf en mode vectoriel)
+        if not vector_charts:
+            progress(0.2, "Génération des graphiques")
+            graphs_dir = os.path.join(output_dir, 'temp_graphs')
+            os.makedirs(graphs_dir, exist_ok=True)
+            graph_files = self.expense_analyzer.generate_graphs(graphs_dir, snapshot, parallel=parallel_charts)
         
         # Définir le nom du fichier de rapport
         now = datetime.now().strftime("%Y%m%d_%H%M%S")
         report_filename = f"rapport_depenses_{now}.pdf"
         report_path = os.path.join(output_dir, report_filename)
         
-        # Créer le document PDF
-        doc = SimpleDocTemplate(
-            report_path,
-            pagesize=A4,
-            rightMargin=72,
-            leftMargin=72,
-            topMargin=72,
-            bottomMargin=72
-        )
-        
-        # Contenu du document
-        story = []
-        styles = getSampleStyleSheet()
-        
-        # Ajouter des styles personnalisés
-        styles.add(ParagraphStyle(
-            name='Title',
-            parent=styles['Heading1'],
-            fontSize=18,
-            alignment=1,  # Centre
-            spaceAfter=12
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='Heading2',
-            parent=styles['Heading2'],
-            fontSize=14,
-            spaceAfter=10
-        ))
-        
-        styles.add(ParagraphStyle(
-            name='Normal',
-            parent=styles['Normal'],
-            fontSize=10,
-            spaceAfter=6
-        ))
-        
-        # Titre du rapport
-        title = Paragraph("Rapport de Suivi des Dépenses Personnelles", styles['Title'])
-        story.append(title)
-        story.append(Spacer(1, 0.5 * cm))
-        
-        # Date du rapport
-        date_str = datetime.now().strftime("%d/%m/%Y %H:%M")
-        date_paragraph = Paragraph(f"Généré le: {date_str}", styles['Normal'])
-        story.append(date_paragraph)
-        story.append(Spacer(1, 1 * cm))
-        
-        # Résumé des statistiques
-        story.append(Paragraph("Résumé des Statistiques", styles['Heading2']))
-        stats = self.expense_analyzer.get_statistics()
-        
-        # Tableau des statistiques générales
-        stats_data = [
-            ["Métrique", "Valeur"],
-            ["Total des dépenses", f"{stats['total']:.2f} €"],
-            ["Moyenne des dépenses", f"{stats['mean']:.2f} €"],
-            ["Médiane des dépenses", f"{stats['median']:.2f} €"],
-            ["Dépense minimale", f"{stats['min']:.2f} €"],
-            ["Dépense maximale", f"{stats['max']:.2f} €"],
-            ["Nombre de dépenses", f"{stats['count']}"]
-        ]
-        
-        stats_table = Table(stats_data, colWidths=[250, 150])
-        stats_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (1, 0), 12),
-            ('BACKGROUND', (0, 1), (1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-        ]))
-        
-        story.append(stats_table)
-        story.append(Spacer(1, 0.5 * cm))
-        
-        # Dépenses par catégorie
-        story.append(Paragraph("Dépenses par Catégorie", styles['Heading2']))
-        
-        # Tableau des dépenses par catégorie
-        category_data = [["Catégorie", "Montant"]]
-        for category, amount in stats['by_category'].items():
-            category_data.append([category, f"{amount:.2f} €"])
-        
-        category_table = Table(category_data, colWidths=[250, 150])
-        category_table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (1, 0), 'CENTER'),
-            ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
-            ('BOTTOMPADDING', (0, 0), (1, 0), 12),
-            ('BACKGROUND', (0, 1), (1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
-        ]))
-        
-        story.append(category_table)
-        story.append(Spacer(1, 1 * cm))
-        
-        # Ajouter les graphiques au rapport
-        story.append(Paragraph("Graphiques", styles['Heading2']))
+        details = []
+        if start is not None or end is not None:
+            details.append(f"Période: du {start or 'début'} au {end or 'dernier jour'}")
+        if categories is not None:
+            details.append(f"Catégories: {', '.join(categories)}")
+        
+        render_report(snapshot, report_path, vector_charts, None if vector_charts else graph_files, details, progress,
+                      transactions)
+        progress(1.0, "Rapport généré")
+        
+        return report_path
+    
+    @profiled('reporter.partitioned_reports')
+    def generate_partitioned_reports(self, output_dir, period='month', by_category=False, start=None, end=None,
+                                     categories=None, vector_charts=False, max_workers=None, progress=None,
+                                     transactions=False):
+        """
+        Génère un rapport PDF par période et/ou par catégorie.
+        
+        Les dépenses sont chargées une seule fois puis réparties; les rapports
+        sont mis en page en parallèle dans un groupe de processus, chacun ne
+        recevant que les dépenses de sa partie. Les noms des fichiers ne
+        dépendent que de la partie (ex: rapport_depenses_2024-03.pdf,
+        rapport_depenses_2024-03_transport.pdf): une nouvelle génération
+        remplace les rapports précédents.
+        
+        Args:
+            output_dir (str): Répertoire de sortie des rapports
+            period (str, optional): 'day', 'week', 'month' ou 'year', ou None
+                pour ne pas répartir par période
+            by_category (bool, optional): Répartir aussi par catégorie
+            start (date ou str, optional): Premier jour inclus
+            end (date ou str, optional): Dernier jour inclus
+            categories (list, optional): Catégories retenues (toutes par défaut)
+            vector_charts (bool, optional): Graphiques vectoriels (reportlab)
+            max_workers (int, optional): Nombre maximal de processus
+            progress (callable, optional): Fonction progress(fraction, message)
+                appelée après chaque rapport
+            transactions (bool, optional): Ajouter à chaque rapport la liste
+                détaillée des dépenses de sa partie
+        
+        Returns:
+            dict: Chemin du rapport de chaque partie, par clé (début de période
+                ou None, catégorie ou None), dans l'ordre des clés
+        
+        Raises:
+            ValueError: Si aucune répartition n'est demandée, si la
+                granularité est inconnue ou si la période est invalide
+        """
+        if period is None and not by_category:
+            raise ValueError("Aucune répartition demandée (période ou catégorie)")
+        if period is not None and period not in GRANULARITIES:
+            raise ValueError(f"Granularité inconnue: {period}")
+        if progress is None:
+            progress = lambda fraction, message: None
+        
+        progress(0.0, "Chargement des dépenses")
+        with stage('reporter.snapshot'):
+            snapshot = self.expense_analyzer.expense_manager.snapshot(start, end, categories)
+        if snapshot.empty:
+            return {}
+        
+        with stage('reporter.partition'):
+            partitions = partition_expenses(snapshot.expenses, period, by_category)
+        
+        os.makedirs(output_dir, exist_ok=True)
+        tasks = []
+        for (period_start, category), expenses in partitions:
+            file_name = partition_file_name(period, period_start, category)
+            details = []
+            if period_start is not None:
+                first, last = period_bounds(period, period_start, start, end)
+                details.append(f"Période: du {first:%Y-%m-%d} au {last:%Y-%m-%d}")
+            elif start is not None or end is not None:
+                details.append(f"Période: du {start or 'début'} au {end or 'dernier jour'}")
+            if category is not None:
+                details.append(f"Catégorie: {category}")
+            elif categories is not None:
+                details.append(f"Catégories: {', '.join(categories)}")
+            
+            graphs_dir = os.path.join(output_dir, 'temp_graphs', os.path.splitext(file_name)[0])
+            tasks.append(((period_start, category), expenses, os.path.join(output_dir, file_name), graphs_dir, details))
+        
+        reports = {}
+        
+        def done(key, path):
+            reports[key] = path
+            progress(len(reports) / len(tasks), f"Rapport {len(reports)}/{len(tasks)}")
+        
+        with stage('reporter.render'):
+            workers = min(len(tasks), max_workers or os.cpu_count() or 1)
+            rendered = False
+            if workers > 1:
+                try:
+                    with ProcessPoolExecutor(max_workers=workers) as executor:
+                        futures = {
+                            executor.submit(_render_partition, expenses, path, graphs_dir, details, vector_charts,
+                                            transactions): key
+                            for key, expenses, path, graphs_dir, details in tasks
+                        }
+                        for future in as_completed(futures):
+                            done(futures[future], future.result())
+                    rendered = True
+                except (OSError, BrokenProcessPool) as e:
+                    print(f"Rendu parallèle impossible, rendu séquentiel: {e}")
+                    reports = {}
+            
+            if not rendered:
+                for key, expenses, path, graphs_dir, details in tasks:
+                    done(key, _render_partition(expenses, path, graphs_dir, details, vector_charts, transactions))
         
+        return {key: reports[key] for key, *_ in tasks}
+
+def render_report(snapshot, report_path, vector_charts=False, graph_files=(), details=(), progress=None,
+                  transactions=False):
+    """
+    Met en page le rapport PDF d'un instantané des dépenses.
+    
+    Args:
+        snapshot (ExpenseSnapshot): Instantané des dépenses du rapport
+        report_path (str): Chemin du fichier PDF à écrire
+        vector_charts (bool, optional): Dessiner les graphiques avec reportlab
+        graph_files (list, optional): Images des graphiques à intégrer (hors
+            mode vectoriel)
+        details (list, optional): Lignes décrivant le périmètre du rapport
+            (période, catégories), affichées sous le titre
+        progress (callable, optional): Fonction progress(fraction, message)
+        transactions (bool, optional): Ajouter la liste détaillée des
+            dépenses de l'instantané
+    """
+    if progress is None:
+        progress = lambda fraction, message: None
+    
+    # Créer le document PDF
+    doc = SimpleDocTemplate(
+        report_path,
+        pagesize=A4,
+        rightMargin=72,
+        leftMargin=72,
+        topMargin=72,
+        bottomMargin=72
+    )
+    
+    # Contenu du document
+    story = []
+    styles = getSampleStyleSheet()
+    
+    # Ajouter des styles personnalisés
+    styles.add(ParagraphStyle(
+        name='ReportTitle',
+        parent=styles['Heading1'],
+        fontSize=18,
+        alignment=1,  # Centre
+        spaceAfter=12
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='ReportHeading2',
+        parent=styles['Heading2'],
+        fontSize=14,
+        spaceAfter=10
+    ))
+    
+    styles.add(ParagraphStyle(
+        name='ReportNormal',
+        parent=styles['Normal'],
+        fontSize=10,
+        spaceAfter=6
+    ))
+    
+    # Titre du rapport
+    title = Paragraph("Rapport de Suivi des Dépenses Personnelles", styles['ReportTitle'])
+    story.append(title)
+    story.append(Spacer(1, 0.5 * cm))
+    
+    # Date du rapport
+    date_str = datetime.now().strftime("%d/%m/%Y %H:%M")
+    date_paragraph = Paragraph(f"Généré le: {date_str}", styles['ReportNormal'])
+    story.append(date_paragraph)
+    
+    # Période et catégories couvertes, si le rapport est restreint
+    for detail in details:
+        story.append(Paragraph(detail, styles['ReportNormal']))
+    story.append(Spacer(1, 1 * cm))
+    
+    # Résumé des statistiques
+    story.append(Paragraph("Résumé des Statistiques", styles['ReportHeading2']))
+    progress(0.6, "Calcul des statistiques")
+    stats = snapshot.statistics
+    
+    # Tableau des statistiques générales
+    stats_data = [
+        ["Métrique", "Valeur"],
+        ["Total des dépenses", f"{stats['total']:.2f} €"],
+        ["Moyenne des dépenses", f"{stats['mean']:.2f} €"],
+        [median_label(stats), f"{stats['median']:.2f} €"],
+        ["Dépense minimale", f"{stats['min']:.2f} €"],
+        ["Dépense maximale", f"{stats['max']:.2f} €"],
+        ["Nombre de dépenses", f"{stats['count']}"]
+    ]
+    
+    stats_table = Table(stats_data, colWidths=[250, 150])
+    stats_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (1, 0), 12),
+        ('BACKGROUND', (0, 1), (1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+    ]))
+    
+    story.append(stats_table)
+    story.append(Spacer(1, 0.5 * cm))
+    
+    # Dépenses par catégorie
+    story.append(Paragraph("Dépenses par Catégorie", styles['ReportHeading2']))
+    
+    # Tableau des dépenses par catégorie
+    category_data = [["Catégorie", "Montant"]]
+    for category, amount in stats['by_category'].items():
+        category_data.append([category, f"{amount:.2f} €"])
+    
+    category_table = Table(category_data, colWidths=[250, 150])
+    category_table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (1, 0), colors.whitesmoke),
+        ('ALIGN', (0, 0), (1, 0), 'CENTER'),
+        ('FONTNAME', (0, 0), (1, 0), 'Helvetica-Bold'),
+        ('BOTTOMPADDING', (0, 0), (1, 0), 12),
+        ('BACKGROUND', (0, 1), (1, -1), colors.beige),
+        ('GRID', (0, 0), (-1, -1), 1, colors.black),
+        ('ALIGN', (1, 1), (1, -1), 'RIGHT'),
+    ]))
+    
+    story.append(category_table)
+    story.append(Spacer(1, 1 * cm))
+    
+    # Ajouter les graphiques au rapport
+    story.append(Paragraph("Graphiques", styles['ReportHeading2']))
+    
+    if vector_charts:
+        for graph_name, drawing in build_charts(snapshot):
+            story.append(Paragraph(graph_name, styles['ReportNormal']))
+            story.append(drawing)
+            story.append(Spacer(1, 0.5 * cm))
+    else:
         for graph_file in graph_files:
             # Ajouter une description du graphique
             graph_name = os.path.basename(graph_file).replace('.png', '').replace('_', ' ').title()
-            story.append(Paragraph(graph_name, styles['Normal']))
+            story.append(Paragraph(graph_name, styles['ReportNormal']))
             
             # Ajouter le graphique
             img = Image(graph_file, width=6*inch, height=3*inch)
             story.append(img)
             story.append(Spacer(1, 0.5 * cm))
-        
-        # Générer le PDF
+    
+    # Liste détaillée des dépenses de l'instantané: les tableaux sont
+    # construits page par page pendant la mise en page
+    if transactions:
+        story.append(PageBreak())
+        story.append(Paragraph("Liste des Dépenses", styles['ReportHeading2']))
+        story.append(Paragraph(f"{stats['count']} dépenses, dans l'ordre de leur enregistrement.",
+                               styles['ReportNormal']))
+        story.append(TransactionListing(snapshot.expenses))
+    
+    # Générer le PDF
+    progress(0.8, "Mise en page du PDF")
+    with stage('reporter.build'):
         doc.build(story)
+
+class TransactionListing(Flowable):
+    """
+    Liste détaillée des dépenses, découpée en pages pendant la mise en page.
+    
+    La liste se découpe elle-même (split): à chaque page, elle produit un
+    tableau à hauteur de ligne fixe remplissant la place disponible, avec son
+    en-tête, suivi de la suite de la liste. Les en-têtes se répètent en haut
+    de chaque page et le coût de mise en page est proportionnel au nombre de
+    dépenses: seul le tableau de la page en cours est construit.
+    """
+    
+    def __init__(self, expenses, position=0):
+        """
+        Args:
+            expenses (pandas.DataFrame): Dépenses à lister
+            position (int, optional): Position de la première dépense restant
+                à lister
+        """
+        super().__init__()
+        self.expenses = expenses
+        self.position = position
+    
+    def wrap(self, availWidth, availHeight):
+        # Tant qu'il reste des dépenses, demander plus que la place
+        # disponible: la liste est alors découpée (split)
+        if self.position >= len(self.expenses):
+            return availWidth, 0
+        return availWidth, availHeight + TRANSACTION_ROW_HEIGHT
+    
+    def split(self, availWidth, availHeight):
+        # Lignes de dépenses tenant dans la place disponible, en-tête déduit
+        count = int(availHeight // TRANSACTION_ROW_HEIGHT) - 1
+        if count < 1 or self.position >= len(self.expenses):
+            return []
         
-        return report_path
\ No newline at end of file
+        end = self.position + count
+        table = transaction_table(self.expenses.iloc[self.position:end], availWidth)
+        if end >= len(self.expenses):
+            return [table]
+        return [table, TransactionListing(self.expenses, end)]
+    
+    def draw(self):
+        pass
+
+def transaction_table(expenses, width):
+    """
+    Construit le tableau d'une page de la liste détaillée des dépenses.
+    
+    Args:
+        expenses (pandas.DataFrame): Dépenses de la page
+        width (float): Largeur disponible
+    
+    Returns:
+        LongTable: Tableau avec en-tête, à hauteur de ligne fixe
+    """
+    descriptions = [
+        description if len(description) <= TRANSACTION_DESCRIPTION_LENGTH
+        else description[:TRANSACTION_DESCRIPTION_LENGTH - 1] + '…'
+        for description in expenses['Description'].fillna('').astype(str).tolist()
+    ]
+    data = [[name for name, _ in TRANSACTION_COLUMNS]]
+    data.extend(zip(
+        expenses['Date'].dt.strftime('%d/%m/%Y').tolist(),
+        [f"{amount:.2f} €" for amount in expenses['Montant'].tolist()],
+        expenses['Catégorie'].astype(str).tolist(),
+        descriptions,
+    ))
+    
+    table = LongTable(data, colWidths=[share * width for _, share in TRANSACTION_COLUMNS],
+                      rowHeights=[TRANSACTION_ROW_HEIGHT] * len(data), repeatRows=1)
+    table.setStyle(TableStyle([
+        ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+        ('FONTSIZE', (0, 0), (-1, -1), 7),
+        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+        ('TOPPADDING', (0, 0), (-1, -1), 0),
+        ('BOTTOMPADDING', (0, 0), (-1, -1), 0),
+        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.beige]),
+        ('LINEBELOW', (0, 0), (-1, -1), 0.25, colors.lightgrey),
+        ('ALIGN', (1, 0), (1, -1), 'RIGHT'),
+    ]))
+    return table
+
+def partition_expenses(expenses, period=None, by_category=False):
+    """
+    Répartit les dépenses par période et/ou par catégorie.
+    
+    Args:
+        expenses (pandas.DataFrame): Dépenses, colonne 'Date' en datetime
+        period (str, optional): 'day', 'week', 'month' ou 'year' (None pour
+            ne pas répartir par période)
+        by_category (bool, optional): Répartir par catégorie
+    
+    Returns:
+        list: Couples ((début de période ou None, catégorie ou None), dépenses
+            de la partie), triés par clé; seules les parties non vides figurent
+    """
+    keys = []
+    if period is not None:
+        keys.append(period_starts(pd.to_datetime(expenses['Date']), period).rename('Période'))
+    if by_category:
+        keys.append(expenses['Catégorie'].astype(str).rename('Catégorie'))
+    
+    partitions = []
+    for key, part in expenses.groupby(keys, sort=True, observed=True):
+        key = list(key) if isinstance(key, tuple) else [key]
+        period_start = key.pop(0) if period is not None else None
+        category = key.pop(0) if by_category else None
+        partitions.append(((period_start, category), part.reset_index(drop=True)))
+    return partitions
+
+def period_bounds(period, period_start, start=None, end=None):
+    """
+    Calcule le premier et le dernier jour d'une période, restreints à [start, end].
+    
+    Args:
+        period (str): 'day', 'week', 'month' ou 'year'
+        period_start (pandas.Timestamp): Premier jour de la période
+        start (date ou str, optional): Premier jour inclus du rapport
+        end (date ou str, optional): Dernier jour inclus du rapport
+    
+    Returns:
+        tuple: (premier jour, dernier jour) en pandas.Timestamp
+    """
+    first = period_start
+    last = period_start + pd.tseries.frequencies.to_offset(GRANULARITIES[period]) - pd.Timedelta(days=1)
+    if start is not None:
+        first = max(first, pd.Timestamp(start))
+    if end is not None:
+        last = min(last, pd.Timestamp(end))
+    return first, last
+
+def partition_file_name(period, period_start, category):
+    """
+    Construit le nom de fichier déterministe du rapport d'une partie.
+    
+    Args:
+        period (str): Granularité de la répartition (None si aucune)
+        period_start (pandas.Timestamp): Premier jour de la période, ou None
+        category (str): Catégorie, ou None
+    
+    Returns:
+        str: Nom du fichier (ex: rapport_depenses_2024-03_transport.pdf)
+    """
+    parts = ["rapport_depenses"]
+    if period_start is not None:
+        parts.append(period_start.strftime(PERIOD_LABELS[period]))
+    if category is not None:
+        # Nom de catégorie sans accents ni caractères spéciaux
+        ascii_name = unicodedata.normalize('NFKD', category).encode('ascii', 'ignore').decode('ascii')
+        parts.append(re.sub(r'[^a-z0-9]+', '-', ascii_name.lower()).strip('-') or 'categorie')
+    return '_'.join(parts) + '.pdf'
+
+def _render_partition(expenses, report_path, graphs_dir, details, vector_charts, transactions=False):
+    """
+    Génère le rapport d'une partie des dépenses (dans un processus du groupe).
+    
+    Returns:
+        str: Chemin du rapport généré
+    """
+    snapshot = ExpenseSnapshot(expenses)
+    graph_files = ()
+    if not vector_charts:
+        # Les rapports sont déjà répartis entre les processus: graphiques en série
+        from expense_charts import build_chart_specs, render_charts
+        os.makedirs(graphs_dir, exist_ok=True)
+        specs = build_chart_specs(snapshot.by_category, snapshot.by_date, graphs_dir)
+        graph_files = render_charts(specs, parallel=False)
+    
+    render_report(snapshot, report_path, vector_charts, graph_files, details, transactions=transactions)
+    return report_path
\ No newline at end of file
@@ -0,0 +1,252 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module du cube de cumuls des dépenses
+
+Ce module maintient les totaux et nombres de dépenses par période (jour,
+semaine, mois, année) et par catégorie. Le cube est construit une fois à
+partir des dépenses puis mis à jour à chaque ajout: les tendances, moyennes
+glissantes et comparaisons de périodes en sont tirées sans relire les
+dépenses, en un temps qui ne dépend que du nombre de périodes et de
+catégories.
+"""
+
+import pandas as pd
+from datetime import date, timedelta
+
+# Granularités du cube: fréquence pandas des débuts de période
+GRANULARITIES = {
+    'day': 'D',
+    'week': 'W-MON',
+    'month': 'MS',
+    'year': 'YS',
+}
+
+def period_start(day, granularity):
+    """
+    Retourne le premier jour de la période contenant un jour.
+    
+    Args:
+        day (datetime.date): Jour
+        granularity (str): 'day', 'week' (semaines commençant le lundi),
+            'month' ou 'year'
+    
+    Returns:
+        pandas.Timestamp: Premier jour de la période
+    """
+    if granularity == 'day':
+        start = day
+    elif granularity == 'week':
+        start = day - timedelta(days=day.weekday())
+    elif granularity == 'month':
+        start = day.replace(day=1)
+    elif granularity == 'year':
+        start = day.replace(month=1, day=1)
+    else:
+        raise ValueError(f"Granularité inconnue: {granularity}")
+    return pd.Timestamp(start)
+
+def period_starts(dates, granularity):
+    """
+    Calcule en bloc le premier jour de la période de chaque date.
+    
+    Args:
+        dates (pandas.Series): Dates des dépenses (datetime)
+        granularity (str): Granularité du cube
+    
+    Returns:
+        pandas.Series: Premier jour de la période de chaque dépense
+    """
+    days = dates.dt.normalize()
+    if granularity == 'day':
+        return days
+    if granularity == 'week':
+        return days - pd.to_timedelta(days.dt.weekday, unit='D')
+    if granularity == 'month':
+        return days.dt.to_period('M').dt.start_time
+    if granularity == 'year':
+        return days.dt.to_period('Y').dt.start_time
+    raise ValueError(f"Granularité inconnue: {granularity}")
+
+class RollupCube:
+    """
+    Classe pour le cube des cumuls par période et par catégorie.
+    
+    Pour chaque granularité, le cube associe à chaque couple (début de
+    période, catégorie) le total et le nombre des dépenses. Les tableaux
+    (périodes x catégories) sont construits à la demande et mémorisés
+    jusqu'à la prochaine mise à jour.
+    """
+    
+    def __init__(self):
+        """
+        Initialise un cube vide.
+        """
+        self.signature = None
+        self.cells = {granularity: {} for granularity in GRANULARITIES}
+        self._memo = {}
+    
+    def build(self, expenses, signature=None):
+        """
+        Construit le cube à partir de toutes les dépenses (calcul vectorisé).
+        
+        Args:
+            expenses (pandas.DataFrame): DataFrame contenant les dépenses
+            signature (tuple, optional): Signature du stockage correspondant
+        """
+        self.signature = signature
+        self.cells = {granularity: {} for granularity in GRANULARITIES}
+        self._memo = {}
+        if expenses.empty:
+            return
+        
+        dates = pd.to_datetime(expenses['Date'])
+        valid = dates.notna()
+        dates = dates[valid]
+        amounts = expenses.loc[valid, 'Montant'].astype(float)
+        categories = expenses.loc[valid, 'Catégorie']
+        
+        for granularity in GRANULARITIES:
+            starts = period_starts(dates, granularity)
+            grouped = amounts.groupby([starts, categories], observed=True).agg(['sum', 'count'])
+            self.cells[granularity] = {
+                (start, str(category)): [float(total), int(count)]
+                for (start, category), total, count in zip(grouped.index, grouped['sum'], grouped['count'])
+            }
+    
+    def apply(self, records):
+        """
+        Met à jour le cube avec de nouvelles dépenses.
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        """
+        for day, amount, category, _ in records:
+            day = date.fromisoformat(str(day)[:10])
+            for granularity, cells in self.cells.items():
+                cell = cells.setdefault((period_start(day, granularity), str(category)), [0.0, 0])
+                cell[0] += float(amount)
+                cell[1] += 1
+        self._memo = {}
+    
+    @property
+    def empty(self):
+        """
+        bool: True si le cube ne contient aucune dépense
+        """
+        return not self.cells['year']
+    
+    @property
+    def count(self):
+        """
+        int: Nombre de dépenses comptées dans le cube
+        """
+        return sum(cell[1] for cell in self.cells['year'].values())
+    
+    def table(self, granularity='month', value='total'):
+        """
+        Retourne le tableau des cumuls d'une granularité.
+        
+        Toutes les périodes entre la première et la dernière dépense sont
+        présentes (à zéro si elles n'ont aucune dépense).
+        
+        Args:
+            granularity (str): 'day', 'week', 'month' ou 'year'
+            value (str): 'total' (montants) ou 'count' (nombres de dépenses)
+        
+        Returns:
+            pandas.DataFrame: Cumuls, une ligne par période et une colonne par catégorie
+        """
+        if granularity not in GRANULARITIES:
+            raise ValueError(f"Granularité inconnue: {granularity}")
+        if value not in ('total', 'count'):
+            raise ValueError(f"Valeur inconnue: {value}")
+        
+        key = (granularity, value)
+        if key not in self._memo:
+            cells = self.cells[granularity]
+            if not cells:
+                self._memo[key] = pd.DataFrame(dtype='float64')
+            else:
+                position = 0 if value == 'total' else 1
+                series = pd.Series(
+                    [cell[position] for cell in cells.values()],
+                    index=pd.MultiIndex.from_tuples(list(cells), names=['Période', 'Catégorie'])
+                )
+                table = series.unstack(fill_value=0).sort_index()
+                periods = pd.date_range(table.index.min(), table.index.max(), freq=GRANULARITIES[granularity])
+                table = table.reindex(periods, fill_value=0)
+                table.index.name = 'Période'
+                self._memo[key] = table.sort_index(axis=1)
+        return self._memo[key].copy()
+    
+    def trend(self, granularity='month', categories=None):
+        """
+        Retourne l'évolution des dépenses par période.
+        
+        Args:
+            granularity (str): 'day', 'week', 'month' ou 'year'
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Returns:
+            pandas.Series: Montant total par période
+        """
+        table = self.table(granularity)
+        if categories is not None:
+            table = table.reindex(columns=list(categories), fill_value=0)
+        trend = table.sum(axis=1)
+        trend.name = 'Montant'
+        return trend
+    
+    def rolling_average(self, window, granularity='day', categories=None):
+        """
+        Retourne la moyenne glissante des dépenses par période.
+        
+        Args:
+            window (int): Nombre de périodes de la fenêtre
+            granularity (str): 'day', 'week', 'month' ou 'year'
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Returns:
+            pandas.Series: Moyenne des totaux sur les window dernières périodes
+        """
+        return self.trend(granularity, categories).rolling(window, min_periods=1).mean()
+    
+    def compare(self, granularity='month', period=None, offset=1):
+        """
+        Compare une période à une période antérieure, catégorie par catégorie.
+        
+        Args:
+            granularity (str): 'day', 'week', 'month' ou 'year'
+            period (date ou str, optional): Jour de la période à comparer
+                (dernière période par défaut)
+            offset (int, optional): Nombre de périodes en arrière (1 pour la
+                période précédente, 12 en mois pour la même période de l'année
+                précédente)
+        
+        Returns:
+            pandas.DataFrame: Colonnes 'Actuel', 'Référence', 'Écart' et
+                'Évolution (%)' (vide si la référence est nulle), une ligne par
+                catégorie plus une ligne 'Total'
+        """
+        table = self.table(granularity)
+        if table.empty:
+            return pd.DataFrame(columns=['Actuel', 'Référence', 'Écart', 'Évolution (%)'])
+        
+        if period is None:
+            current = table.index.max()
+        else:
+            current = period_start(pd.Timestamp(period).date(), granularity)
+        reference = current - offset * pd.tseries.frequencies.to_offset(GRANULARITIES[granularity])
+        
+        comparison = pd.DataFrame({
+            'Actuel': table.loc[current] if current in table.index else 0.0,
+            'Référence': table.loc[reference] if reference in table.index else 0.0,
+        }, index=table.columns)
+        comparison.loc['Total'] = comparison.sum()
+        comparison['Écart'] = comparison['Actuel'] - comparison['Référence']
+        reference_values = comparison['Référence'].where(comparison['Référence'] != 0)
+        comparison['Évolution (%)'] = comparison['Écart'] / reference_values * 100
+        comparison.attrs['periods'] = (current, reference)
+        return comparison
\ No newline at end of file
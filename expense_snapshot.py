@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module d'instantané des dépenses
+
+Ce module fournit un instantané des dépenses chargé une seule fois et partagé
+entre l'analyse et la génération de rapports.
+"""
+
+import pandas as pd
+
+from expense_storage import sum_by_category
+
+class ExpenseSnapshot:
+    """
+    Classe représentant un instantané cohérent des dépenses.
+    
+    Les données sont chargées une seule fois; les agrégats (par catégorie,
+    par date, statistiques) sont calculés à la première demande puis
+    mémorisés. Tous les tableaux et graphiques construits à partir d'un même
+    instantané reposent donc sur les mêmes données.
+    """
+    
+    def __init__(self, expenses, statistics=None):
+        """
+        Initialise l'instantané avec un DataFrame de dépenses.
+        
+        Args:
+            expenses (pandas.DataFrame): DataFrame contenant les dépenses
+            statistics (dict, optional): Statistiques de ces dépenses, tirées
+                des agrégats au moment de l'instantané (calculées à la
+                demande sinon)
+        """
+        self.expenses = expenses
+        self._memo = {}
+        if statistics is not None:
+            self._memo['statistics'] = statistics
+    
+    @property
+    def empty(self):
+        """
+        bool: True si l'instantané ne contient aucune dépense
+        """
+        return self.expenses.empty
+    
+    @property
+    def by_category(self):
+        """
+        pandas.Series: Montants totaux par catégorie
+        """
+        if 'by_category' not in self._memo:
+            if self.empty:
+                self._memo['by_category'] = pd.Series()
+            else:
+                self._memo['by_category'] = sum_by_category(self.expenses['Montant'], self.expenses['Catégorie'])
+        return self._memo['by_category']
+    
+    @property
+    def by_date(self):
+        """
+        pandas.Series: Montants totaux par date
+        """
+        if 'by_date' not in self._memo:
+            if self.empty:
+                self._memo['by_date'] = pd.Series()
+            else:
+                expenses = self.expenses
+                self._memo['by_date'] = expenses.groupby(expenses['Date'].dt.date)['Montant'].sum()
+        return self._memo['by_date']
+    
+    @property
+    def statistics(self):
+        """
+        dict: Statistiques des dépenses, ou None si l'instantané est vide
+        """
+        if 'statistics' not in self._memo:
+            if self.empty:
+                self._memo['statistics'] = None
+            else:
+                amounts = self.expenses['Montant']
+                self._memo['statistics'] = {
+                    'total': amounts.sum(),
+                    'mean': amounts.mean(),
+                    'median': amounts.median(),
+                    'min': amounts.min(),
+                    'max': amounts.max(),
+                    'count': len(amounts),
+                    'by_category': self.by_category.to_dict()
+                }
+        return self._memo['statistics']
\ No newline at end of file
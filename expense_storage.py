@@ -0,0 +1,1329 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module de stockage des dépenses
+
+Ce module définit les moteurs de stockage utilisés par le gestionnaire de
+dépenses: un fichier CSV (par défaut), une base SQLite ou un format binaire
+en colonnes lu par projection mémoire.
+"""
+
+import os
+import csv
+import io
+import json
+import importlib.util
+import mmap
+import sqlite3
+import threading
+import time
+import numpy as np
+import pandas as pd
+from datetime import date
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+# Colonnes du fichier de données
+COLUMNS = ['Date', 'Montant', 'Catégorie', 'Description']
+
+# Fichier de configuration du répertoire de données
+CONFIG_FILE = 'config.json'
+
+# Format des dates enregistrées
+DATE_FORMAT = "%Y-%m-%d"
+
+# Types des colonnes des dépenses chargées: les catégories, peu nombreuses et
+# très répétées, sont codées par dictionnaire (Categorical)
+CSV_DTYPES = {
+    'Date': 'str',
+    'Montant': 'float64',
+    'Catégorie': 'category',
+    'Description': 'str',
+}
+
+# Moteur de lecture CSV de pyarrow (multithread), utilisé s'il est installé
+PYARROW_AVAILABLE = importlib.util.find_spec('pyarrow') is not None
+
+# Fichier verrou partagé par les processus qui écrivent dans le répertoire
+LOCK_FILE = 'expenses.lock'
+
+# Attente maximale du verrou d'écriture (en secondes)
+LOCK_TIMEOUT = 10.0
+
+def parse_dates(values):
+    """
+    Convertit une colonne de dates au format AAAA-MM-JJ.
+    
+    Les dates saisies dans un autre format (fichier modifié à la main) sont
+    converties par inférence, plus lente, sans ralentir les autres.
+    
+    Args:
+        values (pandas.Series): Dates sous forme de texte
+    
+    Returns:
+        pandas.Series: Dates (datetime)
+    """
+    dates = pd.to_datetime(values, format=DATE_FORMAT, errors='coerce')
+    others = dates.isna() & values.notna()
+    if others.any():
+        dates[others] = pd.to_datetime(values[others], format='mixed')
+    return dates
+
+def chunk_sizes(chunksize):
+    """
+    Retourne la fonction donnant la taille du prochain bloc d'un parcours.
+    
+    Args:
+        chunksize (int ou callable): Nombre maximal de dépenses par bloc, ou
+            fonction sans argument consultée avant chaque bloc (taille
+            ajustée en cours de parcours, voir expense_streaming.ChunkSizer)
+    
+    Returns:
+        callable: Fonction retournant la taille du prochain bloc
+    """
+    if callable(chunksize):
+        return chunksize
+    return lambda: chunksize
+
+def sum_by_category(amounts, categories):
+    """
+    Calcule les montants totaux par catégorie.
+    
+    Pour des catégories codées (Categorical), le regroupement se fait sur les
+    codes et seules les catégories présentes sont retournées.
+    
+    Args:
+        amounts (pandas.Series): Montants des dépenses
+        categories (pandas.Series): Catégories des dépenses
+    
+    Returns:
+        pandas.Series: Montants totaux, indexés par libellé de catégorie (triés)
+    """
+    totals = amounts.groupby(categories, observed=True).sum()
+    totals.index = totals.index.astype(str)
+    return totals.sort_index()
+
+class WriteLock:
+    """
+    Verrou d'écriture partagé entre processus (verrou consultatif sur un fichier).
+    
+    Tous les processus qui écrivent dans un même répertoire de données (interface
+    graphique, mode console, scripts d'import) prennent ce verrou: les ajouts
+    et la mise à jour des agrégats sont ainsi sérialisés. Les lectures ne le
+    prennent jamais. Le verrou est réentrant dans un même processus et
+    s'utilise comme gestionnaire de contexte.
+    """
+    
+    def __init__(self, path, timeout=LOCK_TIMEOUT, poll_interval=0.01):
+        """
+        Initialise le verrou (le fichier est ouvert à la première acquisition).
+        
+        Args:
+            path (str): Chemin du fichier verrou
+            timeout (float, optional): Attente maximale du verrou (en secondes)
+            poll_interval (float, optional): Intervalle entre deux essais (en secondes)
+        """
+        self.path = path
+        self.timeout = timeout
+        self.poll_interval = poll_interval
+        self._thread_lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+    
+    def acquire(self):
+        """
+        Prend le verrou, en attendant au plus timeout secondes.
+        
+        Raises:
+            TimeoutError: Si le verrou n'a pas pu être pris à temps
+        """
+        deadline = time.monotonic() + self.timeout
+        if not self._thread_lock.acquire(timeout=self.timeout):
+            raise TimeoutError(f"Délai dépassé en attendant le verrou d'écriture {self.path}")
+        
+        if self._depth == 0:
+            try:
+                self._lock_file(deadline)
+            except BaseException:
+                self._thread_lock.release()
+                raise
+        self._depth += 1
+    
+    def _lock_file(self, deadline):
+        """
+        Prend le verrou du fichier en réessayant jusqu'à l'échéance.
+        
+        Args:
+            deadline (float): Échéance (horloge time.monotonic)
+        """
+        f = open(self.path, 'a+b')
+        while True:
+            try:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_NBLCK, 1)
+                break
+            except OSError:
+                if time.monotonic() >= deadline:
+                    f.close()
+                    raise TimeoutError(f"Délai dépassé en attendant le verrou d'écriture {self.path}")
+                time.sleep(self.poll_interval)
+        self._file = f
+    
+    def release(self):
+        """
+        Libère le verrou.
+        """
+        self._depth -= 1
+        if self._depth == 0:
+            f, self._file = self._file, None
+            try:
+                if fcntl is not None:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+            finally:
+                f.close()
+        self._thread_lock.release()
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.release()
+
+class CommittedReader(io.RawIOBase):
+    """
+    Lecture d'un fichier limitée à ses premiers octets.
+    
+    Permet de lire un fichier en cours d'ajout sans verrou: seuls les
+    enregistrements complets présents au début de la lecture sont vus.
+    """
+    
+    def __init__(self, f, limit):
+        """
+        Args:
+            f (file): Fichier ouvert en lecture binaire, positionné au début
+            limit (int): Nombre d'octets lisibles
+        """
+        self._f = f
+        self._remaining = limit
+    
+    def readable(self):
+        return True
+    
+    def readinto(self, buffer):
+        size = min(len(buffer), self._remaining)
+        if size <= 0:
+            return 0
+        read = self._f.readinto(memoryview(buffer)[:size])
+        self._remaining -= read
+        return read
+    
+    def close(self):
+        if not self.closed:
+            self._f.close()
+        super().close()
+
+def last_record_start(data, start=0):
+    """
+    Recherche le début du dernier enregistrement d'un contenu CSV.
+    
+    Un retour à la ligne placé dans un champ entre guillemets (description sur
+    plusieurs lignes) ne termine pas un enregistrement. Seuls les guillemets
+    sont examinés un à un: le coût dépend de leur nombre, pas de celui des
+    lignes.
+    
+    Args:
+        data (bytes ou mmap.mmap): Contenu du fichier
+        start (int, optional): Début d'un enregistrement à partir duquel chercher
+    
+    Returns:
+        int: Position suivant le dernier retour à la ligne hors guillemets
+            (start s'il n'y en a aucun)
+    """
+    size = len(data)
+    last = start
+    position = start
+    while position < size:
+        quote = data.find(b'"', position)
+        newline = data.rfind(b'\n', position, size if quote == -1 else quote)
+        if newline != -1:
+            last = newline + 1
+        if quote == -1:
+            break
+        
+        position = quote + 1
+        if quote > 0 and data[quote - 1:quote] not in (b',', b'\n'):
+            # Guillemet au milieu d'un champ non cité: caractère ordinaire
+            continue
+        
+        # Champ cité: aller au guillemet fermant (les guillemets doublés sont échappés)
+        while True:
+            closing = data.find(b'"', position)
+            if closing == -1:
+                # Champ non terminé: le dernier enregistrement est incomplet
+                return last
+            position = closing + 1
+            if data[position:position + 1] != b'"':
+                break
+            position += 1
+    return last
+
+def is_complete_record(data):
+    """
+    Vérifie qu'un enregistrement CSV sans retour à la ligne final est complet.
+    
+    Args:
+        data (bytes): Octets de l'enregistrement
+    
+    Returns:
+        bool: True si les octets forment exactement un enregistrement de
+            len(COLUMNS) champs (champs cités terminés, texte UTF-8 valide)
+    """
+    try:
+        rows = list(csv.reader(io.StringIO(data.decode('utf-8')), strict=True))
+    except (csv.Error, UnicodeDecodeError):
+        return False
+    return len(rows) == 1 and len(rows[0]) == len(COLUMNS)
+
+class ExpenseStorage:
+    """
+    Classe de base des moteurs de stockage des dépenses.
+    
+    Les enregistrements échangés avec un moteur sont des lignes
+    [date (AAAA-MM-JJ), montant, catégorie, description].
+    """
+    
+    # Nom du moteur dans la configuration
+    name = None
+    
+    # Nom du fichier de données dans le répertoire
+    file_name = None
+    
+    # True si le moteur calcule lui-même les regroupements
+    native_aggregation = False
+    
+    # True si le moteur sait charger une période sans tout lire
+    native_range_queries = False
+    
+    def __init__(self, data_dir):
+        """
+        Initialise le moteur de stockage.
+        
+        Args:
+            data_dir (str): Répertoire de stockage des données
+        """
+        self.data_dir = data_dir
+        self.path = os.path.join(data_dir, self.file_name)
+        self.write_lock = WriteLock(os.path.join(data_dir, LOCK_FILE))
+    
+    def append(self, records):
+        """
+        Ajoute des enregistrements à la fin du stockage.
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        """
+        raise NotImplementedError
+    
+    def recover(self):
+        """
+        Termine ou retire un ajout interrompu, avant de lire l'état du stockage.
+        
+        Appelé sous le verrou d'écriture, avant de comparer la signature du
+        stockage à celle des agrégats: les lignes rétablies ou retirées
+        changent alors la signature au lieu d'échapper aux agrégats. Par
+        défaut, rien à faire.
+        """
+        pass
+    
+    def load(self):
+        """
+        Charge toutes les dépenses.
+        
+        Returns:
+            pandas.DataFrame: DataFrame des dépenses, colonne 'Date' en datetime
+        """
+        raise NotImplementedError
+    
+    def iter_chunks(self, chunksize):
+        """
+        Parcourt les dépenses par blocs de taille bornée.
+        
+        Args:
+            chunksize (int ou callable): Nombre maximal de dépenses par bloc,
+                ou fonction donnant la taille de chaque bloc (voir chunk_sizes)
+        
+        Yields:
+            pandas.DataFrame: Bloc de dépenses, colonne 'Date' en datetime
+        """
+        raise NotImplementedError
+    
+    def signature(self):
+        """
+        Calcule une signature qui change dès que les données changent.
+        
+        Returns:
+            tuple: Signature des données, ou None si le stockage n'existe pas
+        """
+        raise NotImplementedError
+    
+    def load_between(self, start, end, categories=None):
+        """
+        Charge les dépenses d'une période (si native_range_queries).
+        
+        Args:
+            start (str): Premier jour inclus (AAAA-MM-JJ), ou None
+            end (str): Dernier jour inclus (AAAA-MM-JJ), ou None
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Returns:
+            pandas.DataFrame: DataFrame des dépenses, dans l'ordre d'enregistrement
+        """
+        raise NotImplementedError
+    
+    def sum_by_category(self):
+        """
+        Calcule les montants totaux par catégorie (si native_aggregation).
+        
+        Returns:
+            pandas.Series: Série contenant les montants totaux par catégorie
+        """
+        raise NotImplementedError
+    
+    def sum_by_date(self):
+        """
+        Calcule les montants totaux par date (si native_aggregation).
+        
+        Returns:
+            pandas.Series: Série contenant les montants totaux par date
+        """
+        raise NotImplementedError
+    
+    def close(self):
+        """
+        Libère les ressources du moteur.
+        """
+        pass
+
+class CSVStorage(ExpenseStorage):
+    """
+    Stockage des dépenses dans un fichier CSV en ajout seul.
+    """
+    
+    name = 'csv'
+    file_name = 'expenses.csv'
+    
+    def __init__(self, data_dir):
+        """
+        Initialise le stockage CSV et crée le fichier s'il n'existe pas.
+        
+        Args:
+            data_dir (str): Répertoire de stockage des données
+        """
+        super().__init__(data_dir)
+        self.journal_path = self.path + '.journal'
+        
+        # Dernier début d'enregistrement trouvé par _tail et octets qui le
+        # précèdent: la recherche suivante repart de là si le début du
+        # fichier n'a pas changé
+        self._scanned = (0, b'')
+        
+        if not os.path.exists(self.path):
+            with self.write_lock:
+                # Un autre processus a pu créer le fichier entre-temps
+                if not os.path.exists(self.path):
+                    # Écrire l'en-tête dans un fichier temporaire puis le renommer,
+                    # afin de ne jamais laisser un fichier à moitié écrit
+                    tmp_file = self.path + '.tmp'
+                    with open(tmp_file, 'w', encoding='utf-8', newline='') as f:
+                        csv.writer(f, lineterminator='\n').writerow(COLUMNS)
+                        f.flush()
+                        os.fsync(f.fileno())
+                    os.replace(tmp_file, self.path)
+    
+    def append(self, records):
+        """
+        Ajoute des enregistrements à la fin du fichier de données.
+        
+        Le fichier n'est jamais relu ni réécrit : les lignes encodées sont
+        ajoutées en une seule écriture puis synchronisées sur le disque.
+        Le coût d'un ajout ne dépend donc pas de la taille du fichier.
+        
+        L'ajout se fait sous le verrou d'écriture et passe par un journal:
+        les lignes sont d'abord enregistrées dans le journal avec la position
+        où elles doivent être écrites, puis ajoutées au fichier de données, et
+        le journal est supprimé. Un ajout interrompu est rejoué à l'écriture
+        suivante (voir _recover).
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        
+        Raises:
+            TimeoutError: Si le verrou d'écriture n'a pas pu être pris à temps
+        """
+        buffer = io.StringIO()
+        csv.writer(buffer, lineterminator='\n').writerows(records)
+        payload = buffer.getvalue().encode('utf-8')
+        
+        with self.write_lock, open(self.path, 'a+b') as f:
+            self._recover(f)
+            
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                # Fichier vide: écrire l'en-tête avant les données
+                header = io.StringIO()
+                csv.writer(header, lineterminator='\n').writerow(COLUMNS)
+                payload = header.getvalue().encode('utf-8') + payload
+            else:
+                self._repair_tail(f)
+            offset = f.seek(0, os.SEEK_END)
+            
+            self._write_journal(offset, payload)
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+            os.remove(self.journal_path)
+    
+    def recover(self):
+        """
+        Rejoue le journal et répare la fin du fichier (voir _recover et _repair_tail).
+        
+        Le fichier n'est modifié (et sa signature changée) que si un ajout
+        avait été interrompu ou si la dernière ligne n'était pas terminée.
+        """
+        with self.write_lock, open(self.path, 'a+b') as f:
+            self._recover(f)
+            if f.seek(0, os.SEEK_END) > 0:
+                self._repair_tail(f)
+    
+    def _write_journal(self, offset, payload):
+        """
+        Enregistre un ajout dans le journal avant de l'appliquer.
+        
+        Le journal contient une ligne d'en-tête JSON (position et longueur de
+        l'ajout) suivie des octets à écrire.
+        
+        Args:
+            offset (int): Position de l'ajout dans le fichier de données
+            payload (bytes): Octets à ajouter
+        """
+        header = json.dumps({'offset': offset, 'length': len(payload)}).encode('utf-8')
+        with open(self.journal_path, 'wb') as journal:
+            journal.write(header + b'\n' + payload)
+            journal.flush()
+            os.fsync(journal.fileno())
+    
+    def _recover(self, f):
+        """
+        Termine l'ajout enregistré dans le journal, s'il a été interrompu.
+        
+        Un journal complet est rejoué: le fichier de données est ramené à la
+        position de l'ajout puis les lignes sont réécrites. Un journal
+        incomplet (plantage pendant son écriture) est abandonné, le fichier
+        de données n'ayant pas encore été modifié. Appelé sous le verrou
+        d'écriture.
+        
+        Args:
+            f (file): Fichier de données ouvert en mode 'a+b'
+        """
+        try:
+            with open(self.journal_path, 'rb') as journal:
+                data = journal.read()
+        except FileNotFoundError:
+            return
+        
+        header, _, payload = data.partition(b'\n')
+        try:
+            entry = json.loads(header)
+            complete = len(payload) == entry['length']
+        except (ValueError, KeyError, TypeError):
+            complete = False
+        
+        size = f.seek(0, os.SEEK_END)
+        # Rejouer seulement si le fichier n'a pas été modifié depuis l'ajout
+        if complete and entry['offset'] <= size <= entry['offset'] + len(payload):
+            f.truncate(entry['offset'])
+            f.seek(entry['offset'])
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.remove(self.journal_path)
+    
+    def _tail(self, f):
+        """
+        Localise le dernier enregistrement du fichier et vérifie s'il est complet.
+        
+        Le fichier est projeté en mémoire et parcouru depuis le dernier début
+        d'enregistrement connu: seule la partie ajoutée depuis la recherche
+        précédente est examinée.
+        
+        Args:
+            f (file): Fichier de données ouvert en lecture binaire
+        
+        Returns:
+            tuple: (taille du fichier, début du dernier enregistrement, True si
+                cet enregistrement est complet ou absent)
+        """
+        size = f.seek(0, os.SEEK_END)
+        if size == 0:
+            return 0, 0, True
+        
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as data:
+            offset, before = self._scanned
+            if offset > size or data[max(0, offset - 64):offset] != before:
+                offset = 0
+            start = last_record_start(data, offset)
+            self._scanned = (start, data[max(0, start - 64):start])
+            complete = start == size or is_complete_record(data[start:size])
+        return size, start, complete
+    
+    def _repair_tail(self, f):
+        """
+        Termine le dernier enregistrement du fichier s'il n'a pas de retour à la ligne.
+        
+        Un enregistrement final complet (fichier modifié à la main, ou écrit
+        sans retour à la ligne final) est terminé par un retour à la ligne,
+        alors qu'un enregistrement tronqué (plantage en cours d'écriture) est
+        retiré. Un enregistrement sur plusieurs lignes (description entre
+        guillemets) est examiné en entier.
+        
+        Args:
+            f (file): Fichier de données ouvert en mode 'a+b'
+        """
+        size, start, complete = self._tail(f)
+        if start == size:
+            return
+        if complete:
+            f.write(b'\n')
+        else:
+            f.truncate(start)
+    
+    def load(self):
+        """
+        Charge toutes les dépenses depuis le fichier CSV.
+        
+        Returns:
+            pandas.DataFrame: DataFrame des dépenses, colonne 'Date' en datetime
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return pd.DataFrame(columns=COLUMNS)
+        
+        # Schéma explicite: aucune inférence de type à la lecture
+        expenses = None
+        if PYARROW_AVAILABLE:
+            try:
+                with self._open_committed() as f:
+                    expenses = pd.read_csv(f, dtype=CSV_DTYPES, engine='pyarrow')
+            except (ValueError, ImportError):
+                expenses = None
+        if expenses is None:
+            with self._open_committed() as f:
+                expenses = pd.read_csv(f, dtype=CSV_DTYPES)
+        
+        # Convertir la colonne 'Date' en datetime
+        expenses['Date'] = parse_dates(expenses['Date'])
+        # Une description vide est lue comme valeur manquante: la remettre à ''
+        expenses['Description'] = expenses['Description'].fillna('')
+        return expenses
+    
+    def iter_chunks(self, chunksize):
+        """
+        Lit le fichier CSV par blocs sans le charger entièrement.
+        
+        Args:
+            chunksize (int ou callable): Nombre maximal de dépenses par bloc,
+                ou fonction donnant la taille de chaque bloc
+        
+        Yields:
+            pandas.DataFrame: Bloc de dépenses, colonne 'Date' en datetime
+        """
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        
+        # Les catégories restent du texte: chaque bloc aurait son propre dictionnaire
+        dtypes = dict(CSV_DTYPES, **{'Catégorie': 'str'})
+        next_size = chunk_sizes(chunksize)
+        with self._open_committed() as f, pd.read_csv(f, dtype=dtypes, iterator=True) as reader:
+            while True:
+                try:
+                    chunk = reader.get_chunk(next_size())
+                except StopIteration:
+                    return
+                chunk['Date'] = parse_dates(chunk['Date'])
+                chunk['Description'] = chunk['Description'].fillna('')
+                yield chunk
+    
+    def _open_committed(self):
+        """
+        Ouvre le fichier de données en lecture, limité à ses lignes complètes.
+        
+        La lecture ne prend pas le verrou d'écriture: un ajout en cours dans un
+        autre processus n'est pas vu, et ne bloque pas la lecture. Un dernier
+        enregistrement complet sans retour à la ligne est lu; un
+        enregistrement incomplet est ignoré jusqu'au prochain ajout, qui le
+        retire.
+        
+        Returns:
+            io.BufferedReader: Fichier en lecture binaire
+        """
+        f = open(self.path, 'rb')
+        size, start, complete = self._tail(f)
+        limit = size if complete else start
+        f.seek(0)
+        return io.BufferedReader(CommittedReader(f, limit))
+    
+    def signature(self):
+        """
+        Calcule la signature du fichier de données (date de modification, taille).
+        
+        Returns:
+            tuple: Signature du fichier, ou None s'il n'existe pas
+        """
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+class SQLiteStorage(ExpenseStorage):
+    """
+    Stockage des dépenses dans une base SQLite.
+    
+    La base est en mode WAL: les lectures ne sont pas bloquées par les
+    écritures. Les regroupements par catégorie et par date sont calculés
+    par SQLite à l'aide des index sur ces colonnes.
+    """
+    
+    name = 'sqlite'
+    file_name = 'expenses.db'
+    native_aggregation = True
+    native_range_queries = True
+    
+    def __init__(self, data_dir):
+        """
+        Initialise le stockage SQLite et crée le schéma s'il n'existe pas.
+        
+        Args:
+            data_dir (str): Répertoire de stockage des données
+        """
+        super().__init__(data_dir)
+        
+        # La connexion peut être utilisée depuis plusieurs threads,
+        # les accès sont sérialisés par un verrou
+        self._lock = threading.Lock()
+        self.connection = sqlite3.connect(self.path, timeout=30, check_same_thread=False)
+        with self._lock:
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("PRAGMA synchronous=NORMAL")
+            with self.connection:
+                self.connection.execute(
+                    "CREATE TABLE IF NOT EXISTS expenses ("
+                    "id INTEGER PRIMARY KEY, "
+                    "date TEXT NOT NULL, "
+                    "amount REAL NOT NULL, "
+                    "category TEXT NOT NULL, "
+                    "description TEXT NOT NULL DEFAULT '')"
+                )
+                self.connection.execute("CREATE INDEX IF NOT EXISTS idx_expenses_date ON expenses (date)")
+                self.connection.execute("CREATE INDEX IF NOT EXISTS idx_expenses_category ON expenses (category)")
+    
+    def append(self, records):
+        """
+        Ajoute des enregistrements dans une seule transaction.
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        """
+        with self.write_lock, self._lock, self.connection:
+            self.connection.executemany(
+                "INSERT INTO expenses (date, amount, category, description) VALUES (?, ?, ?, ?)",
+                records
+            )
+    
+    def load(self):
+        """
+        Charge toutes les dépenses depuis la base, dans l'ordre d'insertion.
+        
+        Returns:
+            pandas.DataFrame: DataFrame des dépenses, colonne 'Date' en datetime
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT date, amount, category, description FROM expenses ORDER BY id"
+            ).fetchall()
+        
+        return self._frame(rows)
+    
+    def load_between(self, start, end, categories=None):
+        """
+        Charge les dépenses d'une période à l'aide de l'index sur la date.
+        
+        Args:
+            start (str): Premier jour inclus (AAAA-MM-JJ), ou None
+            end (str): Dernier jour inclus (AAAA-MM-JJ), ou None
+            categories (list, optional): Catégories retenues (toutes par défaut)
+        
+        Returns:
+            pandas.DataFrame: DataFrame des dépenses, dans l'ordre d'enregistrement
+        """
+        conditions = []
+        parameters = []
+        if start is not None:
+            conditions.append("date >= ?")
+            parameters.append(start)
+        if end is not None:
+            conditions.append("date <= ?")
+            parameters.append(end)
+        if categories is not None:
+            categories = list(categories)
+            conditions.append(f"category IN ({', '.join('?' * len(categories))})")
+            parameters.extend(categories)
+        
+        query = "SELECT date, amount, category, description FROM expenses"
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY id"
+        
+        with self._lock:
+            rows = self.connection.execute(query, parameters).fetchall()
+        
+        return self._frame(rows)
+    
+    def _frame(self, rows):
+        """
+        Construit un DataFrame des dépenses à partir de lignes de la base.
+        
+        Args:
+            rows (list): Lignes (date, montant, catégorie, description)
+        
+        Returns:
+            pandas.DataFrame: DataFrame des dépenses, colonne 'Date' en datetime
+        """
+        expenses = pd.DataFrame.from_records(rows, columns=COLUMNS)
+        if expenses.empty:
+            return pd.DataFrame(columns=COLUMNS)
+        
+        expenses['Date'] = pd.to_datetime(expenses['Date'], format=DATE_FORMAT)
+        expenses['Catégorie'] = expenses['Catégorie'].astype('category')
+        return expenses
+    
+    def iter_chunks(self, chunksize):
+        """
+        Lit les dépenses de la base par blocs, dans l'ordre d'insertion.
+        
+        Args:
+            chunksize (int ou callable): Nombre maximal de dépenses par bloc,
+                ou fonction donnant la taille de chaque bloc
+        
+        Yields:
+            pandas.DataFrame: Bloc de dépenses, colonne 'Date' en datetime
+        """
+        next_size = chunk_sizes(chunksize)
+        last_id = 0
+        while True:
+            with self._lock:
+                rows = self.connection.execute(
+                    "SELECT id, date, amount, category, description FROM expenses "
+                    "WHERE id > ? ORDER BY id LIMIT ?",
+                    (last_id, next_size())
+                ).fetchall()
+            if not rows:
+                return
+            
+            last_id = rows[-1][0]
+            chunk = pd.DataFrame.from_records([row[1:] for row in rows], columns=COLUMNS)
+            chunk['Date'] = pd.to_datetime(chunk['Date'], format=DATE_FORMAT)
+            yield chunk
+    
+    def signature(self):
+        """
+        Calcule la signature de la base: le plus grand identifiant de dépense.
+        
+        Les dépenses sont uniquement ajoutées, l'identifiant change donc à
+        chaque écriture, quelle que soit la connexion qui l'a faite.
+        
+        Returns:
+            tuple: Signature de la base
+        """
+        with self._lock:
+            max_id = self.connection.execute("SELECT MAX(id) FROM expenses").fetchone()[0]
+        return (max_id or 0,)
+    
+    def sum_by_category(self):
+        """
+        Calcule les montants totaux par catégorie avec GROUP BY.
+        
+        Returns:
+            pandas.Series: Série contenant les montants totaux par catégorie
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT category, SUM(amount) FROM expenses GROUP BY category ORDER BY category"
+            ).fetchall()
+        
+        index = pd.Index([row[0] for row in rows], name='Catégorie')
+        return pd.Series([row[1] for row in rows], index=index, name='Montant', dtype='float64')
+    
+    def sum_by_date(self):
+        """
+        Calcule les montants totaux par date avec GROUP BY.
+        
+        Returns:
+            pandas.Series: Série contenant les montants totaux par date
+        """
+        with self._lock:
+            rows = self.connection.execute(
+                "SELECT date, SUM(amount) FROM expenses GROUP BY date ORDER BY date"
+            ).fetchall()
+        
+        index = pd.Index([date.fromisoformat(row[0]) for row in rows], name='Date')
+        return pd.Series([row[1] for row in rows], index=index, name='Montant', dtype='float64')
+    
+    def close(self):
+        """
+        Ferme la connexion à la base.
+        """
+        with self._lock:
+            self.connection.close()
+
+class ColumnarStorage(ExpenseStorage):
+    """
+    Stockage des dépenses en colonnes binaires, lues par projection mémoire.
+    
+    Le répertoire expenses.col contient un fichier par colonne:
+    - day.i32: numéro du jour depuis le 1er janvier 1970 (int32)
+    - amount.f64: montant (float64)
+    - category.i32: code de la catégorie dans le dictionnaire (int32)
+    - categories.json: dictionnaire des catégories (code -> nom)
+    - description.heap: descriptions encodées en UTF-8, mises bout à bout
+    - description.off: position de fin de chaque description (int64)
+    
+    Les regroupements sont calculés directement sur les colonnes projetées
+    en mémoire (numpy.memmap), sans construire de DataFrame ni copier les
+    données. Les ajouts se font en fin de chaque fichier; la colonne des
+    jours est écrite en dernier et fait foi pour le nombre de lignes.
+    """
+    
+    name = 'columnar'
+    file_name = 'expenses.col'
+    native_aggregation = True
+    
+    # Colonnes de taille fixe: nom -> type numpy
+    FIXED_COLUMNS = {
+        'description.off': np.int64,
+        'category.i32': np.int32,
+        'amount.f64': np.float64,
+        'day.i32': np.int32,
+    }
+    
+    def __init__(self, data_dir):
+        """
+        Initialise le stockage en colonnes et crée ses fichiers s'ils n'existent pas.
+        
+        Args:
+            data_dir (str): Répertoire de stockage des données
+        """
+        super().__init__(data_dir)
+        
+        os.makedirs(self.path, exist_ok=True)
+        for file_name in list(self.FIXED_COLUMNS) + ['description.heap']:
+            open(self._column_path(file_name), 'ab').close()
+        if not os.path.exists(self._column_path('categories.json')):
+            self._write_categories([])
+    
+    def _column_path(self, file_name):
+        """
+        Retourne le chemin d'un fichier de colonne.
+        
+        Args:
+            file_name (str): Nom du fichier de colonne
+        
+        Returns:
+            str: Chemin du fichier
+        """
+        return os.path.join(self.path, file_name)
+    
+    def _read_categories(self):
+        """
+        Lit le dictionnaire des catégories.
+        
+        Returns:
+            list: Noms des catégories, indexés par leur code
+        """
+        with open(self._column_path('categories.json'), encoding='utf-8') as f:
+            return json.load(f)
+    
+    def _write_categories(self, categories):
+        """
+        Enregistre le dictionnaire des catégories de façon atomique.
+        
+        Args:
+            categories (list): Noms des catégories, indexés par leur code
+        """
+        path = self._column_path('categories.json')
+        tmp_file = path + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(categories, f, ensure_ascii=False)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_file, path)
+    
+    def row_count(self):
+        """
+        Retourne le nombre de lignes validées (longueur de la colonne des jours).
+        
+        Returns:
+            int: Nombre de dépenses enregistrées
+        """
+        return os.path.getsize(self._column_path('day.i32')) // np.dtype(np.int32).itemsize
+    
+    def _column(self, file_name, count=None):
+        """
+        Projette une colonne de taille fixe en mémoire, en lecture seule.
+        
+        Args:
+            file_name (str): Nom du fichier de colonne
+            count (int, optional): Nombre de lignes à projeter
+        
+        Returns:
+            numpy.ndarray: Colonne projetée (numpy.memmap, ou tableau vide)
+        """
+        dtype = self.FIXED_COLUMNS[file_name]
+        if count is None:
+            count = self.row_count()
+        if count == 0:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(self._column_path(file_name), dtype=dtype, mode='r', shape=(count,))
+    
+    def _repair(self, count):
+        """
+        Tronque les colonnes écrites au-delà des lignes validées.
+        
+        Un ajout interrompu peut laisser certaines colonnes plus longues que
+        la colonne des jours; ces données non validées sont retirées.
+        
+        Args:
+            count (int): Nombre de lignes validées
+        """
+        for file_name, dtype in self.FIXED_COLUMNS.items():
+            path = self._column_path(file_name)
+            size = count * np.dtype(dtype).itemsize
+            if os.path.getsize(path) > size:
+                with open(path, 'r+b') as f:
+                    f.truncate(size)
+        
+        heap_size = int(self._column('description.off', count)[-1]) if count else 0
+        heap_path = self._column_path('description.heap')
+        if os.path.getsize(heap_path) > heap_size:
+            with open(heap_path, 'r+b') as f:
+                f.truncate(heap_size)
+    
+    def append(self, records):
+        """
+        Ajoute des enregistrements en fin de chaque fichier de colonne.
+        
+        L'ajout se fait sous le verrou d'écriture. La colonne des jours, écrite
+        en dernier, sert de journal: un ajout interrompu est retiré des autres
+        colonnes à l'écriture suivante (voir _repair).
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        
+        Raises:
+            TimeoutError: Si le verrou d'écriture n'a pas pu être pris à temps
+        """
+        if not records:
+            return
+        
+        with self.write_lock:
+            self._write_rows(records)
+    
+    def _write_rows(self, records):
+        """
+        Écrit des enregistrements dans les fichiers de colonne (sous le verrou).
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        """
+        count = self.row_count()
+        self._repair(count)
+        
+        dates, amounts, categories, descriptions = zip(*records)
+        
+        # Encoder les catégories avec le dictionnaire (complété si besoin)
+        dictionary = self._read_categories()
+        codes_by_name = {name: code for code, name in enumerate(dictionary)}
+        known = len(dictionary)
+        for name in categories:
+            if name not in codes_by_name:
+                codes_by_name[name] = len(dictionary)
+                dictionary.append(name)
+        if len(dictionary) > known:
+            self._write_categories(dictionary)
+        
+        # Descriptions: octets mis bout à bout et positions de fin
+        encoded = [str(description).encode('utf-8') for description in descriptions]
+        heap_start = int(self._column('description.off', count)[-1]) if count else 0
+        offsets = heap_start + np.cumsum([len(data) for data in encoded], dtype=np.int64)
+        
+        columns = [
+            ('description.heap', b''.join(encoded)),
+            ('description.off', offsets.astype(np.int64).tobytes()),
+            ('category.i32', np.array([codes_by_name[name] for name in categories], dtype=np.int32).tobytes()),
+            ('amount.f64', np.array(amounts, dtype=np.float64).tobytes()),
+            # Colonne des jours en dernier: elle valide les lignes ajoutées
+            ('day.i32', np.array(dates, dtype='datetime64[D]').astype(np.int32).tobytes()),
+        ]
+        for file_name, payload in columns:
+            with open(self._column_path(file_name), 'ab') as f:
+                f.write(payload)
+                f.flush()
+                os.fsync(f.fileno())
+    
+    def load(self):
+        """
+        Construit un DataFrame de toutes les dépenses à partir des colonnes.
+        
+        Returns:
+            pandas.DataFrame: DataFrame des dépenses, colonne 'Date' en datetime
+        """
+        count = self.row_count()
+        if count == 0:
+            return pd.DataFrame(columns=COLUMNS)
+        
+        return self._frame(count, 0, count)
+    
+    def iter_chunks(self, chunksize):
+        """
+        Construit les DataFrames des dépenses bloc par bloc.
+        
+        Args:
+            chunksize (int ou callable): Nombre maximal de dépenses par bloc,
+                ou fonction donnant la taille de chaque bloc
+        
+        Yields:
+            pandas.DataFrame: Bloc de dépenses, colonne 'Date' en datetime
+        """
+        next_size = chunk_sizes(chunksize)
+        count = self.row_count()
+        start = 0
+        while start < count:
+            stop = min(start + next_size(), count)
+            yield self._frame(count, start, stop)
+            start = stop
+    
+    def _frame(self, count, start, stop):
+        """
+        Construit le DataFrame d'une plage de lignes.
+        
+        Args:
+            count (int): Nombre de lignes validées
+            start (int): Première ligne (incluse)
+            stop (int): Dernière ligne (exclue)
+        
+        Returns:
+            pandas.DataFrame: DataFrame des dépenses de la plage
+        """
+        dictionary = self._read_categories()
+        offsets = self._column('description.off', count)
+        ends = np.asarray(offsets[start:stop])
+        heap_start = int(offsets[start - 1]) if start > 0 else 0
+        starts = np.concatenate(([heap_start], ends[:-1])) - heap_start
+        with open(self._column_path('description.heap'), 'rb') as f:
+            f.seek(heap_start)
+            heap = f.read(int(ends[-1]) - heap_start)
+        ends = ends - heap_start
+        
+        return pd.DataFrame({
+            'Date': pd.to_datetime(self._column('day.i32', count)[start:stop].astype('datetime64[D]')),
+            'Montant': np.array(self._column('amount.f64', count)[start:stop]),
+            # Les codes enregistrés sont directement ceux du Categorical
+            'Catégorie': pd.Categorical.from_codes(self._column('category.i32', count)[start:stop], categories=dictionary),
+            'Description': [heap[begin:end].decode('utf-8') for begin, end in zip(starts, ends)],
+        }, index=pd.RangeIndex(start, stop))
+    
+    def signature(self):
+        """
+        Calcule la signature du stockage à partir de la colonne des jours.
+        
+        Returns:
+            tuple: Signature de la colonne des jours, ou None si elle n'existe pas
+        """
+        try:
+            stat = os.stat(self._column_path('day.i32'))
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+    
+    def sum_by_category(self):
+        """
+        Calcule les montants totaux par catégorie (bincount sur les codes).
+        
+        Returns:
+            pandas.Series: Série contenant les montants totaux par catégorie
+        """
+        count = self.row_count()
+        dictionary = self._read_categories()
+        if count == 0:
+            return pd.Series(dtype='float64')
+        
+        codes = self._column('category.i32', count)
+        amounts = self._column('amount.f64', count)
+        totals = np.bincount(codes, weights=amounts, minlength=len(dictionary))
+        used = np.bincount(codes, minlength=len(dictionary)) > 0
+        
+        index = pd.Index(np.array(dictionary, dtype=object)[used], name='Catégorie')
+        return pd.Series(totals[used], index=index, name='Montant').sort_index()
+    
+    def sum_by_date(self):
+        """
+        Calcule les montants totaux par date (bincount sur les jours).
+        
+        Returns:
+            pandas.Series: Série contenant les montants totaux par date
+        """
+        count = self.row_count()
+        if count == 0:
+            return pd.Series(dtype='float64')
+        
+        days = self._column('day.i32', count)
+        amounts = self._column('amount.f64', count)
+        first_day = int(days.min())
+        offsets = days - first_day
+        totals = np.bincount(offsets, weights=amounts)
+        used = np.flatnonzero(np.bincount(offsets))
+        
+        dates = (used + first_day).astype('datetime64[D]').astype(object)
+        return pd.Series(totals[used], index=pd.Index(dates, name='Date'), name='Montant')
+
+# Moteurs de stockage disponibles, par nom
+STORAGE_BACKENDS = {
+    CSVStorage.name: CSVStorage,
+    SQLiteStorage.name: SQLiteStorage,
+    ColumnarStorage.name: ColumnarStorage,
+}
+
+def read_config(data_dir):
+    """
+    Lit la configuration du répertoire de données.
+    
+    Args:
+        data_dir (str): Répertoire de stockage des données
+    
+    Returns:
+        dict: Configuration (vide si le fichier n'existe pas)
+    """
+    config_path = os.path.join(data_dir, CONFIG_FILE)
+    if not os.path.exists(config_path):
+        return {}
+    
+    with open(config_path, encoding='utf-8') as f:
+        return json.load(f)
+
+def write_config(data_dir, config):
+    """
+    Enregistre la configuration du répertoire de données.
+    
+    Args:
+        data_dir (str): Répertoire de stockage des données
+        config (dict): Configuration à enregistrer
+    """
+    config_path = os.path.join(data_dir, CONFIG_FILE)
+    tmp_file = config_path + '.tmp'
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        json.dump(config, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_file, config_path)
+
+def open_storage(data_dir, backend=None):
+    """
+    Ouvre le moteur de stockage d'un répertoire de données.
+    
+    Sans moteur explicite, la clé 'storage' du fichier config.json est
+    utilisée; à défaut, le moteur est déduit des fichiers présents.
+    
+    Args:
+        data_dir (str): Répertoire de stockage des données
+        backend (str, optional): Nom du moteur ('csv', 'sqlite' ou 'columnar')
+    
+    Returns:
+        ExpenseStorage: Moteur de stockage
+    
+    Raises:
+        ValueError: Si le moteur demandé est inconnu
+    """
+    if backend is None:
+        backend = read_config(data_dir).get('storage')
+    
+    if backend is None:
+        backend = CSVStorage.name
+        for storage_class in STORAGE_BACKENDS.values():
+            if storage_class is not CSVStorage and os.path.exists(os.path.join(data_dir, storage_class.file_name)):
+                backend = storage_class.name
+                break
+    
+    if backend not in STORAGE_BACKENDS:
+        raise ValueError(f"Moteur de stockage inconnu: {backend}")
+    
+    return STORAGE_BACKENDS[backend](data_dir)
+
+def migrate_storage(data_dir, backend):
+    """
+    Copie les dépenses du moteur actuel vers un autre moteur et l'active.
+    
+    La migration est faite une seule fois: elle est refusée si le moteur
+    cible contient déjà des données. Les données d'origine sont conservées.
+    
+    Args:
+        data_dir (str): Répertoire de stockage des données
+        backend (str): Nom du moteur cible
+    
+    Returns:
+        int: Nombre de dépenses migrées
+    
+    Raises:
+        ValueError: Si le moteur cible est inconnu, identique ou déjà rempli
+    """
+    source = open_storage(data_dir)
+    if backend not in STORAGE_BACKENDS:
+        source.close()
+        raise ValueError(f"Moteur de stockage inconnu: {backend}")
+    if backend == source.name:
+        source.close()
+        raise ValueError(f"Le stockage utilise déjà le moteur {backend}")
+    
+    target = STORAGE_BACKENDS[backend](data_dir)
+    try:
+        if not target.load().empty:
+            raise ValueError(f"Le stockage {backend} contient déjà des données")
+        
+        expenses = source.load()
+        if expenses.empty:
+            records = []
+        else:
+            records = list(zip(
+                expenses['Date'].dt.strftime("%Y-%m-%d").tolist(),
+                expenses['Montant'].astype(float).tolist(),
+                expenses['Catégorie'].astype(str).tolist(),
+                expenses['Description'].fillna('').astype(str).tolist()
+            ))
+        if records:
+            target.append(records)
+    finally:
+        source.close()
+        target.close()
+    
+    config = read_config(data_dir)
+    config['storage'] = backend
+    write_config(data_dir, config)
+    return len(records)
\ No newline at end of file
@@ -0,0 +1,399 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module de statistiques en flux
+
+Ce module calcule les statistiques des dépenses bloc par bloc, en mémoire
+bornée, pour les historiques trop volumineux pour être chargés en entier.
+Les quantiles (médiane, centiles) sont estimés par une esquisse fusionnable
+à erreur relative garantie. La taille des blocs est ajustée à la mémoire
+mesurée des blocs déjà lus.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+
+from expense_storage import sum_by_category
+
+# Nombre de dépenses du premier bloc, lu avant toute mesure
+PROBE_ROWS = 100
+
+# Part de la limite de mémoire visée par bloc: marge pour les blocs dont les
+# descriptions sont plus longues que celles du bloc mesuré
+CHUNK_MARGIN = 0.8
+
+# Nombre de valeurs gardées telles quelles par une esquisse: en dessous, les
+# quantiles sont exacts
+EXACT_VALUES = 1024
+
+class QuantileSketch:
+    """
+    Esquisse de quantiles à erreur relative bornée (type DDSketch).
+    
+    Chaque valeur est rangée dans un panier logarithmique: un quantile estimé
+    est à moins de relative_accuracy (en relatif) de la valeur exacte. Le
+    nombre de paniers ne dépend que de l'étendue des valeurs, et deux
+    esquisses se fusionnent en additionnant leurs paniers. Tant qu'elle
+    compte au plus EXACT_VALUES valeurs, l'esquisse les garde aussi telles
+    quelles et ses quantiles sont exacts.
+    """
+    
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Initialise une esquisse vide.
+        
+        Args:
+            relative_accuracy (float): Erreur relative maximale des quantiles
+        
+        Raises:
+            ValueError: Si la précision n'est pas strictement entre 0 et 1
+        """
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("La précision relative doit être comprise entre 0 et 1")
+        
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self.gamma)
+        self.positive = {}
+        self.negative = {}
+        self.zero_count = 0
+        self.count = 0
+        self.values = []
+    
+    @property
+    def exact(self):
+        """
+        bool: True si les quantiles sont calculés sur les valeurs elles-mêmes
+        """
+        return self.values is not None
+    
+    def _add_to_store(self, store, values):
+        """
+        Ajoute des valeurs strictement positives dans un ensemble de paniers.
+        
+        Args:
+            store (dict): Paniers (indice -> nombre de valeurs)
+            values (numpy.ndarray): Valeurs strictement positives
+        """
+        keys = np.ceil(np.log(values) / self._log_gamma).astype(np.int64)
+        for key, count in zip(*np.unique(keys, return_counts=True)):
+            store[int(key)] = store.get(int(key), 0) + int(count)
+    
+    def add(self, values):
+        """
+        Ajoute des valeurs à l'esquisse.
+        
+        Args:
+            values (array-like): Valeurs à ajouter (les NaN sont ignorés)
+        """
+        values = np.asarray(values, dtype=np.float64)
+        values = values[~np.isnan(values)]
+        if values.size == 0:
+            return
+        
+        self._add_to_store(self.positive, values[values > 0])
+        self._add_to_store(self.negative, -values[values < 0])
+        self.zero_count += int(np.count_nonzero(values == 0))
+        self.count += int(values.size)
+        self._keep_values(values.tolist())
+    
+    def _keep_values(self, values):
+        """
+        Garde des valeurs telles quelles, tant que leur nombre reste petit.
+        
+        Args:
+            values (list): Valeurs ajoutées
+        """
+        if self.values is not None:
+            if len(self.values) + len(values) <= EXACT_VALUES:
+                self.values.extend(values)
+            else:
+                self.values = None
+    
+    def merge(self, other):
+        """
+        Fusionne une autre esquisse de même précision dans celle-ci.
+        
+        Args:
+            other (QuantileSketch): Esquisse à fusionner
+        
+        Raises:
+            ValueError: Si les précisions diffèrent
+        """
+        if other.gamma != self.gamma:
+            raise ValueError("Impossible de fusionner des esquisses de précisions différentes")
+        
+        for store, other_store in ((self.positive, other.positive), (self.negative, other.negative)):
+            for key, count in other_store.items():
+                store[key] = store.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+        if other.values is None:
+            self.values = None
+        else:
+            self._keep_values(other.values)
+    
+    def _value(self, key):
+        """
+        Retourne la valeur représentative d'un panier.
+        
+        Args:
+            key (int): Indice du panier
+        
+        Returns:
+            float: Valeur au centre (relatif) du panier
+        """
+        return 2 * self.gamma ** key / (self.gamma + 1)
+    
+    def _value_at(self, rank):
+        """
+        Retourne la valeur estimée de rang donné (0 pour la plus petite).
+        
+        Args:
+            rank (int): Rang de la valeur
+        
+        Returns:
+            float: Valeur représentative du panier contenant ce rang
+        """
+        seen = 0
+        for key in sorted(self.negative, reverse=True):
+            seen += self.negative[key]
+            if seen > rank:
+                return -self._value(key)
+        
+        seen += self.zero_count
+        if seen > rank:
+            return 0.0
+        
+        for key in sorted(self.positive):
+            seen += self.positive[key]
+            if seen > rank:
+                return self._value(key)
+        
+        return self._value(max(self.positive))
+    
+    def quantile(self, q):
+        """
+        Estime un quantile.
+        
+        Comme pandas et numpy, le quantile est interpolé linéairement entre
+        les deux valeurs de rangs encadrant q * (count - 1); il est exact
+        tant que l'esquisse garde les valeurs (voir exact).
+        
+        Args:
+            q (float): Quantile entre 0 et 1 (0.5 pour la médiane)
+        
+        Returns:
+            float: Valeur estimée, ou None si l'esquisse est vide
+        """
+        if self.count == 0:
+            return None
+        if self.values is not None:
+            return float(np.quantile(self.values, q))
+        
+        rank = q * (self.count - 1)
+        lower = math.floor(rank)
+        value = self._value_at(lower)
+        if rank == lower:
+            return value
+        return value + (self._value_at(lower + 1) - value) * (rank - lower)
+    
+    def to_dict(self):
+        """
+        Convertit l'esquisse en dictionnaire enregistrable en JSON.
+        
+        Returns:
+            dict: Précision, paniers et nombres de valeurs
+        """
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'positive': {str(key): count for key, count in self.positive.items()},
+            'negative': {str(key): count for key, count in self.negative.items()},
+            'zero_count': self.zero_count,
+            'count': self.count,
+            'values': self.values,
+        }
+    
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Reconstruit une esquisse à partir de to_dict().
+        
+        Args:
+            data (dict): Dictionnaire produit par to_dict()
+        
+        Returns:
+            QuantileSketch: Esquisse reconstruite
+        """
+        sketch = cls(data['relative_accuracy'])
+        sketch.positive = {int(key): int(count) for key, count in data['positive'].items()}
+        sketch.negative = {int(key): int(count) for key, count in data['negative'].items()}
+        sketch.zero_count = int(data['zero_count'])
+        sketch.count = int(data['count'])
+        # Esquisse enregistrée sans ses valeurs: quantiles estimés
+        sketch.values = data.get('values', [] if sketch.count == 0 else None)
+        return sketch
+    
+    @property
+    def bins(self):
+        """
+        int: Nombre de paniers utilisés (mémoire occupée par l'esquisse)
+        """
+        return len(self.positive) + len(self.negative)
+
+class StreamingStatistics:
+    """
+    Classe pour accumuler les statistiques des dépenses bloc par bloc.
+    
+    Les sommes, nombres, minimum, maximum et regroupements par catégorie et
+    par date sont exacts; la médiane et les centiles proviennent d'une
+    QuantileSketch. La mémoire utilisée ne dépend que du nombre de
+    catégories, de jours et de paniers, pas du nombre de dépenses.
+    """
+    
+    def __init__(self, relative_accuracy=0.01):
+        """
+        Initialise un accumulateur vide.
+        
+        Args:
+            relative_accuracy (float): Erreur relative maximale des quantiles
+        """
+        self.count = 0
+        self.total = 0.0
+        self.min = None
+        self.max = None
+        self.by_category = pd.Series(dtype='float64')
+        self.by_date = pd.Series(dtype='float64')
+        self.sketch = QuantileSketch(relative_accuracy)
+    
+    def update(self, chunk):
+        """
+        Ajoute un bloc de dépenses aux statistiques.
+        
+        Args:
+            chunk (pandas.DataFrame): Bloc de dépenses
+        """
+        if chunk.empty:
+            return
+        
+        amounts = chunk['Montant'].astype(float)
+        self.count += len(amounts)
+        self.total += float(amounts.sum())
+        chunk_min = float(amounts.min())
+        chunk_max = float(amounts.max())
+        self.min = chunk_min if self.min is None else min(self.min, chunk_min)
+        self.max = chunk_max if self.max is None else max(self.max, chunk_max)
+        
+        by_category = sum_by_category(amounts, chunk['Catégorie'])
+        self.by_category = self.by_category.add(by_category, fill_value=0)
+        by_date = amounts.groupby(chunk['Date'].dt.date).sum()
+        self.by_date = self.by_date.add(by_date, fill_value=0)
+        
+        self.sketch.add(amounts.to_numpy())
+    
+    def merge(self, other):
+        """
+        Fusionne un autre accumulateur dans celui-ci.
+        
+        Args:
+            other (StreamingStatistics): Accumulateur à fusionner
+        """
+        if other.count == 0:
+            return
+        
+        self.count += other.count
+        self.total += other.total
+        self.min = other.min if self.min is None else min(self.min, other.min)
+        self.max = other.max if self.max is None else max(self.max, other.max)
+        self.by_category = self.by_category.add(other.by_category, fill_value=0)
+        self.by_date = self.by_date.add(other.by_date, fill_value=0)
+        self.sketch.merge(other.sketch)
+    
+    def result(self, percentiles=(0.25, 0.5, 0.75, 0.9, 0.99)):
+        """
+        Construit le dictionnaire des statistiques.
+        
+        Args:
+            percentiles (tuple): Quantiles à estimer (entre 0 et 1)
+        
+        Returns:
+            dict: Statistiques des dépenses, ou None si aucune dépense
+        """
+        if self.count == 0:
+            return None
+        
+        by_category = self.by_category.sort_index()
+        by_category.index.name = 'Catégorie'
+        by_date = self.by_date.sort_index()
+        by_date.index.name = 'Date'
+        
+        return {
+            'total': self.total,
+            'mean': self.total / self.count,
+            'median': self.sketch.quantile(0.5),
+            'min': self.min,
+            'max': self.max,
+            'count': self.count,
+            'by_category': by_category.to_dict(),
+            'by_date': by_date,
+            'percentiles': {q: self.sketch.quantile(q) for q in percentiles},
+            'relative_accuracy': None if self.sketch.exact else self.sketch.relative_accuracy
+        }
+
+class ChunkSizer:
+    """
+    Taille des blocs ajustée à la mémoire mesurée des blocs déjà lus.
+    
+    S'utilise comme taille de bloc d'un parcours (iter_expenses): elle est
+    consultée avant chaque bloc, et observe() mesure chaque bloc lu avec
+    memory_usage(deep=True), chaînes comprises. Le bloc suivant est
+    dimensionné d'après la mémoire par dépense mesurée, de sorte qu'un
+    bloc occupe au plus la limite; un bloc qui la dépasse (descriptions
+    plus longues) réduit aussitôt la taille des suivants. La limite porte
+    sur les blocs de données, pas sur les tampons internes du lecteur.
+    """
+    
+    def __init__(self, memory_limit_mb, first_rows=PROBE_ROWS):
+        """
+        Args:
+            memory_limit_mb (float): Mémoire maximale d'un bloc (Mo)
+            first_rows (int, optional): Nombre de dépenses du premier bloc
+        
+        Raises:
+            ValueError: Si la limite n'est pas strictement positive
+        """
+        if not memory_limit_mb > 0:
+            raise ValueError("La limite de mémoire doit être strictement positive")
+        
+        self.limit = int(memory_limit_mb * 1024 * 1024)
+        self.rows = first_rows
+        self.peak_bytes = 0
+        self.exceeded = 0
+    
+    def __call__(self):
+        return self.rows
+    
+    def observe(self, chunk):
+        """
+        Mesure un bloc lu et dimensionne le bloc suivant.
+        
+        Args:
+            chunk (pandas.DataFrame): Bloc qui vient d'être lu
+        
+        Raises:
+            ValueError: Si une seule dépense dépasse la limite de mémoire
+        """
+        if chunk.empty:
+            return
+        
+        usage = int(chunk.memory_usage(deep=True).sum())
+        self.peak_bytes = max(self.peak_bytes, usage)
+        if usage > self.limit:
+            if len(chunk) == 1:
+                raise ValueError(f"Limite de mémoire trop basse: une dépense occupe {usage} octets")
+            self.exceeded += 1
+        
+        per_row = usage / len(chunk)
+        self.rows = max(1, int(self.limit * CHUNK_MARGIN // per_row))
\ No newline at end of file
@@ -0,0 +1,351 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+
+"""
+Module du modèle de la liste des dépenses
+
+Ce module conserve les dépenses affichées sous forme de colonnes (tableaux
+numpy) et ne met en forme que les lignes demandées. L'interface graphique
+n'affiche ainsi qu'une fenêtre de lignes, quel que soit le nombre de
+dépenses, et le tri se fait sur les tableaux plutôt que dans le widget.
+Les tableaux ont une capacité doublée quand ils sont pleins: un ajout ne
+recopie pas les dépenses déjà affichées.
+"""
+
+import math
+import numpy as np
+import pandas as pd
+
+class ExpenseTableModel:
+    """
+    Classe pour le modèle en colonnes de la liste des dépenses.
+    
+    Les lignes sont adressées par leur position d'affichage: l'ordre courant
+    (ordre d'enregistrement, ou tri par colonne) est une permutation des
+    indices des tableaux. Quand la liste est triée, les dépenses ajoutées
+    restent dans une courte file d'attente triée, intercalée à l'affichage,
+    et ne sont fusionnées dans la permutation que par lots.
+    """
+    
+    COLUMNS = ("Date", "Montant", "Catégorie", "Description")
+    
+    # Capacité minimale des tableaux lorsqu'ils sont agrandis
+    MIN_CAPACITY = 1024
+    
+    # Nombre minimal de dépenses en attente avant leur fusion dans l'ordre trié
+    MERGE_ROWS = 1024
+    
+    def __init__(self, expenses=None):
+        """
+        Initialise le modèle.
+        
+        Args:
+            expenses (pandas.DataFrame, optional): Dépenses à afficher
+        """
+        self.sort_column = None
+        self.descending = False
+        self.load(expenses)
+    
+    def load(self, expenses):
+        """
+        Remplace les dépenses du modèle, en conservant le tri courant.
+        
+        Args:
+            expenses (pandas.DataFrame): Dépenses à afficher (None pour vider)
+        """
+        if expenses is None or expenses.empty:
+            self._dates = np.empty(0, dtype='datetime64[D]')
+            self._amounts = np.empty(0, dtype=np.float64)
+            self._categories = np.empty(0, dtype=object)
+            self._descriptions = np.empty(0, dtype=object)
+        else:
+            self._dates = pd.to_datetime(expenses['Date']).to_numpy(dtype='datetime64[D]')
+            self._amounts = expenses['Montant'].to_numpy(dtype=np.float64, copy=True)
+            self._categories = expenses['Catégorie'].astype(str).to_numpy(dtype=object)
+            self._descriptions = expenses['Description'].fillna('').astype(str).to_numpy(dtype=object)
+        self._size = len(self._amounts)
+        
+        self.order = None
+        self._sorted_values = None
+        self._clear_pending()
+        if self.sort_column is not None:
+            self.sort(self.sort_column, self.descending)
+    
+    @property
+    def dates(self):
+        """
+        numpy.ndarray: Dates des dépenses (datetime64[D]), ordre d'enregistrement
+        """
+        return self._dates[:self._size]
+    
+    @property
+    def amounts(self):
+        """
+        numpy.ndarray: Montants des dépenses, ordre d'enregistrement
+        """
+        return self._amounts[:self._size]
+    
+    @property
+    def categories(self):
+        """
+        numpy.ndarray: Catégories des dépenses, ordre d'enregistrement
+        """
+        return self._categories[:self._size]
+    
+    @property
+    def descriptions(self):
+        """
+        numpy.ndarray: Descriptions des dépenses, ordre d'enregistrement
+        """
+        return self._descriptions[:self._size]
+    
+    def _reserve(self, count):
+        """
+        Garantit la place de count dépenses supplémentaires dans les tableaux.
+        
+        La capacité est au moins doublée à chaque agrandissement: le coût des
+        recopies, réparti sur les ajouts, est constant par dépense ajoutée.
+        
+        Args:
+            count (int): Nombre de dépenses à ajouter
+        """
+        needed = self._size + count
+        if needed <= len(self._amounts):
+            return
+        
+        capacity = max(needed, 2 * len(self._amounts), self.MIN_CAPACITY)
+        for name in ('_dates', '_amounts', '_categories', '_descriptions'):
+            old = getattr(self, name)
+            new = np.empty(capacity, dtype=old.dtype)
+            new[:self._size] = old[:self._size]
+            setattr(self, name, new)
+    
+    def append(self, records):
+        """
+        Ajoute des dépenses au modèle, sans relire les autres.
+        
+        Les dépenses sont écrites à la suite des tableaux (temps constant en
+        moyenne). Si la liste est triée, elles rejoignent la file d'attente,
+        et la permutation n'est recopiée que lorsque la file dépasse
+        MERGE_ROWS dépenses (ou la racine carrée du nombre de dépenses): un
+        ajout ne recopie plus toute la permutation.
+        
+        Args:
+            records (list): Liste de lignes [date, montant, catégorie, description]
+        """
+        if not records:
+            return
+        
+        dates, amounts, categories, descriptions = zip(*records)
+        count = len(records)
+        self._reserve(count)
+        first = self._size
+        end = first + count
+        self._dates[first:end] = np.array(dates, dtype='datetime64[D]')
+        self._amounts[first:end] = np.array(amounts, dtype=np.float64)
+        self._categories[first:end] = [str(category) for category in categories]
+        self._descriptions[first:end] = [str(description) for description in descriptions]
+        self._size = end
+        
+        # Sans tri, les nouvelles dépenses sont à la fin de l'ordre d'enregistrement
+        if self.sort_column is not None:
+            self._queue_sorted(first, end)
+    
+    def _clear_pending(self):
+        """
+        Vide la file des dépenses ajoutées en attente de fusion.
+        """
+        self._pending_order = np.empty(0, dtype=np.intp)
+        self._pending_values = None
+        self._pending_insert = np.empty(0, dtype=np.intp)
+        self._pending_positions = np.empty(0, dtype=np.intp)
+    
+    def _insertion_points(self, sorted_values, values):
+        """
+        Calcule où insérer des valeurs dans des valeurs triées selon le tri courant.
+        
+        Le tri étant stable, une valeur se place après les valeurs égales.
+        
+        Args:
+            sorted_values (numpy.ndarray): Valeurs dans l'ordre de tri courant
+            values (numpy.ndarray): Valeurs à insérer
+        
+        Returns:
+            numpy.ndarray: Positions d'insertion
+        """
+        if self.descending:
+            # Valeurs décroissantes: compter celles >= chaque valeur
+            ascending = sorted_values[::-1]
+            return len(ascending) - np.searchsorted(ascending, values, side='left')
+        return np.searchsorted(sorted_values, values, side='right')
+    
+    def _queue_sorted(self, first, end):
+        """
+        Place des dépenses ajoutées dans la file d'attente triée.
+        
+        Les nouvelles dépenses sont triées entre elles, puis insérées dans
+        la file par recherche dichotomique; leur position parmi les dépenses
+        déjà triées est calculée de la même façon.
+        
+        Args:
+            first (int): Indice de la première dépense ajoutée
+            end (int): Indice suivant la dernière dépense ajoutée
+        """
+        values = self._sort_values(self.sort_column, slice(first, end))
+        # Nouvelles dépenses triées entre elles (tri stable de Python)
+        new = sorted(range(end - first), key=lambda i: values[i], reverse=self.descending)
+        new_values = np.array([values[i] for i in new], dtype=values.dtype)
+        
+        if self._pending_values is None:
+            self._pending_values = new_values[:0]
+        at = self._insertion_points(self._pending_values, new_values)
+        self._pending_values = np.insert(self._pending_values, at, new_values)
+        self._pending_order = np.insert(self._pending_order, at, first + np.array(new, dtype=np.intp))
+        self._pending_insert = np.insert(self._pending_insert, at,
+                                         self._insertion_points(self._sorted_values, new_values))
+        # Position d'affichage: dépenses triées placées avant, plus le rang
+        # dans la file
+        self._pending_positions = self._pending_insert + np.arange(len(self._pending_order), dtype=np.intp)
+        
+        if len(self._pending_order) > max(self.MERGE_ROWS, math.isqrt(end)):
+            self._merge_pending()
+    
+    def _merge_pending(self):
+        """
+        Fusionne la file d'attente dans la permutation triée.
+        """
+        self.order = np.insert(self.order, self._pending_insert, self._pending_order.astype(self.order.dtype))
+        self._sorted_values = np.insert(self._sorted_values, self._pending_insert, self._pending_values)
+        self._clear_pending()
+    
+    def _display_indices(self, start, stop):
+        """
+        Retourne les indices des dépenses affichées aux positions demandées.
+        
+        Les dépenses en attente sont intercalées à leur position d'affichage
+        parmi les dépenses triées, sans recopier la permutation.
+        
+        Args:
+            start (int): Position de la première ligne
+            stop (int): Position suivant la dernière ligne
+        
+        Returns:
+            numpy.ndarray: Indices des dépenses dans les tableaux
+        """
+        if self.order is None:
+            return np.arange(start, stop)
+        if len(self._pending_order) == 0:
+            return self.order[start:stop]
+        if len(self.order) == 0:
+            return self._pending_order[start:stop]
+        
+        positions = np.arange(start, stop)
+        pending = self._pending_positions
+        # Nombre de dépenses en attente affichées avant chaque position
+        before = np.searchsorted(pending, positions, side='left')
+        slot = np.minimum(before, len(pending) - 1)
+        is_pending = pending[slot] == positions
+        sorted_rows = np.minimum(positions - before, len(self.order) - 1)
+        return np.where(is_pending, self._pending_order[slot], self.order[sorted_rows])
+    
+    def __len__(self):
+        return self._size
+    
+    def _sort_values(self, column, rows=slice(None)):
+        """
+        Retourne les valeurs comparées lors du tri d'une colonne.
+        
+        Args:
+            column (str): Nom de la colonne
+            rows (slice, optional): Dépenses concernées (toutes par défaut)
+        
+        Returns:
+            numpy.ndarray: Valeurs de la colonne (jours en entiers pour les dates)
+        """
+        if column == "Date":
+            return self.dates[rows].astype(np.int64)
+        if column == "Montant":
+            return self.amounts[rows]
+        if column == "Catégorie":
+            return self.categories[rows]
+        if column == "Description":
+            return self.descriptions[rows]
+        raise ValueError(f"Colonne inconnue: {column}")
+    
+    def _sort_key(self, column):
+        """
+        Retourne la clé de tri numérique d'une colonne.
+        
+        Les colonnes de texte sont remplacées par le rang de chaque valeur
+        parmi les valeurs distinctes triées.
+        
+        Args:
+            column (str): Nom de la colonne
+        
+        Returns:
+            numpy.ndarray: Clé de tri, une valeur par dépense
+        """
+        if column == "Date":
+            return self.dates.astype(np.int64)
+        if column == "Montant":
+            return self.amounts
+        if column == "Catégorie":
+            values = self.categories
+        elif column == "Description":
+            values = self.descriptions
+        else:
+            raise ValueError(f"Colonne inconnue: {column}")
+        
+        codes, _ = pd.factorize(values, sort=True)
+        return codes
+    
+    def sort(self, column, descending=False):
+        """
+        Trie les dépenses selon une colonne (tri stable).
+        
+        Args:
+            column (str): Nom de la colonne
+            descending (bool, optional): Tri décroissant
+        """
+        key = self._sort_key(column)
+        self.order = np.argsort(-key if descending else key, kind='stable')
+        self.sort_column = column
+        self.descending = descending
+        # Valeurs dans l'ordre d'affichage, pour placer les dépenses ajoutées
+        self._sorted_values = self._sort_values(column)[self.order]
+        self._clear_pending()
+    
+    def toggle_sort(self, column):
+        """
+        Trie selon une colonne, en inversant le sens si elle est déjà triée.
+        
+        Args:
+            column (str): Nom de la colonne
+        """
+        descending = column == self.sort_column and not self.descending
+        self.sort(column, descending)
+    
+    def rows(self, start, stop):
+        """
+        Met en forme les lignes d'une fenêtre d'affichage.
+        
+        Args:
+            start (int): Position de la première ligne
+            stop (int): Position suivant la dernière ligne
+        
+        Returns:
+            list: Tuples (date, montant, catégorie, description) à afficher
+        """
+        start = max(0, start)
+        stop = min(len(self), stop)
+        if start >= stop:
+            return []
+        
+        indices = self._display_indices(start, stop)
+        dates = np.datetime_as_string(self.dates[indices], unit='D').tolist()
+        return [
+            (date, f"{amount:.2f} €", category, description)
+            for date, amount, category, description in zip(
+                dates, self.amounts[indices].tolist(), self.categories[indices], self.descriptions[indices]
+            )
+        ]
\ No newline at end of file
@@ -10,15 +10,20 @@ de suivi des dépenses personnelles.
 
 import os
 import sys
+import pandas as pd
 import tkinter as tk
 from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 
-from expense_manager import ExpenseManager
+from expense_manager import ExpenseManager, parse_day
+from expense_storage import sum_by_category
 from expense_analyzer import ExpenseAnalyzer
-from expense_reporter import ExpenseReporter
+from expense_aggregates import LiveStatistics, median_label
+from expense_jobs import JobRunner
+from expense_table import ExpenseTableModel
+
+# Lignes matérialisées en plus de celles visibles dans le tableau des dépenses
+TABLE_BUFFER_ROWS = 10
 
 class ExpenseTrackerGUI:
     """
@@ -47,7 +52,17 @@ class ExpenseTrackerGUI:
         # Initialiser les composants
         self.expense_manager = ExpenseManager(self.data_dir)
         self.expense_analyzer = ExpenseAnalyzer(self.expense_manager)
-        self.expense_reporter = ExpenseReporter(self.expense_analyzer)
+        self._expense_reporter = None
+        
+        # Tâches longues (statistiques, graphiques, rapports) en arrière-plan
+        self.jobs = JobRunner(self.root.after)
+        
+        # Période affichée (AAAA-MM-JJ, None pour aucune limite)
+        self.period = (None, None)
+        
+        # Statistiques et données du graphique affichés, mis à jour à chaque ajout
+        self.live_statistics = None
+        self.graph_data = None
         
         # Créer l'interface
         self._create_widgets()
@@ -55,11 +70,36 @@ class ExpenseTrackerGUI:
         
         # Charger les données initiales
         self._load_expenses()
+        
+        # Être prévenu des ajouts pour ne mettre à jour que ce qui change
+        self.expense_manager.subscribe(self._on_expenses_changed)
+    
+    @property
+    def expense_reporter(self):
+        """
+        ExpenseReporter: Générateur de rapports, créé à la première utilisation
+        (reportlab n'est chargé que si un rapport est demandé)
+        """
+        if self._expense_reporter is None:
+            from expense_reporter import ExpenseReporter
+            self._expense_reporter = ExpenseReporter(self.expense_analyzer)
+        return self._expense_reporter
     
     def _create_widgets(self):
         """
         Crée les widgets de l'interface graphique.
         """
+        # Barre d'état: progression des tâches en arrière-plan
+        status_frame = ttk.Frame(self.root)
+        status_frame.pack(side=tk.BOTTOM, fill=tk.X, padx=10, pady=(0, 5))
+        
+        self.status_var = tk.StringVar(value="Prêt")
+        ttk.Label(status_frame, textvariable=self.status_var).pack(side=tk.LEFT)
+        self.cancel_button = ttk.Button(status_frame, text="Annuler", command=self._cancel_jobs, state=tk.DISABLED)
+        self.cancel_button.pack(side=tk.RIGHT)
+        self.progress_var = tk.DoubleVar(value=0.0)
+        ttk.Progressbar(status_frame, variable=self.progress_var, maximum=1.0, length=200).pack(side=tk.RIGHT, padx=5)
+        
         # Créer un notebook (onglets)
         self.notebook = ttk.Notebook(self.root)
         self.notebook.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
@@ -134,22 +174,45 @@ class ExpenseTrackerGUI:
         list_frame = ttk.LabelFrame(self.expenses_frame, text="Liste des dépenses")
         list_frame.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
         
-        # Tableau des dépenses
-        columns = ("Date", "Montant", "Catégorie", "Description")
+        # Période affichée: s'applique au tableau, aux statistiques, au
+        # graphique et au rapport
+        period_frame = ttk.Frame(list_frame)
+        period_frame.pack(side=tk.TOP, fill=tk.X, pady=5)
+        ttk.Label(period_frame, text="Du (AAAA-MM-JJ):").pack(side=tk.LEFT, padx=5)
+        self.period_start_var = tk.StringVar()
+        ttk.Entry(period_frame, textvariable=self.period_start_var, width=12).pack(side=tk.LEFT)
+        ttk.Label(period_frame, text="Au:").pack(side=tk.LEFT, padx=5)
+        self.period_end_var = tk.StringVar()
+        ttk.Entry(period_frame, textvariable=self.period_end_var, width=12).pack(side=tk.LEFT)
+        ttk.Button(period_frame, text="Filtrer", command=self._apply_period).pack(side=tk.LEFT, padx=5)
+        ttk.Button(period_frame, text="Tout afficher", command=self._clear_period).pack(side=tk.LEFT)
+        
+        # Tableau des dépenses: seule la fenêtre visible est matérialisée,
+        # les lignes proviennent du modèle en colonnes
+        self.expense_table = ExpenseTableModel()
+        self.table_offset = 0
+        self.table_visible_rows = 20
+        
+        columns = ExpenseTableModel.COLUMNS
         self.expenses_tree = ttk.Treeview(list_frame, columns=columns, show="headings")
         
-        # Définir les en-têtes
+        # Définir les en-têtes (un clic trie la colonne)
         for col in columns:
-            self.expenses_tree.heading(col, text=col)
+            self.expenses_tree.heading(col, text=col, command=lambda c=col: self._sort_expenses(c))
             self.expenses_tree.column(col, width=100)
         
-        # Ajouter une scrollbar
-        scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self.expenses_tree.yview)
-        self.expenses_tree.configure(yscroll=scrollbar.set)
+        # Ajouter une scrollbar, pilotée par la position dans le modèle
+        self.expenses_scrollbar = ttk.Scrollbar(list_frame, orient=tk.VERTICAL, command=self._scroll_expenses)
+        
+        # Défilement à la molette (Windows/macOS, puis Linux)
+        self.expenses_tree.bind("<MouseWheel>", lambda e: self._scroll_expenses('scroll', -1 if e.delta > 0 else 1, 'units'))
+        self.expenses_tree.bind("<Button-4>", lambda e: self._scroll_expenses('scroll', -1, 'units'))
+        self.expenses_tree.bind("<Button-5>", lambda e: self._scroll_expenses('scroll', 1, 'units'))
+        self.expenses_tree.bind("<Configure>", self._resize_expenses)
         
         # Placement des widgets
         self.expenses_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
-        scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.expenses_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
     
     def _setup_stats_tab(self):
         """
@@ -182,8 +245,8 @@ class ExpenseTrackerGUI:
         # Sélecteur de type de graphique
         ttk.Label(controls_frame, text="Type de graphique:").pack(side=tk.LEFT, padx=5)
         self.graph_type_var = tk.StringVar(value="pie")
-        ttk.Radiobutton(controls_frame, text="Camembert", variable=self.graph_type_var, value="pie").pack(side=tk.LEFT, padx=5)
-        ttk.Radiobutton(controls_frame, text="Barres", variable=self.graph_type_var, value="bar").pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(controls_frame, text="Camembert", variable=self.graph_type_var, value="pie", command=self._switch_graph).pack(side=tk.LEFT, padx=5)
+        ttk.Radiobutton(controls_frame, text="Barres", variable=self.graph_type_var, value="bar", command=self._switch_graph).pack(side=tk.LEFT, padx=5)
         
         # Bouton pour générer le graphique
         ttk.Button(controls_frame, text="Générer", command=self._update_graph).pack(side=tk.RIGHT, padx=5)
@@ -195,23 +258,162 @@ class ExpenseTrackerGUI:
         # Message initial
         self.graph_msg = ttk.Label(self.graph_container, text="Cliquez sur 'Générer' pour afficher un graphique")
         self.graph_msg.pack(expand=True)
+        
+        # Figure et canevas uniques, créés au premier graphique puis réutilisés
+        self.graph_figure = None
+        self.graph_ax = None
+        self.graph_canvas = None
+        self.graph_bars = None
+        self.graph_drawn = None
     
     def _load_expenses(self):
         """
-        Charge les dépenses dans le tableau.
+        Charge les dépenses dans le modèle du tableau et affiche la fenêtre courante.
+        """
+        self.expense_table.load(self._period_expenses(self.period))
+        self._render_expenses()
+    
+    def _period_expenses(self, period):
+        """
+        Récupère les dépenses d'une période.
+        
+        Args:
+            period (tuple): (premier jour, dernier jour), None pour aucune limite
+        
+        Returns:
+            pandas.DataFrame: Dépenses de la période
+        """
+        if period == (None, None):
+            return self.expense_manager.get_all_expenses()
+        return self.expense_manager.get_expenses_between(*period)
+    
+    def _in_period(self, date):
+        """
+        Indique si une date (AAAA-MM-JJ) appartient à la période affichée.
+        """
+        start, end = self.period
+        return (start is None or date >= start) and (end is None or date <= end)
+    
+    def _apply_period(self):
+        """
+        Restreint l'affichage à la période saisie.
+        """
+        try:
+            start = parse_day(self.period_start_var.get())
+            end = parse_day(self.period_end_var.get())
+        except ValueError as e:
+            messagebox.showerror("Erreur", str(e))
+            return
+        
+        if start is not None and end is not None and start > end:
+            messagebox.showerror("Erreur", "La date de début est postérieure à la date de fin.")
+            return
+        
+        self._set_period((
+            start.strftime("%Y-%m-%d") if start is not None else None,
+            end.strftime("%Y-%m-%d") if end is not None else None
+        ))
+    
+    def _clear_period(self):
+        """
+        Affiche de nouveau toutes les dépenses.
+        """
+        self.period_start_var.set("")
+        self.period_end_var.set("")
+        self._set_period((None, None))
+    
+    def _set_period(self, period):
         """
-        # Effacer le tableau
-        for item in self.expenses_tree.get_children():
-            self.expenses_tree.delete(item)
+        Change la période affichée et recharge ce qui en dépend.
         
-        # Récupérer les dépenses
-        expenses = self.expense_manager.get_all_expenses()
+        Args:
+            period (tuple): (premier jour, dernier jour), None pour aucune limite
+        """
+        self.period = period
+        self.table_offset = 0
+        self._load_expenses()
+        if self.live_statistics is not None:
+            self._update_statistics()
+        if self.graph_data is not None:
+            self._update_graph()
+    
+    def _render_expenses(self):
+        """
+        Affiche dans le tableau les lignes de la fenêtre courante.
         
-        if not expenses.empty:
-            # Ajouter les dépenses au tableau
-            for _, row in expenses.iterrows():
-                date = row['Date'].strftime("%Y-%m-%d") if hasattr(row['Date'], 'strftime') else row['Date']
-                self.expenses_tree.insert("", tk.END, values=(date, f"{row['Montant']:.2f} €", row['Catégorie'], row['Description']))
+        Les éléments du tableau sont réutilisés d'un défilement à l'autre: leur
+        nombre ne dépend que de la hauteur du tableau, pas du nombre de dépenses.
+        """
+        total = len(self.expense_table)
+        window = self.table_visible_rows + TABLE_BUFFER_ROWS
+        self.table_offset = max(0, min(self.table_offset, total - self.table_visible_rows))
+        rows = self.expense_table.rows(self.table_offset, self.table_offset + window)
+        
+        items = self.expenses_tree.get_children()
+        for item, values in zip(items, rows):
+            self.expenses_tree.item(item, values=values)
+        for values in rows[len(items):]:
+            self.expenses_tree.insert("", tk.END, values=values)
+        if len(items) > len(rows):
+            self.expenses_tree.delete(*items[len(rows):])
+        
+        # La sélection porte sur les éléments, pas sur les dépenses: l'effacer
+        selection = self.expenses_tree.selection()
+        if selection:
+            self.expenses_tree.selection_remove(selection)
+        self.expenses_tree.yview_moveto(0)
+        
+        if total:
+            self.expenses_scrollbar.set(self.table_offset / total, min(1.0, (self.table_offset + self.table_visible_rows) / total))
+        else:
+            self.expenses_scrollbar.set(0.0, 1.0)
+    
+    def _scroll_expenses(self, action, *args):
+        """
+        Fait défiler le tableau (commande de la scrollbar et molette).
+        
+        Args:
+            action (str): 'moveto' (args: fraction) ou 'scroll' (args: nombre, 'units' ou 'pages')
+        
+        Returns:
+            str: "break" pour empêcher le défilement propre du tableau
+        """
+        if action == 'moveto':
+            self.table_offset = int(float(args[0]) * len(self.expense_table))
+        elif action == 'scroll':
+            step = self.table_visible_rows if args[1] == 'pages' else 3
+            self.table_offset += int(args[0]) * step
+        
+        self._render_expenses()
+        return "break"
+    
+    def _resize_expenses(self, event):
+        """
+        Adapte le nombre de lignes matérialisées à la hauteur du tableau.
+        """
+        style = ttk.Style()
+        row_height = int(style.lookup("Treeview", "rowheight") or 20)
+        visible_rows = max(1, event.height // row_height)
+        if visible_rows != self.table_visible_rows:
+            self.table_visible_rows = visible_rows
+            self._render_expenses()
+    
+    def _sort_expenses(self, column):
+        """
+        Trie le tableau selon une colonne (un second clic inverse le sens).
+        
+        Args:
+            column (str): Nom de la colonne
+        """
+        self.expense_table.toggle_sort(column)
+        for col in ExpenseTableModel.COLUMNS:
+            arrow = ""
+            if col == column:
+                arrow = " ▼" if self.expense_table.descending else " ▲"
+            self.expenses_tree.heading(col, text=col + arrow)
+        
+        self.table_offset = 0
+        self._render_expenses()
     
     def _add_expense(self):
         """
@@ -237,19 +439,11 @@ class ExpenseTrackerGUI:
             success = self.expense_manager.add_expense(amount, category, description)
             
             if success:
-                # Réinitialiser les champs
+                # Réinitialiser les champs (le tableau, les statistiques et le
+                # graphique sont mis à jour par _on_expenses_changed)
                 self.amount_var.set("")
                 self.description_var.set("")
                 
-                # Rafraîchir le tableau
-                self._load_expenses()
-                
-                # Mettre à jour les statistiques et graphiques si les onglets sont actifs
-                if self.notebook.index(self.notebook.select()) == 1:  # Onglet Statistiques
-                    self._update_statistics()
-                elif self.notebook.index(self.notebook.select()) == 2:  # Onglet Graphiques
-                    self._update_graph()
-                
                 messagebox.showinfo("Succès", "Dépense ajoutée avec succès!")
             else:
                 messagebox.showerror("Erreur", "Impossible d'ajouter la dépense.")
@@ -257,26 +451,94 @@ class ExpenseTrackerGUI:
         except ValueError:
             messagebox.showerror("Erreur", "Veuillez entrer un montant valide.")
     
+    def _on_expenses_changed(self, event, records):
+        """
+        Met à jour l'interface après une modification des dépenses.
+        
+        Après un ajout, seules les nouvelles dépenses sont prises en compte:
+        le tableau réaffiche sa fenêtre, et les statistiques et le graphique
+        déjà affichés sont corrigés de l'écart, sans relire les données.
+        
+        Args:
+            event (str): Type d'événement ('added' ou 'reset')
+            records (list): Lignes [date, montant, catégorie, description] ajoutées
+        """
+        if event != 'added':
+            self._load_expenses()
+            if self.live_statistics is not None:
+                self._update_statistics()
+            if self.graph_data is not None:
+                self._update_graph()
+            return
+        
+        # Ignorer les dépenses hors de la période affichée
+        records = [record for record in records if self._in_period(record[0])]
+        if not records:
+            return
+        
+        self.expense_table.append(records)
+        self._render_expenses()
+        
+        # Un calcul en cours porte sur les données d'avant l'ajout: le relancer
+        if self.jobs.is_running('stats'):
+            self._update_statistics()
+        elif self.live_statistics is not None:
+            self.live_statistics.apply(records)
+            self._show_statistics(self.live_statistics.statistics())
+        
+        if self.jobs.is_running('graph'):
+            self._update_graph()
+        elif self.graph_data is not None:
+            for _, amount, category, _ in records:
+                self.graph_data[category] = self.graph_data.get(category, 0.0) + float(amount)
+            self.graph_data = self.graph_data.sort_index()
+            self._draw_graph()
+    
     def _update_statistics(self):
         """
         Met à jour l'affichage des statistiques.
         """
+        period = self.period
+        
+        def compute(job):
+            # Recalculer les statistiques à partir des dépenses de la période
+            job.progress(0.0, "Chargement des dépenses")
+            expenses = self._period_expenses(period)
+            job.progress(0.5, "Calcul des statistiques")
+            live_statistics = LiveStatistics()
+            live_statistics.rebuild(expenses)
+            return live_statistics
+        
+        def done(live_statistics):
+            self.live_statistics = live_statistics
+            self._show_statistics(live_statistics.statistics())
+            self._job_finished()
+        
+        self._start_job("Statistiques", 'stats', compute, done)
+    
+    def _show_statistics(self, stats):
+        """
+        Affiche des statistiques dans la zone de texte.
+        
+        Args:
+            stats (dict): Statistiques des dépenses (None si aucune dépense)
+        """
         # Effacer le contenu actuel
         self.stats_text.delete(1.0, tk.END)
         
-        # Récupérer les statistiques
-        stats = self.expense_analyzer.get_statistics()
-        
         if not stats:
             self.stats_text.insert(tk.END, "Aucune dépense enregistrée pour calculer les statistiques.")
             return
         
         # Afficher les statistiques générales
         self.stats_text.insert(tk.END, "===== STATISTIQUES DES DÉPENSES =====\n\n")
+        if self.period != (None, None):
+            start, end = self.period
+            self.stats_text.insert(tk.END, f"Période: du {start or 'début'} au {end or 'dernier jour'}\n\n")
         self.stats_text.insert(tk.END, f"Total des dépenses: {stats['total']:.2f} €\n")
         self.stats_text.insert(tk.END, f"Nombre de dépenses: {stats['count']}\n")
         self.stats_text.insert(tk.END, f"Moyenne des dépenses: {stats['mean']:.2f} €\n")
-        self.stats_text.insert(tk.END, f"Médiane des dépenses: {stats['median']:.2f} €\n")
+        self.stats_text.insert(tk.END, f"{median_label(stats)}: {stats['median']:.2f} €\n")
         self.stats_text.insert(tk.END, f"Dépense minimale: {stats['min']:.2f} €\n")
         self.stats_text.insert(tk.END, f"Dépense maximale: {stats['max']:.2f} €\n\n")
         
@@ -289,50 +551,121 @@ class ExpenseTrackerGUI:
         """
         Met à jour l'affichage du graphique.
         """
-        # Effacer le contenu actuel
-        for widget in self.graph_container.winfo_children():
-            widget.destroy()
+        period = self.period
+        
+        def compute(job):
+            # Récupérer les dépenses par catégorie (de la période)
+            job.progress(0.0, "Chargement des dépenses")
+            if period == (None, None):
+                return self.expense_manager.get_expenses_by_category().copy()
+            expenses = self._period_expenses(period)
+            if expenses.empty:
+                return pd.Series(dtype='float64')
+            return sum_by_category(expenses['Montant'], expenses['Catégorie'])
+        
+        def done(by_category):
+            # Le dessin utilise Tk: il reste dans le thread de l'interface
+            self.graph_data = by_category
+            self._draw_graph()
+            self._job_finished()
+        
+        self._start_job("Graphique", 'graph', compute, done)
+    
+    def _switch_graph(self):
+        """
+        Change le type du graphique affiché, sans relire les données.
+        """
+        if self.graph_data is not None:
+            self._draw_graph()
+    
+    def _draw_graph(self):
+        """
+        Dessine le graphique à partir des montants par catégorie affichés.
         
-        # Récupérer les dépenses par catégorie
-        expenses = self.expense_manager.get_all_expenses()
+        La figure et le canevas sont créés une seule fois: les nouvelles
+        données sont dessinées sur les mêmes axes (les barres existantes sont
+        simplement ajustées) et l'affichage est rafraîchi avec draw_idle.
+        """
+        by_category = self.graph_data
         
-        if expenses.empty:
-            self.graph_msg = ttk.Label(self.graph_container, text="Aucune dépense enregistrée pour générer un graphique.")
+        if by_category.empty:
+            if self.graph_canvas is not None:
+                self.graph_canvas.get_tk_widget().pack_forget()
+            self.graph_msg.configure(text="Aucune dépense enregistrée pour générer un graphique.")
             self.graph_msg.pack(expand=True)
             return
         
-        # Récupérer les dépenses par catégorie
-        by_category = self.expense_manager.get_expenses_by_category()
+        if self.graph_canvas is None:
+            # Import à la demande: matplotlib n'est chargé qu'au premier graphique.
+            # Figure (et non pyplot) n'est pas enregistrée dans l'état global
+            # de matplotlib et ne reste donc pas ouverte en mémoire.
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            
+            self.graph_figure = Figure(figsize=(8, 6))
+            self.graph_ax = self.graph_figure.add_subplot()
+            self.graph_canvas = FigureCanvasTkAgg(self.graph_figure, master=self.graph_container)
         
-        # Créer la figure
-        fig, ax = plt.subplots(figsize=(8, 6))
+        # Intégrer le graphique dans l'interface
+        self.graph_msg.pack_forget()
+        canvas_widget = self.graph_canvas.get_tk_widget()
+        if not canvas_widget.winfo_manager():
+            canvas_widget.pack(fill=tk.BOTH, expand=True)
         
         # Type de graphique
         graph_type = self.graph_type_var.get()
+        labels = [str(category) for category in by_category.index]
+        values = [float(amount) for amount in by_category.values]
+        ax = self.graph_ax
+        
+        if graph_type == "bar" and self.graph_drawn == ("bar", labels):
+            # Mêmes catégories: ajuster la hauteur des barres existantes
+            for bar, value in zip(self.graph_bars, values):
+                bar.set_height(value)
+            ax.relim()
+            ax.autoscale_view()
+        else:
+            ax.clear()
+            self.graph_bars = None
+            
+            if graph_type == "pie":
+                # Graphique en camembert
+                ax.pie(values, labels=labels, autopct='%1.1f%%', startangle=90)
+                ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
+                ax.set_title('Répartition des Dépenses par Catégorie')
+            else:  # bar
+                # Graphique à barres
+                self.graph_bars = ax.bar(labels, values)
+                ax.set_title('Dépenses par Catégorie')
+                ax.set_xlabel('Catégorie')
+                ax.set_ylabel('Montant (€)')
+                ax.tick_params(axis='x', rotation=45)
+            
+            self.graph_drawn = (graph_type, labels)
         
-        if graph_type == "pie":
-            # Graphique en camembert
-            ax.pie(by_category, labels=by_category.index, autopct='%1.1f%%', startangle=90)
-            ax.axis('equal')  # Equal aspect ratio ensures that pie is drawn as a circle
-            ax.set_title('Répartition des Dépenses par Catégorie')
-        else:  # bar
-            # Graphique à barres
-            by_category.plot(kind='bar', ax=ax)
-            ax.set_title('Dépenses par Catégorie')
-            ax.set_xlabel('Catégorie')
-            ax.set_ylabel('Montant (€)')
-            ax.tick_params(axis='x', rotation=45)
-        
-        # Intégrer le graphique dans l'interface
-        canvas = FigureCanvasTkAgg(fig, master=self.graph_container)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self.graph_canvas.draw_idle()
     
     def _generate_report(self):
         """
         Génère un rapport PDF des dépenses.
         """
-        report_path = self.expense_reporter.generate_pdf_report(self.reports_dir)
+        start, end = self.period
+        
+        def compute(job):
+            # Pas de groupe de processus: forker un processus Tk multithread est dangereux
+            return self.expense_reporter.generate_pdf_report(self.reports_dir, progress=job.progress, start=start, end=end,
+                                                             parallel_charts=False)
+        
+        self._start_job("Rapport", 'report', compute, self._report_generated)
+    
+    def _report_generated(self, report_path):
+        """
+        Propose d'ouvrir le rapport qui vient d'être généré.
+        
+        Args:
+            report_path (str): Chemin du rapport, ou None si aucune dépense
+        """
+        self._job_finished()
         
         if not report_path:
             messagebox.showinfo("Information", "Aucune dépense enregistrée pour générer un rapport.")
@@ -348,6 +681,48 @@ class ExpenseTrackerGUI:
             else:  # linux
                 os.system(f"xdg-open {report_path}")
     
+    def _start_job(self, title, name, compute, done):
+        """
+        Lance une tâche en arrière-plan en affichant sa progression.
+        
+        Une tâche du même nom encore en cours est annulée et son résultat ignoré.
+        
+        Args:
+            title (str): Titre affiché dans la barre d'état
+            name (str): Nom de la tâche ('stats', 'graph' ou 'report')
+            compute (callable): Fonction compute(job) exécutée en arrière-plan
+            done (callable): Fonction appelée avec le résultat, dans le thread
+                de l'interface
+        """
+        def progress(fraction, message):
+            self.progress_var.set(fraction)
+            self.status_var.set(f"{title}: {message}")
+        
+        def error(exception):
+            self._job_finished()
+            messagebox.showerror("Erreur", f"{title}: {exception}")
+        
+        progress(0.0, "en attente")
+        self.cancel_button.configure(state=tk.NORMAL)
+        self.jobs.submit(name, compute, done, on_error=error, on_progress=progress)
+    
+    def _job_finished(self):
+        """
+        Remet la barre d'état au repos si plus aucune tâche n'est en cours.
+        """
+        if not self.jobs.jobs:
+            self.progress_var.set(0.0)
+            self.status_var.set("Prêt")
+            self.cancel_button.configure(state=tk.DISABLED)
+    
+    def _cancel_jobs(self):
+        """
+        Annule les tâches en cours.
+        """
+        self.jobs.cancel()
+        self._job_finished()
+        self.status_var.set("Annulé")
+    
     def _show_about(self):
         """
         Affiche la boîte de dialogue "À propos".
@@ -370,6 +745,7 @@ def main():
     root = tk.Tk()
     app = ExpenseTrackerGUI(root)
     root.mainloop()
+    app.jobs.shutdown()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -3,9 +3,12 @@
 
 import os
 import sys
-from expense_manager import ExpenseManager
+import time
+import pandas as pd
+from expense_manager import ExpenseManager, parse_day
 from expense_analyzer import ExpenseAnalyzer
-from expense_reporter import ExpenseReporter
+from expense_aggregates import median_label
+from expense_cli import COMMANDS, main as run_command
 
 def console_mode():
     # Définir le répertoire de données
@@ -19,7 +22,6 @@ def console_mode():
     # Initialiser les composants
     expense_manager = ExpenseManager(data_dir)
     expense_analyzer = ExpenseAnalyzer(expense_manager)
-    expense_reporter = ExpenseReporter(expense_analyzer)
     
     while True:
         print("\n===== SUIVI DES DÉPENSES PERSONNELLES =====")
@@ -28,6 +30,9 @@ def console_mode():
         print("3. Afficher les statistiques")
         print("4. Générer des graphiques")
         print("5. Générer un rapport PDF")
+        print("6. Afficher les dépenses d'une période")
+        print("7. Générer un rapport PDF d'une période")
+        print("8. Afficher les tendances mensuelles")
         print("0. Quitter")
         
         choice = input("\nVotre choix: ")
@@ -41,7 +46,15 @@ def console_mode():
         elif choice == "4":
             generate_graphs(expense_analyzer, reports_dir)
         elif choice == "5":
-            generate_report(expense_reporter, reports_dir)
+            generate_report(expense_analyzer, reports_dir)
+        elif choice == "6":
+            display_period(expense_analyzer)
+        elif choice == "7":
+            period = ask_period()
+            if period is not None:
+                generate_report(expense_analyzer, reports_dir, *period)
+        elif choice == "8":
+            display_trends(expense_analyzer, reports_dir)
         elif choice == "0":
             print("Au revoir!")
             sys.exit(0)
@@ -49,11 +62,85 @@ def console_mode():
             print("Option invalide. Veuillez réessayer.")
 
 def main():
+    # Mesure du temps par étape (--profile), avec un profil cProfile
+    # facultatif (--profile-output FICHIER), pour n'importe quel mode
+    args, profile, profile_output = parse_profile_options(sys.argv[1:])
+    sys.argv[1:] = args
+    
+    if profile or profile_output:
+        run_profiled(run, profile_output)
+    else:
+        run()
+
+def parse_profile_options(args):
+    """Retire les options de mesure des arguments (tuple (arguments restants, --profile, fichier cProfile))"""
+    remaining = []
+    profile = False
+    profile_output = None
+    
+    index = 0
+    while index < len(args):
+        arg = args[index]
+        if arg == "--profile":
+            profile = True
+        elif arg == "--profile-output" and index + 1 < len(args):
+            profile_output = args[index + 1]
+            index += 1
+        elif arg.startswith("--profile-output="):
+            profile_output = arg.split("=", 1)[1]
+        else:
+            remaining.append(arg)
+        index += 1
+    
+    return remaining, profile, profile_output
+
+def run_profiled(function, profile_output=None):
+    """Exécute une fonction en mesurant ses étapes, puis affiche le détail des durées"""
+    from expense_profiling import StageTimer
+    
+    profiler = None
+    if profile_output:
+        # Import à la demande: cProfile n'est chargé qu'avec --profile-output
+        import cProfile
+        profiler = cProfile.Profile()
+    
+    timer = StageTimer()
+    start = time.perf_counter()
+    with timer:
+        if profiler is not None:
+            profiler.enable()
+        try:
+            function()
+        finally:
+            if profiler is not None:
+                profiler.disable()
+                profiler.dump_stats(profile_output)
+            
+            print(f"\n===== DURÉE DES ÉTAPES ({time.perf_counter() - start:.2f} s au total) =====")
+            print(timer.report())
+            if profiler is not None:
+                print(f"\nProfil cProfile enregistré dans: {profile_output}")
+
+def run():
+    # Sous-commandes non interactives (ex: python main.py report --data-dir data --out reports)
+    if len(sys.argv) > 1 and sys.argv[1] in COMMANDS:
+        sys.exit(run_command(sys.argv[1:]))
+    
     # Vérifier si l'argument --console est passé
     if len(sys.argv) > 1 and sys.argv[1] == "--console":
         console_mode()
         return
     
+    # Migration unique vers un autre moteur de stockage (ex: --migrate sqlite)
+    if len(sys.argv) > 2 and sys.argv[1] == "--migrate":
+        migrate(sys.argv[2])
+        return
+    
+    # Vérification ou reconstruction des agrégats
+    if len(sys.argv) > 1 and sys.argv[1] in ("--verify-aggregates", "--rebuild-aggregates"):
+        check_aggregates(rebuild=sys.argv[1] == "--rebuild-aggregates")
+        return
+    
     # Par défaut, lancer l'interface graphique
     try:
         from gui import ExpenseTrackerGUI
@@ -70,6 +157,37 @@ def main():
         print("Lancement en mode console...")
         console_mode()
 
+def migrate(backend):
+    """Migre les dépenses vers un autre moteur de stockage"""
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    expense_manager = ExpenseManager(data_dir)
+    try:
+        count = expense_manager.migrate(backend)
+    except ValueError as e:
+        print(f"Erreur lors de la migration: {e}")
+        sys.exit(1)
+    
+    print(f"{count} dépenses migrées vers le stockage {backend}.")
+
+def check_aggregates(rebuild=False):
+    """Vérifie les agrégats des dépenses et les reconstruit si demandé"""
+    data_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data')
+    expense_manager = ExpenseManager(data_dir)
+    
+    differences = expense_manager.verify_aggregates()
+    if not differences:
+        print("Les agrégats sont à jour.")
+    else:
+        print("Écarts trouvés dans les agrégats:")
+        for difference in differences:
+            print(f"  - {difference}")
+    
+    if rebuild:
+        aggregates = expense_manager.rebuild_aggregates()
+        print(f"Agrégats reconstruits à partir de {aggregates.count} dépenses.")
+    elif differences:
+        sys.exit(1)
+
 def add_expense(expense_manager):
     """Ajoute une nouvelle dépense"""
     try:
@@ -102,6 +220,48 @@ def display_expenses(expense_manager):
     print(expenses.to_string(index=False))
     print(f"\nTotal: {expenses['Montant'].sum():.2f} €")
 
+def ask_period():
+    """Demande une période et des catégories (tuple (début, fin, catégories), None si invalide)"""
+    start = input("Date de début (AAAA-MM-JJ, vide pour aucune limite): ").strip() or None
+    end = input("Date de fin (AAAA-MM-JJ, vide pour aucune limite): ").strip() or None
+    categories = input("Catégories séparées par des virgules (vide pour toutes): ").strip()
+    categories = [category.strip() for category in categories.split(",") if category.strip()] or None
+    
+    try:
+        parse_day(start)
+        parse_day(end)
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        return None
+    
+    return start, end, categories
+
+def display_period(expense_analyzer):
+    """Affiche les dépenses et les statistiques d'une période"""
+    period = ask_period()
+    if period is None:
+        return
+    
+    try:
+        snapshot = expense_analyzer.expense_manager.snapshot(*period)
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        return
+    
+    if snapshot.empty:
+        print("Aucune dépense pour cette période.")
+        return
+    
+    print("\n===== DÉPENSES DE LA PÉRIODE =====")
+    print(snapshot.expenses.to_string(index=False))
+    
+    stats = expense_analyzer.get_statistics(snapshot)
+    print(f"\nTotal: {stats['total']:.2f} € ({stats['count']} dépenses)")
+    print(f"Moyenne des dépenses: {stats['mean']:.2f} €")
+    print("\nDépenses par catégorie:")
+    for category, amount in stats['by_category'].items():
+        print(f"  {category}: {amount:.2f} €")
+
 def display_statistics(expense_analyzer):
     """Affiche les statistiques des dépenses"""
     stats = expense_analyzer.get_statistics()
@@ -113,7 +273,7 @@ def display_statistics(expense_analyzer):
     print("\n===== STATISTIQUES DES DÉPENSES =====")
     print(f"Total des dépenses: {stats['total']:.2f} €")
     print(f"Moyenne des dépenses: {stats['mean']:.2f} €")
-    print(f"Médiane des dépenses: {stats['median']:.2f} €")
+    print(f"{median_label(stats)}: {stats['median']:.2f} €")
     print(f"Dépense minimale: {stats['min']:.2f} €")
     print(f"Dépense maximale: {stats['max']:.2f} €")
     
@@ -121,6 +281,31 @@ def display_statistics(expense_analyzer):
     for category, amount in stats['by_category'].items():
         print(f"  {category}: {amount:.2f} €")
 
+def display_trends(expense_analyzer, output_dir):
+    """Affiche l'évolution mensuelle des dépenses et les comparaisons de périodes"""
+    trend = expense_analyzer.get_trend('month')
+    
+    if trend.empty:
+        print("Aucune dépense enregistrée pour calculer les tendances.")
+        return
+    
+    rolling = expense_analyzer.get_rolling_average(3, 'month')
+    print("\n===== TENDANCES MENSUELLES (12 derniers mois) =====")
+    for period, amount in trend.tail(12).items():
+        print(f"  {period.strftime('%Y-%m')}: {amount:10.2f} €  (moyenne sur 3 mois: {rolling[period]:.2f} €)")
+    
+    for title, offset in (("mois précédent", 1), ("même mois de l'année précédente", 12)):
+        comparison = expense_analyzer.compare_periods('month', offset=offset)
+        current, reference = comparison.attrs['periods']
+        total = comparison.loc['Total']
+        change = "n/a" if pd.isna(total['Évolution (%)']) else f"{total['Évolution (%)']:+.1f} %"
+        print(f"\n{current.strftime('%Y-%m')} comparé au {title} ({reference.strftime('%Y-%m')}): "
+              f"{total['Actuel']:.2f} € contre {total['Référence']:.2f} € ({change})")
+    
+    graph_file = expense_analyzer.generate_trend_graph(output_dir)
+    if graph_file:
+        print(f"\nGraphique de tendance: {os.path.basename(graph_file)}")
+
 def generate_graphs(expense_analyzer, output_dir):
     """Génère des graphiques des dépenses"""
     graph_files = expense_analyzer.generate_graphs(output_dir)
@@ -134,9 +319,18 @@ def generate_graphs(expense_analyzer, output_dir):
         print(f"  - {os.path.basename(graph_file)}")
     print(f"\nLes graphiques sont disponibles dans: {output_dir}")
 
-def generate_report(expense_reporter, output_dir):
-    """Génère un rapport PDF des dépenses"""
-    report_path = expense_reporter.generate_pdf_report(output_dir)
+def generate_report(expense_analyzer, output_dir, start=None, end=None, categories=None):
+    """Génère un rapport PDF des dépenses (éventuellement restreint à une période)"""
+    # Import à la demande: reportlab n'est chargé que pour générer un rapport
+    from expense_reporter import ExpenseReporter
+    
+    try:
+        report_path = ExpenseReporter(expense_analyzer).generate_pdf_report(
+            output_dir, start=start, end=end, categories=categories
+        )
+    except ValueError as e:
+        print(f"Erreur: {e}")
+        return
     
     if not report_path:
         print("Aucune dépense enregistrée pour générer un rapport.")